@@ -265,11 +265,12 @@ def ingest_log_file(node_name: str, log_path: str):
                 f"  Last sample: {last['available_bytes'] / (1024**4):.2f} TB at {last['timestamp']}"
             )
 
-        for snapshot in storage_snapshots_to_write:
-            success = database.blocking_write_storage_snapshot(config.DATABASE_FILE, snapshot)
-            if not success:
-                log.error(f"Failed to write storage snapshot at {snapshot['timestamp']}")
-        log.info("Storage snapshots written successfully.")
+        if database.blocking_write_storage_snapshots(
+            config.DATABASE_FILE, storage_snapshots_to_write
+        ):
+            log.info("Storage snapshots written successfully.")
+        else:
+            log.error(f"Failed to write {len(storage_snapshots_to_write)} storage snapshots")
     else:
         log.warning("No storage snapshots were collected during ingestion. This might mean:")
         log.warning("  1. The log file doesn't contain DEBUG-level entries with 'Available Space'")
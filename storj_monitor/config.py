@@ -16,6 +16,7 @@ STATS_INTERVAL_SECONDS = 5
 PERFORMANCE_INTERVAL_SECONDS = 2
 WEBSOCKET_BATCH_INTERVAL_MS = 25  # Batch websocket events every 25ms (very frequent, small batches)
 WEBSOCKET_BATCH_SIZE = 10  # Maximum events per batch (small batches for continuous flow)
+WEBSOCKET_SEND_QUEUE_SIZE = 64  # Broadcasts held per client; a slow client loses the oldest (replies are kept)
 DB_WRITE_BATCH_INTERVAL_SECONDS = 10
 DB_QUEUE_MAX_SIZE = 30000
 EXPECTED_DB_COLUMNS = 13  # Increased for node_name
@@ -33,11 +34,15 @@ DB_MAX_RETRIES = 3  # Number of retry attempts for locked database
 DB_RETRY_BASE_DELAY = 0.5  # Base delay between retries (seconds)
 DB_RETRY_MAX_DELAY = 5.0  # Maximum delay between retries (seconds)
 DB_CONNECTION_POOL_SIZE = 5  # Connection pool size for read operations
+DB_FAST_POOL_SIZE = 4  # Dedicated workers for quick lookups (e.g. hashstore stats)
+DB_HEAVY_POOL_SIZE = 2  # Dedicated workers for long scans (e.g. aggregated performance)
 
 # --- API Integration Configuration (Phase 1) ---
 NODE_API_DEFAULT_PORT = 14002  # Default Storj node API port
 NODE_API_TIMEOUT = 10  # seconds
 NODE_API_POLL_INTERVAL = 300  # 5 minutes - how often to poll node API
+NODE_API_DASHBOARD_CACHE_SECONDS = 5  # Reuse a fetched /api/sno dashboard across callers for this long
+STORAGE_POLL_MAX_CONCURRENT_NODES = 8  # Nodes polled for storage at once per cycle
 ALLOW_REMOTE_API = True  # Allow API endpoints on remote hosts (set False for localhost-only)
 
 # --- Reputation Alert Thresholds (Phase 1) ---
@@ -111,6 +116,23 @@ HELD_AMOUNT_MONTH_16_PLUS = (
 NODE_MONTHLY_COSTS = {}  # Optional: {'node_name': monthly_cost_usd} for profitability analysis
 DB_EARNINGS_RETENTION_DAYS = 365  # How many days of earnings estimates to keep
 
+# --- Server CPU Optimization (Phase 13) ---
+PERF_USE_ORJSON = True  # Use orjson for WebSocket JSON encoding/decoding when it is installed
+PERF_USE_NUMPY = True  # Use numpy for latency percentile math when it is installed
+PERF_USE_UVLOOP = True  # Run the server on uvloop when it is installed
+VIEW_CHANGE_DEBOUNCE_SECONDS = 0.15  # Only the latest of rapid set_view messages is computed
+STATS_CACHE_MAX_VIEWS = 256  # Max number of per-view stats payloads kept in memory
+STATS_CACHE_TTL_SECONDS = 60  # Cached stats payloads for views nobody watches expire after this
+NODE_METRICS_CACHE_SIZE = 500  # Per-node comparison metrics reused across different node selections
+NODE_METRICS_CACHE_TTL_SECONDS = 60
+EARNINGS_CACHE_MAX_ENTRIES = 256  # Per-view/period earnings payloads, least recently used evicted first
+# Refreshed by every earnings poll, so only payloads nobody asks for age out
+EARNINGS_CACHE_TTL_SECONDS = 3 * NODE_API_POLL_INTERVAL
+EARNINGS_12M_CACHE_TTL_SECONDS = 300  # 12-month earnings payloads; new estimates invalidate them sooner
+EARNINGS_HISTORY_CHUNK_SIZE = 50  # Larger earnings histories are streamed to the client in chunks of this many records
+COMPARISON_CACHE_MAX_ENTRIES = 100  # Full comparison results kept, least recently used evicted first
+COMPARISON_MAX_CONCURRENT_NODES = 4  # Nodes gathered at once per comparison, bounds DB executor fan-out
+
 
 # --- Global Constants ---
 SATELLITE_NAMES = {
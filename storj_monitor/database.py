@@ -2,6 +2,7 @@ import datetime
 import json
 import logging
 import sqlite3
+from array import array
 from typing import Any, Optional
 
 from .config import (
@@ -12,10 +13,13 @@ from .config import (
     DB_RETRY_MAX_DELAY,
     HISTORICAL_HOURS_TO_SHOW,
 )
-from .db_utils import get_optimized_connection, retry_on_db_lock
+from .db_utils import get_optimized_connection, retry_on_db_lock, reused_read_connection
 
 log = logging.getLogger("StorjMonitor.Database")
 
+# Window functions (ROW_NUMBER/COUNT OVER) need SQLite 3.25+
+SQLITE_HAS_WINDOW_FUNCTIONS = sqlite3.sqlite_version_info >= (3, 25, 0)
+
 
 def init_db():
     log.info("Connecting to database and checking schema...")
@@ -1080,6 +1084,7 @@ def load_initial_state_from_db(nodes_config: dict[str, dict[str, Any]]):
                 "active_compactions": {},
                 "unprocessed_performance_events": [],
                 "has_new_events": False,
+                "event_seq": 0,
             }
 
             # OPTIMIZATION: Use LIMIT to avoid loading too many events on startup
@@ -1120,6 +1125,8 @@ def load_initial_state_from_db(nodes_config: dict[str, dict[str, Any]]):
                         "node_name": row["node_name"],
                         "category": categorize_action(action),
                     }
+                    node_state["event_seq"] += 1
+                    event["seq"] = node_state["event_seq"]
                     node_state["live_events"].append(event)
                     rehydrated_events += 1
                 except Exception:
@@ -1221,7 +1228,7 @@ def blocking_get_latest_reputation(db_path: str, node_names: list[str]) -> list[
         return []
 
     try:
-        with get_optimized_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
+        with reused_read_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
             conn.row_factory = sqlite3.Row
 
             # Get latest reputation for each node-satellite combination
@@ -1307,33 +1314,55 @@ def blocking_write_storage_snapshot(db_path: str, snapshot: dict[str, Any]) -> b
     Returns:
         True if successful
     """
+    if not blocking_write_storage_snapshots(db_path, [snapshot]):
+        return False
+    source = snapshot.get("source", "API")
+    log.info(
+        f"Successfully wrote storage snapshot for {snapshot['node_name']} (source: {source})"
+    )
+    return True
+
+
+def blocking_write_storage_snapshots(db_path: str, snapshots: list[dict[str, Any]]) -> bool:
+    """
+    Write several storage snapshots in one transaction.
+
+    Args:
+        db_path: Path to database file
+        snapshots: Storage snapshot data (complete or log-based)
+
+    Returns:
+        True if successful
+    """
+    if not snapshots:
+        return False
+
     try:
         with get_optimized_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
             cursor = conn.cursor()
-            cursor.execute(
+            cursor.executemany(
                 """
                 INSERT INTO storage_snapshots
                 (timestamp, node_name, total_bytes, used_bytes, available_bytes, trash_bytes,
                  used_percent, trash_percent, available_percent)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-                (
-                    snapshot["timestamp"].isoformat(),
-                    snapshot["node_name"],
-                    snapshot.get("total_bytes"),  # May be None for log-based snapshots
-                    snapshot.get("used_bytes"),  # May be None for log-based snapshots
-                    snapshot.get("available_bytes"),
-                    snapshot.get("trash_bytes"),  # May be None for log-based snapshots
-                    snapshot.get("used_percent"),  # May be None for log-based snapshots
-                    snapshot.get("trash_percent"),  # May be None for log-based snapshots
-                    snapshot.get("available_percent"),  # May be None for log-based snapshots
-                ),
+                [
+                    (
+                        snapshot["timestamp"].isoformat(),
+                        snapshot["node_name"],
+                        snapshot.get("total_bytes"),  # May be None for log-based snapshots
+                        snapshot.get("used_bytes"),  # May be None for log-based snapshots
+                        snapshot.get("available_bytes"),
+                        snapshot.get("trash_bytes"),  # May be None for log-based snapshots
+                        snapshot.get("used_percent"),  # May be None for log-based snapshots
+                        snapshot.get("trash_percent"),  # May be None for log-based snapshots
+                        snapshot.get("available_percent"),  # May be None for log-based snapshots
+                    )
+                    for snapshot in snapshots
+                ],
             )
             conn.commit()
-        source = snapshot.get("source", "API")
-        log.info(
-            f"Successfully wrote storage snapshot for {snapshot['node_name']} (source: {source})"
-        )
         return True
     except Exception:
         log.error("Failed to write storage snapshot to DB:", exc_info=True)
@@ -1361,7 +1390,7 @@ def blocking_get_storage_history(
         cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)
         cutoff_iso = cutoff.isoformat()
 
-        with get_optimized_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
+        with reused_read_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
             conn.row_factory = sqlite3.Row
 
             query = """
@@ -1376,6 +1405,57 @@ def blocking_get_storage_history(
         return []
 
 
+def blocking_get_storage_regression_sums(
+    db_path: str, node_name: str, windows_days: list[int]
+) -> dict[int, tuple]:
+    """
+    Get least-squares sums of used_bytes over time for several trailing windows.
+
+    Everything is aggregated by SQLite in one pass over the node's snapshots;
+    log-based snapshots (no used_bytes) are skipped. x is measured in days
+    relative to now, which keeps the sums small and the slope well conditioned.
+
+    Args:
+        db_path: Path to database file
+        node_name: Name of the node
+        windows_days: Trailing window lengths in days
+
+    Returns:
+        {days: (n, sum_x, sum_y, sum_xy, sum_x2, min_x, max_x)}, or {} on error
+    """
+    try:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cutoff_iso = (now - datetime.timedelta(days=max(windows_days))).isoformat()
+
+        columns = []
+        for days in windows_days:
+            in_window = f"x >= -{float(days)}"
+            columns += [
+                f"COUNT(CASE WHEN {in_window} THEN 1 END)",
+                f"SUM(CASE WHEN {in_window} THEN x END)",
+                f"SUM(CASE WHEN {in_window} THEN y END)",
+                f"SUM(CASE WHEN {in_window} THEN x * y END)",
+                f"SUM(CASE WHEN {in_window} THEN x * x END)",
+                f"MIN(CASE WHEN {in_window} THEN x END)",
+                f"MAX(CASE WHEN {in_window} THEN x END)",
+            ]
+        query = f"""
+            WITH points AS (
+                SELECT julianday(timestamp) - julianday(?) AS x, used_bytes AS y
+                FROM storage_snapshots
+                WHERE node_name = ? AND timestamp >= ? AND used_bytes IS NOT NULL
+            )
+            SELECT {", ".join(columns)} FROM points
+        """
+
+        with reused_read_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
+            row = conn.execute(query, (now.isoformat(), node_name, cutoff_iso)).fetchone()
+        return {days: row[i * 7 : i * 7 + 7] for i, days in enumerate(windows_days)}
+    except Exception:
+        log.error("Failed to get storage regression sums:", exc_info=True)
+        return {}
+
+
 # --- Alert Management Functions (Phase 4) ---
 
 
@@ -1569,7 +1649,7 @@ def blocking_get_insights(
         cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=hours)
         cutoff_iso = cutoff.isoformat()
 
-        with get_optimized_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
+        with reused_read_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
             conn.row_factory = sqlite3.Row
 
             if node_names:
@@ -1674,7 +1754,7 @@ def blocking_get_latest_storage(db_path: str, node_names: list[str]) -> list[dic
         return []
 
     try:
-        with get_optimized_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
+        with reused_read_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
             conn.row_factory = sqlite3.Row
 
             # First check if we have any storage data at all
@@ -1969,7 +2049,7 @@ def blocking_get_earnings_estimates(
         List of earnings estimates (latest per node/satellite/period)
     """
     try:
-        with get_optimized_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
+        with reused_read_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
             conn.row_factory = sqlite3.Row
 
             # Build WHERE clause for the subquery
@@ -2044,7 +2124,7 @@ def blocking_get_latest_earnings(
     log.info(f"[blocking_get_latest_earnings] Querying for nodes: {node_names}, period: {period}")
 
     try:
-        with get_optimized_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
+        with reused_read_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
             conn.row_factory = sqlite3.Row
 
             placeholders = ",".join("?" for _ in node_names)
@@ -2225,7 +2305,7 @@ def blocking_get_events(
         cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=hours)
         cutoff_iso = cutoff.isoformat()
         
-        with get_optimized_connection(db_path, timeout=DB_CONNECTION_TIMEOUT, read_only=True) as conn:
+        with reused_read_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
             conn.row_factory = sqlite3.Row
             
             placeholders = ",".join("?" for _ in node_names)
@@ -2283,7 +2363,7 @@ def blocking_get_event_counts(
         cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=hours)
         cutoff_iso = cutoff.isoformat()
 
-        with get_optimized_connection(db_path, timeout=DB_CONNECTION_TIMEOUT, read_only=True) as conn:
+        with reused_read_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
             conn.row_factory = sqlite3.Row
             placeholders = ",".join("?" for _ in node_names)
 
@@ -2308,3 +2388,171 @@ def blocking_get_event_counts(
     except Exception:
         log.error("Failed to get event counts:", exc_info=True)
         return []
+
+
+@retry_on_db_lock(
+    max_attempts=DB_MAX_RETRIES, base_delay=DB_RETRY_BASE_DELAY, max_delay=DB_RETRY_MAX_DELAY
+)
+def blocking_get_latency_percentiles_batch(
+    db_path: str,
+    node_names: list[str],
+    hours: int = 24,
+    percentiles=(50, 95, 99),
+    sample_limit: int = None,
+) -> dict[str, dict[int, float]]:
+    """
+    Compute nearest-rank latency percentiles per node inside SQLite.
+
+    Each node's most recent events are taken with an index-ordered LIMIT first, and
+    only those rows are ranked with window functions; just the candidate rows around
+    each percentile position are returned, so a few rows per node cross into Python
+    instead of the whole sample. sample_limit matches the sampled events fetch used
+    by the comparison view.
+
+    Returns {node_name: {percentile: duration_ms}}; nodes without latency data are absent.
+    """
+    if not node_names or not percentiles:
+        return {}
+
+    if not SQLITE_HAS_WINDOW_FUNCTIONS:
+        # Older SQLite: stream compact duration samples and rank them in Python
+        result = {}
+        for node_name, samples in blocking_get_duration_ms_sample(
+            db_path, node_names, hours, sample_limit
+        ).items():
+            ordered = sorted(samples)
+            n = len(ordered)
+            result[node_name] = {p: ordered[round((p / 100.0) * (n - 1))] for p in percentiles}
+        return result
+
+    try:
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=hours)
+        cutoff_iso = cutoff.isoformat()
+        fractions = [p / 100.0 for p in percentiles]
+
+        # Python's round() picks floor or floor + 1 of the position; fetch both candidates
+        candidates = " OR ".join(
+            "idx IN (CAST(? * (n - 1) AS INTEGER), CAST(? * (n - 1) AS INTEGER) + 1)"
+            for _ in fractions
+        )
+        query = f"""
+            WITH recent AS (
+                SELECT duration_ms FROM events
+                WHERE node_name = ? AND timestamp >= ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            ),
+            ranked AS (
+                SELECT duration_ms,
+                       ROW_NUMBER() OVER (ORDER BY duration_ms) - 1 AS idx,
+                       COUNT(*) OVER () AS n
+                FROM recent
+                WHERE duration_ms IS NOT NULL AND duration_ms != 0
+            )
+            SELECT idx, n, duration_ms FROM ranked
+            WHERE {candidates}
+        """
+        candidate_params = [f for f in fractions for _ in range(2)]
+
+        result = {}
+        with reused_read_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
+            for node_name in node_names:
+                params = (
+                    node_name,
+                    cutoff_iso,
+                    sample_limit if sample_limit else -1,
+                    *candidate_params,
+                )
+                rows = conn.execute(query, params).fetchall()
+                if rows:
+                    n = rows[0][1]
+                    ranked = {idx: float(duration_ms) for idx, _n, duration_ms in rows}
+                    result[node_name] = {
+                        p: ranked[round(f * (n - 1))] for p, f in zip(percentiles, fractions)
+                    }
+        return result
+    except Exception:
+        log.error("Failed to get latency percentiles:", exc_info=True)
+        return {}
+
+
+@retry_on_db_lock(
+    max_attempts=DB_MAX_RETRIES, base_delay=DB_RETRY_BASE_DELAY, max_delay=DB_RETRY_MAX_DELAY
+)
+def blocking_get_duration_ms_sample(
+    db_path: str, node_names: list[str], hours: int = 24, sample_limit: int = None
+) -> dict[str, array]:
+    """
+    Get each node's non-zero durations from its most recent events as array('d').
+
+    Only the duration column is selected and rows are streamed with fetchmany into a
+    flat float array, so no per-event dicts are built.
+
+    Returns {node_name: array('d', ...)}; nodes without latency data are absent.
+    """
+    if not node_names:
+        return {}
+
+    try:
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=hours)
+        cutoff_iso = cutoff.isoformat()
+        result = {}
+
+        with reused_read_connection(db_path, timeout=DB_CONNECTION_TIMEOUT) as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = 1000
+            for node_name in node_names:
+                cursor.execute(
+                    """
+                    SELECT duration_ms FROM (
+                        SELECT duration_ms FROM events
+                        WHERE node_name = ? AND timestamp >= ?
+                        ORDER BY timestamp DESC
+                        LIMIT ?
+                    )
+                    WHERE duration_ms IS NOT NULL AND duration_ms != 0
+                    """,
+                    (node_name, cutoff_iso, sample_limit if sample_limit else -1),
+                )
+                samples = array("d")
+                while rows := cursor.fetchmany():
+                    samples.extend(row[0] for row in rows)
+                if samples:
+                    result[node_name] = samples
+        return result
+    except Exception:
+        log.error("Failed to get duration samples:", exc_info=True)
+        return {}
+
+
+def blocking_get_event_counts_batch(
+    db_path: str, node_names: list[str], hours: int = 24
+) -> dict[str, dict[str, Any]]:
+    """
+    Get operation counts for several nodes in one query.
+
+    Returns {node_name: counts_row}; nodes without events in the window are absent.
+    """
+    return {row["node_name"]: row for row in blocking_get_event_counts(db_path, node_names, hours)}
+
+
+def blocking_get_perf_summary(
+    db_path: str,
+    node_names: list[str],
+    hours: int = 24,
+    percentiles=(50, 95, 99),
+    sample_limit: int = None,
+) -> tuple[dict[str, dict[str, Any]], dict[str, dict[int, float]]]:
+    """
+    Get the performance summary used by the comparison view in one executor job.
+
+    Operation counts and latency percentiles are both reduced inside SQLite, so only
+    a handful of scalars per node cross into Python.
+
+    Returns (counts_by_node, latency_by_node) as produced by
+    blocking_get_event_counts_batch and blocking_get_latency_percentiles_batch.
+    """
+    return (
+        blocking_get_event_counts_batch(db_path, node_names, hours),
+        blocking_get_latency_percentiles_batch(db_path, node_names, hours, percentiles, sample_limit),
+    )
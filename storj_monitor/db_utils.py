@@ -9,7 +9,9 @@ import builtins
 import contextlib
 import functools
 import logging
+import os
 import sqlite3
+import threading
 import time
 from typing import Any, Callable
 
@@ -128,6 +130,63 @@ def get_optimized_connection(
     return conn
 
 
+# Per-thread read-only connections: {abs_path: (connection, (st_dev, st_ino))}
+_thread_read_connections = threading.local()
+
+
+def _close_quietly(conn: sqlite3.Connection):
+    with contextlib.suppress(builtins.BaseException):
+        conn.close()
+
+
+@contextlib.contextmanager
+def reused_read_connection(db_path: str, timeout: float = 30.0):
+    """
+    Yield a read-only connection that stays open for reuse by the calling thread.
+
+    DB executor threads are long-lived, so hot read paths skip sqlite3.connect and
+    the PRAGMA setup of get_optimized_connection on every call. SQLite connections
+    are bound to their creating thread, hence one cache per thread rather than a
+    shared pool. The cached connection is replaced when the database file itself
+    is replaced, and discarded after any database error.
+    """
+    abs_path = os.path.abspath(db_path)
+    cache = getattr(_thread_read_connections, "by_path", None)
+    if cache is None:
+        cache = _thread_read_connections.by_path = {}
+
+    try:
+        st = os.stat(abs_path)
+        identity = (st.st_dev, st.st_ino)
+    except OSError:
+        identity = None  # Let sqlite3 report the missing file as usual
+
+    entry = cache.get(abs_path)
+    if entry is not None and (identity is None or entry[1] != identity):
+        _close_quietly(cache.pop(abs_path)[0])
+        entry = None
+    if entry is None:
+        conn = get_optimized_connection(db_path, timeout, read_only=True)
+        if identity is None:
+            # Nothing to validate against next time; don't keep it
+            try:
+                yield conn
+            finally:
+                _close_quietly(conn)
+            return
+        entry = cache[abs_path] = (conn, identity)
+
+    conn = entry[0]
+    # Callers customise row_factory; hand out the default every time
+    conn.row_factory = None
+    try:
+        yield conn
+    except sqlite3.Error:
+        cache.pop(abs_path, None)
+        _close_quietly(conn)
+        raise
+
+
 class ConnectionPool:
     """
     Simple connection pool for read operations to reduce connection overhead.
@@ -45,6 +45,9 @@ class FinancialTracker:
         self.api_client = api_client
         self.last_poll_time = None
         self.node_start_date = None  # Will be determined from API or storage history
+        # Serializes historical imports so concurrent triggers never run it twice
+        self._import_lock = asyncio.Lock()
+        self._historical_imported = False
 
     async def get_api_earnings(self) -> Optional[dict[str, Any]]:
         """
@@ -1368,9 +1371,14 @@ async def financial_polling_task(app: dict[str, Any]):
                 for node_name, tracker in app["financial_trackers"].items():
                     try:
                         # This is now async but won't block startup
-                        await tracker.import_historical_payouts(
-                            DATABASE_FILE, loop, app.get("db_executor")
-                        )
+                        async with tracker._import_lock:
+                            if not tracker._historical_imported:
+                                try:
+                                    await tracker.import_historical_payouts(
+                                        DATABASE_FILE, loop, app.get("db_executor")
+                                    )
+                                finally:
+                                    tracker._historical_imported = True
                     except Exception as e:
                         log.debug(f"[{node_name}] Historical import skipped: {e}")
                 app["historical_import_pending"] = False
@@ -1381,9 +1389,10 @@ async def financial_polling_task(app: dict[str, Any]):
                 log.info("Running daily historical paystub check...")
                 for node_name, tracker in app["financial_trackers"].items():
                     try:
-                        await tracker.import_historical_payouts(
-                            DATABASE_FILE, loop, app.get("db_executor")
-                        )
+                        async with tracker._import_lock:
+                            await tracker.import_historical_payouts(
+                                DATABASE_FILE, loop, app.get("db_executor")
+                            )
                     except Exception as e:
                         log.debug(f"[{node_name}] Historical import check skipped: {e}")
                 last_historical_import_day = now.day
@@ -1522,9 +1531,6 @@ async def broadcast_earnings_update(app: dict[str, Any], loop=None, current_peri
         }
 
         # Store in cache before broadcasting (include period in cache key)
-        if "earnings_cache" not in app_state:
-            app_state["earnings_cache"] = {}
-
         period_key = period or current_period
 
         # Cache per-node and aggregate views with period
@@ -1540,6 +1546,8 @@ async def broadcast_earnings_update(app: dict[str, Any], loop=None, current_peri
             app_state["earnings_cache"][(node_name, period_key)] = node_payload
 
         app_state["earnings_cache"][("Aggregate", period_key)] = payload
+        # Readers memoizing earnings totals key on this; new estimates invalidate them
+        app_state["earnings_generation"] = app_state.get("earnings_generation", 0) + 1
 
         log.info(
             f"[BROADCAST] Cached aggregate data with {len(formatted_data)} estimates for {len(nodes_in_payload)} nodes"
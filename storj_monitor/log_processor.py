@@ -500,6 +500,7 @@ async def log_processor_task(app, node_name: str, line_queue: asyncio.Queue):
                     )
 
                 event["arrival_time"] = arrival_time
+                event["seq"] = node_state["event_seq"] = node_state.get("event_seq", 0) + 1
                 node_state["live_events"].append(event)
                 node_state["has_new_events"] = True
 
@@ -523,10 +524,12 @@ async def log_processor_task(app, node_name: str, line_queue: asyncio.Queue):
 
             elif parsed["type"] == "hashstore_begin":
                 node_state["active_compactions"][parsed["key"]] = parsed["timestamp"]
+                app_state["active_compactions_generation"] += 1
                 await robust_broadcast(app_state["websockets"], get_active_compactions_payload())
 
             elif parsed["type"] == "hashstore_end":
                 node_state["active_compactions"].pop(parsed["key"], None)
+                app_state["active_compactions_generation"] += 1
                 await robust_broadcast(app_state["websockets"], get_active_compactions_payload())
 
                 # Write historical record to DB
@@ -252,7 +252,8 @@ def blocking_get_latency_stats(
             "statistics": statistics_data,
             "slow_operations": slow_operations,
             "total_operations": len(events),
-            "operations_with_latency": len([e for e in events if e.get("duration_ms")]),
+            # The query only returns rows with duration_ms > 0
+            "operations_with_latency": len(events),
         }
 
         # Cache result
@@ -264,12 +265,16 @@ def blocking_get_latency_stats(
         return {"statistics": {}, "slow_operations": [], "error": str(e)}
 
 
+def _empty_latency_histogram(bucket_size_ms: int) -> dict[str, Any]:
+    return {"bucket_size_ms": bucket_size_ms, "bucket_start_ms": [], "count": []}
+
+
 @retry_on_db_lock(
     max_attempts=DB_MAX_RETRIES, base_delay=DB_RETRY_BASE_DELAY, max_delay=DB_RETRY_MAX_DELAY
 )
 def blocking_get_latency_histogram(
     db_path: str, node_names: list[str], hours: int = 1, bucket_size_ms: int = 100
-) -> list[dict[str, Any]]:
+) -> dict[str, Any]:
     """
     OPTIMIZED: Uses index-optimized query with caching and efficient bucketing.
 
@@ -280,12 +285,13 @@ def blocking_get_latency_histogram(
         bucket_size_ms: Size of histogram buckets in milliseconds
 
     Returns:
-        List of histogram buckets with counts
+        Columnar histogram: {"bucket_size_ms", "bucket_start_ms": [...], "count": [...]}.
+        Bucket end and label are derived by the client from the start and size.
     """
     import datetime
 
     if not node_names:
-        return []
+        return _empty_latency_histogram(bucket_size_ms)
 
     # Check cache - extended to 2 minutes for better startup performance
     cache_key = f"{','.join(sorted(node_names))}_{hours}_{bucket_size_ms}"
@@ -322,18 +328,12 @@ def blocking_get_latency_histogram(
 
             cursor = conn.execute(query, (bucket_size_ms, bucket_size_ms, *node_names, cutoff_iso))
 
-            histogram = []
-            for row in cursor:
-                bucket_start = int(row[0])
-                count = row[1]
-                histogram.append(
-                    {
-                        "bucket_start_ms": bucket_start,
-                        "bucket_end_ms": bucket_start + bucket_size_ms,
-                        "count": count,
-                        "label": f"{bucket_start}-{bucket_start + bucket_size_ms}ms",
-                    }
-                )
+            histogram = _empty_latency_histogram(bucket_size_ms)
+            starts = histogram["bucket_start_ms"]
+            counts = histogram["count"]
+            for bucket_start, count in cursor:
+                starts.append(int(bucket_start))
+                counts.append(count)
 
             # Cache result
             _latency_histogram_cache[cache_key] = {"data": histogram, "ts": time.time()}
@@ -341,4 +341,4 @@ def blocking_get_latency_histogram(
 
     except Exception as e:
         log.error(f"Error getting latency histogram: {e}", exc_info=True)
-        return []
+        return _empty_latency_histogram(bucket_size_ms)
@@ -1,23 +1,102 @@
 import asyncio
-import json
+import datetime
 import logging
+import operator
 import os
 import time
+from collections import OrderedDict, defaultdict
 from typing import List, Any, Dict
 
 import aiohttp
 from aiohttp import web
 
-from .state import app_state
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional speedup
+    np = None
+
+try:
+    import uvloop
+except ImportError:  # uvloop is an optional speedup (not available on Windows)
+    uvloop = None
+
+from .financial_tracker import SATELLITE_NAMES
+from .performance_analyzer import blocking_get_latency_histogram, blocking_get_latency_stats
+from .state import BoundedTTLCache, IncrementalStats, PayloadCache, app_state
 from .tasks import start_background_tasks, cleanup_background_tasks
+from .websocket_utils import (
+    close_send_queue,
+    encode_json,
+    json_loads,
+    open_send_queue,
+    refresh_ws_snapshot,
+    safe_send_json,
+    send_encoded,
+)
 from . import database
-from .config import SERVER_HOST, SERVER_PORT, PERFORMANCE_INTERVAL_SECONDS, DATABASE_FILE
+from .config import (
+    SERVER_HOST,
+    SERVER_PORT,
+    PERFORMANCE_INTERVAL_SECONDS,
+    COMPARISON_CACHE_MAX_ENTRIES,
+    COMPARISON_MAX_CONCURRENT_NODES,
+    DATABASE_FILE,
+    EARNINGS_12M_CACHE_TTL_SECONDS,
+    EARNINGS_HISTORY_CHUNK_SIZE,
+    NODE_METRICS_CACHE_SIZE,
+    NODE_METRICS_CACHE_TTL_SECONDS,
+    PERF_USE_NUMPY,
+    PERF_USE_UVLOOP,
+    VIEW_CHANGE_DEBOUNCE_SECONDS,
+)
 
 log = logging.getLogger("StorjMonitor.Server")
 
+USE_NUMPY = PERF_USE_NUMPY and np is not None
+USE_UVLOOP = PERF_USE_UVLOOP and uvloop is not None
+
 
 # ===== Phase 9: Multi-Node Comparison Functions =====
 
+# CRITICAL OPTIMIZATION: Limit events to prevent loading millions of rows
+# For comparison, we only need a statistically significant sample.
+# The budget scales with the window: short windows fetch less, long windows stay representative.
+MIN_EVENTS_FOR_COMPARISON = 2000
+MAX_EVENTS_FOR_COMPARISON = 50000
+EVENTS_PER_HOUR_FOR_COMPARISON = 500
+
+# Which data each comparison type needs
+_NEEDS_EVENTS = frozenset({"performance", "overall", "earnings", "efficiency"})
+_NEEDS_EARNINGS = frozenset({"earnings", "overall"})
+_NEEDS_STORAGE = frozenset({"earnings", "overall", "efficiency"})
+_NEEDS_EFFICIENCY = frozenset({"efficiency", "overall"})
+
+BYTES_PER_TB = 1 << 40  # Binary TB, as used by the storage cards
+
+
+def month_period(moment: datetime.datetime = None) -> str:
+    """Return the "%Y-%m" earnings period for moment (default: now, UTC) without strftime."""
+    if moment is None:
+        moment = datetime.datetime.now(datetime.timezone.utc)
+    return f"{moment.year:04d}-{moment.month:02d}"
+
+
+def recent_month_periods(count: int, moment: datetime.datetime = None) -> List[str]:
+    """Return the earnings periods of the count calendar months ending at moment, newest first."""
+    if moment is None:
+        moment = datetime.datetime.now(datetime.timezone.utc)
+    months = moment.year * 12 + moment.month - 1
+    return [f"{m // 12:04d}-{m % 12 + 1:02d}" for m in range(months, months - count, -1)]
+
+
+def comparison_sample_size(hours: int) -> int:
+    """Number of recent events sampled per node for a comparison window."""
+    return max(
+        MIN_EVENTS_FOR_COMPARISON,
+        min(MAX_EVENTS_FOR_COMPARISON, EVENTS_PER_HOUR_FOR_COMPARISON * hours),
+    )
+
+
 def parse_time_range(time_range: str) -> int:
     """Parse time range string to hours."""
     if time_range == "24h":
@@ -32,16 +111,28 @@ def parse_time_range(time_range: str) -> int:
 
 def calculate_percentile(values: List[float], percentile: int) -> float:
     """Calculate percentile from list of values using nearest-rank method."""
-    if not values:
-        return 0.0
-    sorted_values = sorted(values)
-    n = len(sorted_values)
-    
+    return calculate_percentiles(values, (percentile,))[percentile]
+
+
+def calculate_percentiles(values: List[float], percentiles) -> Dict[int, float]:
+    """
+    Calculate several percentiles in one pass over the values (nearest-rank method).
+    Accepts a list or a numpy array. Returns {percentile: value}.
+    """
+    n = len(values)
+    if n == 0:
+        return dict.fromkeys(percentiles, 0.0)
+
+    if USE_NUMPY:
+        # "nearest" rounds the position half-to-even like round() below; numpy selects
+        # the order statistics with an O(n) partition instead of a full sort
+        picked = np.percentile(np.asarray(values, dtype=np.float64), list(percentiles), method="nearest")
+        return {p: float(v) for p, v in zip(percentiles, picked)}
+
     # Use nearest-rank method with rounding
     # Calculate position and round to nearest index
-    position = (percentile / 100.0) * (n - 1)
-    index = round(position)
-    return float(sorted_values[index])
+    ordered = sorted(values)
+    return {p: float(ordered[round((p / 100.0) * (n - 1))]) for p in percentiles}
 
 
 def calculate_success_rate(events: List[Dict]) -> float:
@@ -52,6 +143,42 @@ def calculate_success_rate(events: List[Dict]) -> float:
     return (successful / len(events)) * 100
 
 
+def count_outcomes_by_action(events: List[Dict], actions=("GET", "PUT", "GET_AUDIT")) -> Dict[str, List[int]]:
+    """Count [successful, total] per action in a single pass over the events."""
+    counts = {action: [0, 0] for action in actions}
+    for e in events:
+        c = counts.get(e.get("action"))
+        if c is not None:
+            c[1] += 1
+            if e.get("status") == "success":
+                c[0] += 1
+    return counts
+
+
+_EARNINGS_GROUP_KEY = operator.itemgetter("node_name", "satellite")
+_EARNINGS_SUM_FIELDS = operator.itemgetter(
+    "total_earnings_net",
+    "total_earnings_gross",
+    "held_amount",
+    "egress_earnings_net",
+    "storage_earnings_net",
+    "repair_earnings_net",
+    "audit_earnings_net",
+)
+
+
+def sum_earnings_by_satellite(estimates: List[Dict]) -> Dict[tuple, List[float]]:
+    """
+    Total the earnings fields of estimates per (node_name, satellite).
+    Values are [total_net, total_gross, held, egress, storage, repair, audit].
+    """
+    # Fetch each row's fields in one C call, then let sum() add each column
+    groups = defaultdict(list)
+    for estimate in estimates:
+        groups[_EARNINGS_GROUP_KEY(estimate)].append(_EARNINGS_SUM_FIELDS(estimate))
+    return {key: [sum(column) for column in zip(*rows)] for key, rows in groups.items()}
+
+
 def calculate_earnings_per_tb(earnings_data: Dict) -> float:
     """Calculate earnings per TB stored."""
     total_earnings = earnings_data.get("total_earnings_net") or 0
@@ -63,6 +190,18 @@ def calculate_earnings_per_tb(earnings_data: Dict) -> float:
     return 0.0
 
 
+def earnings_per_tb_from_bytes(total_earnings, used_bytes) -> float:
+    """Earnings per TB stored given raw used bytes; None when either value is unusable."""
+    if (
+        isinstance(total_earnings, (int, float))
+        and total_earnings > 0
+        and isinstance(used_bytes, (int, float))
+        and used_bytes > 0
+    ):
+        return total_earnings / (used_bytes / BYTES_PER_TB)
+    return None
+
+
 def calculate_storage_efficiency(storage_data: Dict) -> float:
     """Calculate storage efficiency score (0-100)."""
     used_percent = storage_data.get("used_percent")
@@ -97,73 +236,192 @@ def calculate_avg_score(reputation_data: List[Dict], score_field: str) -> float:
     return sum(scores) / len(scores)
 
 
-async def gather_node_metrics(app, node_name: str, hours: int, comparison_type: str) -> Dict:
+async def gather_node_metrics(
+    app,
+    node_name: str,
+    hours: int,
+    comparison_type: str,
+    precomputed_counts: Dict = None,
+    precomputed_latency: Dict = None,
+    period: str = None,
+) -> Dict:
     """
     Gather all metrics for a single node.
+    precomputed_counts and precomputed_latency are optional {node_name: ...} maps from
+    blocking_get_perf_summary, which replace the per-node summary query. period is the "%Y-%m" earnings period,
+    computed once per comparison by the caller (defaults to the current month).
     
     OPTIMIZED: Uses sampling and caching to prevent loading millions of events.
+    Results are cached per (node, hours, type) so comparisons over different
+    node selections reuse each other's work, and concurrent callers for the
+    same key share a single in-flight computation.
     """
-    import time
-    start_time = time.time()
-    log.info(f"[Comparison Debug] Starting metrics gathering for node {node_name}, type={comparison_type}")
-    from .database import (
-        blocking_get_events,
-        blocking_get_event_counts,
-        blocking_get_latest_reputation,
-        blocking_get_latest_storage_with_forecast,
-        blocking_get_latest_earnings,
-    )
+    if "node_metrics_cache" not in app:
+        app["node_metrics_cache"] = BoundedTTLCache(
+            NODE_METRICS_CACHE_SIZE, NODE_METRICS_CACHE_TTL_SECONDS
+        )
+    if "metrics_inflight" not in app:
+        app["metrics_inflight"] = {}
+    if "earnings_totals_cache" not in app:
+        app["earnings_totals_cache"] = BoundedTTLCache(
+            NODE_METRICS_CACHE_SIZE, NODE_METRICS_CACHE_TTL_SECONDS
+        )
+    node_cache_key = (node_name, hours, comparison_type)
+    cached_metrics = app["node_metrics_cache"].get(node_cache_key)
+    if cached_metrics is not None:
+        log.debug("[Comparison] Using cached metrics for node %s (type=%s)", node_name, comparison_type)
+        # Callers overlay storage/earnings data in place, so hand out a copy
+        return dict(cached_metrics)
+
+    inflight = app["metrics_inflight"]
+    task = inflight.get(node_cache_key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _gather_node_metrics_uncached(
+                app,
+                node_name,
+                hours,
+                comparison_type,
+                node_cache_key,
+                precomputed_counts,
+                precomputed_latency,
+                period,
+            )
+        )
+        inflight[node_cache_key] = task
+        task.add_done_callback(lambda _done: inflight.pop(node_cache_key, None))
+    else:
+        log.debug(
+            "[Comparison] Joining in-flight metrics gathering for node %s (type=%s)",
+            node_name,
+            comparison_type,
+        )
+    # Shielded so one client's cancellation doesn't abort work other comparisons are awaiting
+    return dict(await asyncio.shield(task))
+
+
+async def _gather_node_metrics_uncached(
+    app,
+    node_name: str,
+    hours: int,
+    comparison_type: str,
+    node_cache_key,
+    precomputed_counts: Dict = None,
+    precomputed_latency: Dict = None,
+    period: str = None,
+) -> Dict:
+    """Compute one node's metrics for gather_node_metrics and store them in the per-node cache."""
+    # Timing is only worth a clock read when INFO records will actually be emitted
+    timed = log.isEnabledFor(logging.INFO)
+    start_ns = time.perf_counter_ns() if timed else 0
+    log.info("[Comparison Debug] Starting metrics gathering for node %s, type=%s", node_name, comparison_type)
+    sample_size = comparison_sample_size(hours)
     
     metrics = {}
-    counts = None
     loop = asyncio.get_running_loop()
+
+    # The batch maps only cover nodes that were uncached when they were built; a node
+    # whose cache entry expired since then is missing from them and needs its own summary
+    if precomputed_counts is not None and node_name not in precomputed_counts:
+        precomputed_counts = precomputed_latency = None
     
     try:
-        if comparison_type in ["performance", "overall", "earnings", "efficiency"]:
-            # CRITICAL OPTIMIZATION: Limit events to prevent loading millions of rows
-            # For comparison, we only need a statistically significant sample
-            # 10,000 recent events provides excellent accuracy for metrics
-            MAX_EVENTS_FOR_COMPARISON = 10000
-            
-            log.debug(f"[Comparison] Fetching up to {MAX_EVENTS_FOR_COMPARISON} events for {node_name}")
-            
-            events = await loop.run_in_executor(
+        # The per-node queries are independent: run them concurrently on the DB executor
+        lookups = {}
+        if comparison_type in _NEEDS_EVENTS and (precomputed_counts is None or precomputed_latency is None):
+            # Counts and latency percentiles are both reduced inside SQLite in one executor job
+            lookups["summary"] = loop.run_in_executor(
                 app["db_executor"],
-                blocking_get_events,
+                database.blocking_get_perf_summary,
                 DATABASE_FILE,
                 [node_name],
                 hours,
-                MAX_EVENTS_FOR_COMPARISON,  # CRITICAL: Add limit parameter
+                (50, 95, 99),
+                sample_size,
+            )
+        cached_total_earnings = None
+        if comparison_type in _NEEDS_EARNINGS:
+            # Get earnings data - PERFORMANCE FIX: Always use pre-computed earnings from database
+            if period is None:
+                period = month_period()
+            # Totals only change when the financial tracker publishes new estimates,
+            # so they are shared across time ranges until the generation moves on
+            earnings_key = (node_name, period, app_state.get("earnings_generation", 0))
+            cached_total_earnings = app["earnings_totals_cache"].get(earnings_key)
+        if cached_total_earnings is None and comparison_type in _NEEDS_EARNINGS:
+            log.info("[Comparison] Fetching earnings for %s, period: %s", node_name, period)
+            # CRITICAL OPTIMIZATION: Always use pre-computed earnings from database
+            # instead of recalculating via financial tracker. This is the main bottleneck
+            # when comparing multiple nodes.
+            lookups["earnings"] = loop.run_in_executor(
+                app["db_executor"],
+                database.blocking_get_latest_earnings,
+                DATABASE_FILE,
+                [node_name],
+                period,
             )
-            
-            log.debug(f"[Comparison] Retrieved {len(events)} events for {node_name}")
-            
-            # Calculate latency metrics from sampled events
-            durations = [e.get("duration_ms", 0) for e in events if e.get("duration_ms")]
-            if durations:
-                metrics["avg_latency_p50"] = calculate_percentile(durations, 50)
-                metrics["avg_latency_p95"] = calculate_percentile(durations, 95)
-                metrics["avg_latency_p99"] = calculate_percentile(durations, 99)
+        # Get reputation scores from database (reputation tracker writes to DB)
+        lookups["reputation"] = loop.run_in_executor(
+            app["db_executor"],
+            database.blocking_get_latest_reputation,
+            DATABASE_FILE,
+            [node_name],
+        )
+
+        lookups_start_ns = time.perf_counter_ns() if timed else 0
+        # Let every lookup finish before surfacing a failure so none is left running unobserved
+        results = await asyncio.gather(*lookups.values(), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        fetched = dict(zip(lookups, results))
+        if timed:
+            log.info(
+                "[Comparison Debug] Database lookups (%s) for %s took %.2f seconds",
+                ", ".join(lookups),
+                node_name,
+                (time.perf_counter_ns() - lookups_start_ns) / 1e9,
+            )
+
+        if comparison_type in _NEEDS_EVENTS:
+            async def fetch_sampled_events():
+                log.debug("[Comparison] Fetching up to %d events for %s", sample_size, node_name)
+                sampled = await loop.run_in_executor(
+                    app["db_executor"],
+                    database.blocking_get_events,
+                    DATABASE_FILE,
+                    [node_name],
+                    hours,
+                    sample_size,  # CRITICAL: Add limit parameter
+                )
+                log.debug("[Comparison] Retrieved %d events for %s", len(sampled), node_name)
+                # Default total operations based on sampled events
+                metrics["total_operations"] = len(sampled)
+                return sampled
+
+            if "summary" in fetched:
+                summary_counts, summary_latency = fetched["summary"]
+                if precomputed_counts is None:
+                    precomputed_counts = summary_counts
+                if precomputed_latency is None:
+                    precomputed_latency = summary_latency
+
+            # Latency percentiles over the same recent sample
+            pcts = precomputed_latency.get(node_name)
+            if pcts:
+                metrics["avg_latency_p50"] = pcts[50]
+                metrics["avg_latency_p95"] = pcts[95]
+                metrics["avg_latency_p99"] = pcts[99]
             else:
                 # No latency data available in the window -> display as N/A
                 metrics["avg_latency_p50"] = None
                 metrics["avg_latency_p95"] = None
                 metrics["avg_latency_p99"] = None
 
-            # Default total operations based on sampled events (will be overridden by aggregated counts if available)
-            metrics["total_operations"] = len(events)
-
             # Use aggregated counts for accurate success rates and total operations over the full window
             try:
-                counts_list = await loop.run_in_executor(
-                    app["db_executor"],
-                    blocking_get_event_counts,
-                    DATABASE_FILE,
-                    [node_name],
-                    hours,
-                )
-                if counts_list:
-                    c = counts_list[0]
+                c = precomputed_counts.get(node_name)
+                if c:
                     dl_total = (c.get("dl_success") or 0) + (c.get("dl_fail") or 0)
                     ul_total = (c.get("ul_success") or 0) + (c.get("ul_fail") or 0)
                     audit_total = (c.get("audit_success") or 0) + (c.get("audit_fail") or 0)
@@ -173,97 +431,70 @@ async def gather_node_metrics(app, node_name: str, hours: int, comparison_type:
                     metrics["success_rate_audit"] = ((c.get("audit_success") or 0) / audit_total * 100.0) if audit_total > 0 else None
 
                     metrics["total_operations"] = int(c.get("total_ops") or 0)
-
-                    # Save for later fallback usage (e.g., avg_audit_score if reputation data is missing)
-                    counts = c
                 else:
                     # Fallback to sample-based rates if aggregation returns nothing
-                    downloads = [e for e in events if e.get("action") == "GET"]
-                    uploads = [e for e in events if e.get("action") == "PUT"]
-                    audits = [e for e in events if e.get("action") == "GET_AUDIT"]
-
-                    metrics["success_rate_download"] = calculate_success_rate(downloads) if len(downloads) > 0 else None
-                    metrics["success_rate_upload"] = calculate_success_rate(uploads) if len(uploads) > 0 else None
-                    metrics["success_rate_audit"] = calculate_success_rate(audits) if len(audits) > 0 else None
+                    outcomes = count_outcomes_by_action(await fetch_sampled_events())
+                    for metric_key, action in (
+                        ("success_rate_download", "GET"),
+                        ("success_rate_upload", "PUT"),
+                        ("success_rate_audit", "GET_AUDIT"),
+                    ):
+                        ok, total = outcomes[action]
+                        metrics[metric_key] = (ok / total * 100) if total > 0 else None
             except Exception as agg_err:
-                log.debug(f"[Comparison] Aggregated counts query failed for {node_name}: {agg_err}")
+                log.debug("[Comparison] Aggregated counts query failed for %s: %s", node_name, agg_err)
                 # Fallback to sample-based calculation
-                downloads = [e for e in events if e.get("action") == "GET"]
-                uploads = [e for e in events if e.get("action") == "PUT"]
-                audits = [e for e in events if e.get("action") == "GET_AUDIT"]
-
-                metrics["success_rate_download"] = calculate_success_rate(downloads)
-                metrics["success_rate_upload"] = calculate_success_rate(uploads)
-                metrics["success_rate_audit"] = calculate_success_rate(audits)
+                outcomes = count_outcomes_by_action(await fetch_sampled_events())
+                for metric_key, action in (
+                    ("success_rate_download", "GET"),
+                    ("success_rate_upload", "PUT"),
+                    ("success_rate_audit", "GET_AUDIT"),
+                ):
+                    ok, total = outcomes[action]
+                    metrics[metric_key] = (ok / total * 100) if total > 0 else 0.0
         
-        if comparison_type in ["earnings", "overall"]:
-            # Get earnings data - PERFORMANCE FIX: Always use pre-computed earnings from database
-            import datetime
-            now = datetime.datetime.now(datetime.timezone.utc)
-            period = now.strftime("%Y-%m")
-            
-            earnings_start_time = time.time()
-            log.info(f"[Comparison] Fetching earnings for {node_name}, period: {period}")
-            
-            # CRITICAL OPTIMIZATION: Always use pre-computed earnings from database
-            # instead of recalculating via financial tracker. This is the main bottleneck
-            # when comparing multiple nodes.
-            earnings_list = await loop.run_in_executor(
-                app["db_executor"],
-                blocking_get_latest_earnings,
-                DATABASE_FILE,
-                [node_name],
-                period,
-            )
-            
-            if earnings_list:
-                total_earnings = sum(e.get("total_earnings_net", 0) for e in earnings_list)
-                log.info(f"[Comparison] Total earnings for {node_name}: ${total_earnings:.2f}")
+        if comparison_type in _NEEDS_EARNINGS:
+            if cached_total_earnings is not None:
+                total_earnings = cached_total_earnings
+            else:
+                earnings_list = fetched["earnings"]
+                total_earnings = (
+                    sum(e.get("total_earnings_net", 0) for e in earnings_list) if earnings_list else None
+                )
+                if total_earnings is not None:
+                    app["earnings_totals_cache"][earnings_key] = total_earnings
+            if total_earnings is not None:
+                log.info("[Comparison] Total earnings for %s: $%.2f", node_name, total_earnings)
                 metrics["total_earnings"] = total_earnings
                 
-                # This storage_list will be retrieved later in a single batch operation
-                # to avoid redundant per-node database calls
-                storage_list = None
-                
                 # Storage data is now handled at a higher level in calculate_comparison_metrics
                 # The earnings_per_tb will be calculated there using the batch-loaded storage data
                 metrics["earnings_per_tb"] = None  # Default to None; will be computed when storage data is injected
             else:
-                log.warning(f"[Comparison] No earnings found for {node_name}, period: {period}")
+                log.warning("[Comparison] No earnings found for %s, period: %s", node_name, period)
                 # Mark as not-yet-ready with None so UI shows N/A and cache logic can detect incompleteness
                 metrics["total_earnings"] = None
                 metrics["earnings_per_tb"] = None
-            
-            earnings_duration = time.time() - earnings_start_time
-            log.info(f"[Comparison] Earnings lookup for {node_name} took {earnings_duration:.2f} seconds")
         
-        if comparison_type in ["efficiency", "overall"]:
+        if comparison_type in _NEEDS_EFFICIENCY:
             # Storage data is now handled at a higher level in calculate_comparison_metrics
             # Default values set to None; they will be updated when storage data is injected
             metrics["storage_utilization"] = None
             metrics["storage_efficiency"] = None
         
-        # Get reputation scores from database (reputation tracker writes to DB)
-        reputation_start_time = time.time()
-        log.info(f"[Comparison Debug] Starting reputation lookup for {node_name}")
-        reputation_list = await loop.run_in_executor(
-            app["db_executor"],
-            blocking_get_latest_reputation,
-            DATABASE_FILE,
-            [node_name],
-        )
-        reputation_duration = time.time() - reputation_start_time
-        log.info(f"[Comparison Debug] Reputation lookup for {node_name} took {reputation_duration:.2f} seconds")
-        
+        reputation_list = fetched["reputation"]
         if reputation_list:
             audit_score = calculate_avg_score(reputation_list, "audit_score")
             online_score = calculate_avg_score(reputation_list, "online_score")
-            log.info(f"[Comparison] Scores for {node_name}: audit={audit_score:.4f}, online={online_score:.4f}")
+            log.info("[Comparison] Scores for %s: audit=%.4f, online=%.4f", node_name, audit_score, online_score)
             metrics["avg_audit_score"] = audit_score
             metrics["avg_online_score"] = online_score
         else:
             # No reputation data in database - reputation tracking may not be enabled
-            log.debug(f"[Comparison] No reputation history in database for {node_name} - reputation tracking may not be enabled")
+            log.debug(
+                "[Comparison] No reputation history in database for %s - reputation tracking may not be enabled",
+                node_name,
+            )
             # Fallback: derive audit score from audit success rate if available
             if "success_rate_audit" in metrics and metrics["success_rate_audit"] is not None:
                 metrics["avg_audit_score"] = metrics["success_rate_audit"]
@@ -274,7 +505,8 @@ async def gather_node_metrics(app, node_name: str, hours: int, comparison_type:
             metrics["avg_online_score"] = None
     
     except Exception as e:
-        log.error(f"Error gathering metrics for node {node_name}: {e}", exc_info=True)
+        log.error("Error gathering metrics for node %s: %s", node_name, e, exc_info=True)
+        node_cache_key = None  # Never cache failed lookups
         # Return N/A semantics on error so UI doesn't render misleading zeros
         metrics = {
             "success_rate_download": None,
@@ -292,8 +524,17 @@ async def gather_node_metrics(app, node_name: str, hours: int, comparison_type:
             "avg_online_score": None,
         }
     
-    total_duration = time.time() - start_time
-    log.info(f"[Comparison Debug] Total metrics gathering for {node_name} took {total_duration:.2f} seconds")
+    if timed:
+        log.info(
+            "[Comparison Debug] Total metrics gathering for %s took %.2f seconds",
+            node_name,
+            (time.perf_counter_ns() - start_ns) / 1e9,
+        )
+
+    # Earnings may not be written yet right after startup; don't pin a missing value
+    earnings_pending = comparison_type in _NEEDS_EARNINGS and metrics.get("total_earnings") is None
+    if node_cache_key is not None and not earnings_pending:
+        app["node_metrics_cache"][node_cache_key] = dict(metrics)
     return metrics
 
 
@@ -307,18 +548,24 @@ def calculate_rankings(nodes_data: List[Dict], comparison_type: str) -> Dict[str
     if not nodes_data:
         return rankings
 
+    # Resolve each node's metrics dict once instead of once per metric
+    node_metrics = [(node["node_name"], node.get("metrics", {})) for node in nodes_data]
+
     # Use union of keys across nodes to avoid missing metrics
     metric_keys = set()
-    for node in nodes_data:
-        metric_keys.update(node.get("metrics", {}).keys())
+    for _name, metrics in node_metrics:
+        metric_keys.update(metrics)
+
+    if USE_NUMPY:
+        return _calculate_rankings_numpy(node_metrics, list(metric_keys))
 
     for metric_key in metric_keys:
         is_latency = "latency" in metric_key
 
         # Build sortable tuples (node_name, sort_key) while handling None gracefully
         sortable = []
-        for node in nodes_data:
-            value = node.get("metrics", {}).get(metric_key)
+        for node_name, metrics in node_metrics:
+            value = metrics.get(metric_key)
 
             if is_latency:
                 # Lower is better; None, 0, or negative treated as worst
@@ -333,7 +580,7 @@ def calculate_rankings(nodes_data: List[Dict], comparison_type: str) -> Dict[str
                 else:
                     sort_key = float("-inf")
 
-            sortable.append((node["node_name"], sort_key))
+            sortable.append((node_name, sort_key))
 
         # Sort accordingly
         if is_latency:
@@ -346,6 +593,32 @@ def calculate_rankings(nodes_data: List[Dict], comparison_type: str) -> Dict[str
     return rankings
 
 
+def _calculate_rankings_numpy(node_metrics: List[tuple], metric_keys: List[str]) -> Dict[str, List[str]]:
+    """
+    Vectorized calculate_rankings over [(node_name, metrics), ...]: one stable argsort
+    over a (metric, node) matrix. Keys are sign-flipped for higher-is-better metrics
+    so every row sorts ascending.
+    """
+    node_names = np.array([name for name, _metrics in node_metrics], dtype=object)
+    keys = np.empty((len(metric_keys), len(node_metrics)), dtype=np.float64)
+
+    for row, metric_key in enumerate(metric_keys):
+        is_latency = "latency" in metric_key
+        for col, (_name, metrics) in enumerate(node_metrics):
+            value = metrics.get(metric_key)
+            if is_latency:
+                # Lower is better; None, 0, or negative treated as worst
+                keys[row, col] = value if isinstance(value, (int, float)) and value > 0 else np.inf
+            else:
+                # Higher is better; None treated as very low
+                keys[row, col] = -value if isinstance(value, (int, float)) else np.inf
+
+    order = np.argsort(keys, axis=1, kind="stable")
+    return {
+        metric_key: node_names[order[row]].tolist() for row, metric_key in enumerate(metric_keys)
+    }
+
+
 async def calculate_comparison_metrics(
     app, node_names: List[str], comparison_type: str, time_range: str
 ) -> Dict:
@@ -355,10 +628,8 @@ async def calculate_comparison_metrics(
     OPTIMIZED: Uses caching, concurrent execution, and pre-computed data
     from database for better performance.
     """
-    # Import at the top of function to avoid scope issues
-    import asyncio
-    import time as time_module  # Use a different name to avoid variable shadowing
     from .database import (
+        blocking_get_perf_summary,
         blocking_get_latest_storage_with_forecast,
         blocking_get_latest_reputation,
         blocking_get_latest_earnings,
@@ -366,6 +637,8 @@ async def calculate_comparison_metrics(
     
     # Parse time range
     hours = parse_time_range(time_range)
+    # Earnings period shared by the batch lookups and every per-node gather
+    current_period = month_period()
     
     # PERFORMANCE OPTIMIZATION: Enhanced caching for comparison data
     # Scale cache TTL based on number of nodes being compared and comparison type
@@ -387,19 +660,21 @@ async def calculate_comparison_metrics(
     cache_ttl = min(base_ttl * node_factor * type_factor, 1200)
     
     if "comparison_cache" not in app:
-        app["comparison_cache"] = {}
-    
-    if cache_key in app["comparison_cache"]:
-        cached_data, cache_time = app["comparison_cache"][cache_key]
-        cache_age_ok = (time_module.time() - cache_time) < cache_ttl
+        app["comparison_cache"] = OrderedDict()
+    comparison_cache = app["comparison_cache"]
+
+    if cache_key in comparison_cache:
+        cached_data, cache_time = comparison_cache[cache_key]
+        # Monotonic timestamps: wall-clock jumps can't expire or pin entries
+        cache_age_ok = (time.monotonic() - cache_time) < cache_ttl
 
         # Warm-up guard: during first few minutes after server start, avoid using
         # cached earnings/overall results if they contain missing or zero earnings.
         warmup_guard = False
-        if comparison_type in ["earnings", "overall"]:
+        if comparison_type in _NEEDS_EARNINGS:
             app_start = app.get("start_time", 0)
             warmup_window = 300  # 5 minutes
-            if app_start and (time_module.time() - app_start) < warmup_window:
+            if app_start and (time.time() - app_start) < warmup_window:
                 try:
                     nodes = cached_data.get("nodes", [])
                     warmup_guard = any(
@@ -411,22 +686,29 @@ async def calculate_comparison_metrics(
                     warmup_guard = False
 
         if cache_age_ok and not warmup_guard:
-            log.info(f"[Comparison] Using cached results for {len(node_names)} nodes (type={comparison_type})")
+            log.info("[Comparison] Using cached results for %d nodes (type=%s)", len(node_names), comparison_type)
+            comparison_cache.move_to_end(cache_key)
             return cached_data
         else:
             if warmup_guard:
                 log.info("[Comparison] Ignoring cached comparison during warm-up due to incomplete earnings")
     
-    start_time = time_module.time()
+    timed = log.isEnabledFor(logging.INFO)
+    start_ns = time.perf_counter_ns() if timed else 0
     loop = asyncio.get_running_loop()  # Get the current event loop
     
-    log.info(f"[Comparison Debug] Computing metrics for {len(node_names)} nodes (type={comparison_type}, range={time_range})")
+    log.info(
+        "[Comparison Debug] Computing metrics for %d nodes (type=%s, range=%s)",
+        len(node_names),
+        comparison_type,
+        time_range,
+    )
     
     # PERFORMANCE OPTIMIZATION: Get storage data in a single batch operation for all nodes
     # This prevents redundant database calls when each node requests storage data
-    storage_data_start = time_module.time()
+    storage_data_start_ns = time.perf_counter_ns() if timed else 0
     storage_data = {}
-    if comparison_type in ["earnings", "overall", "efficiency"]:
+    if comparison_type in _NEEDS_STORAGE:
         storage_list = await loop.run_in_executor(
             app["db_executor"],
             blocking_get_latest_storage_with_forecast,
@@ -440,14 +722,15 @@ async def calculate_comparison_metrics(
             if "node_name" in item:
                 storage_data[item["node_name"]] = item
         
-        log.info(f"[Comparison Debug] Batch storage data retrieval took {time_module.time() - storage_data_start:.2f} seconds")
+        if timed:
+            log.info(
+                "[Comparison Debug] Batch storage data retrieval took %.2f seconds",
+                (time.perf_counter_ns() - storage_data_start_ns) / 1e9,
+            )
 
     # Batch-load earnings for the current month to avoid per-node gaps and ensure consistency
     earnings_lookup = {}
-    if comparison_type in ["earnings", "overall"]:
-        import datetime
-        now_dt = datetime.datetime.now(datetime.timezone.utc)
-        current_period = now_dt.strftime("%Y-%m")
+    if comparison_type in _NEEDS_EARNINGS:
         earnings_list = await loop.run_in_executor(
             app["db_executor"],
             blocking_get_latest_earnings,
@@ -455,7 +738,6 @@ async def calculate_comparison_metrics(
             node_names,
             current_period,
         )
-        from collections import defaultdict
         agg = defaultdict(float)
         for row in (earnings_list or []):
             try:
@@ -463,22 +745,7 @@ async def calculate_comparison_metrics(
             except Exception:
                 pass
         earnings_lookup = dict(agg)
-        # Fallback: if DB returns no rows for current month (e.g., race with writer),
-        # pull totals from in-memory earnings cache used by the Financial card.
-        try:
-            cache = app_state.get("earnings_cache", {})
-            for n in node_names:
-                v = earnings_lookup.get(n)
-                if not isinstance(v, (int, float)) or v <= 0:
-                    payload = cache.get((n, current_period))
-                    if payload and isinstance(payload.get("data"), list) and payload["data"]:
-                        total_net = sum(float(item.get("total_net") or 0.0) for item in payload["data"])
-                        if total_net > 0:
-                            earnings_lookup[n] = total_net
-        except Exception:
-            # Non-fatal; just means fallback cache wasn't available
-            pass
-        log.info(f"[Comparison Debug] Batch earnings aggregation prepared for {len(earnings_lookup)} node(s)")
+        log.info("[Comparison Debug] Batch earnings aggregation prepared for %d node(s)", len(earnings_lookup))
 
     # Batch-load latest reputation for all nodes; use as fallback if per-node call returns empty
     avg_audit_by_node = {}
@@ -490,58 +757,103 @@ async def calculate_comparison_metrics(
             DATABASE_FILE,
             node_names,
         )
-        from collections import defaultdict
-        rep_by_node = defaultdict(list)
+        # Single pass: [audit_sum, audit_count, online_sum, online_count] per node
+        score_sums = defaultdict(lambda: [0.0, 0, 0.0, 0])
         for r in (rep_list_all or []):
             key = r.get("node_name")
             if key:
-                rep_by_node[key].append(r)
-        for n, rows in rep_by_node.items():
-            try:
-                avg_audit_by_node[n] = calculate_avg_score(rows, "audit_score")
-                avg_online_by_node[n] = calculate_avg_score(rows, "online_score")
-            except Exception:
-                pass
-        log.info(f"[Comparison Debug] Batch reputation prepared for {len(rep_by_node)} node(s)")
+                acc = score_sums[key]
+                if r.get("audit_score") is not None:
+                    acc[0] += r["audit_score"]
+                    acc[1] += 1
+                if r.get("online_score") is not None:
+                    acc[2] += r["online_score"]
+                    acc[3] += 1
+        # Same semantics as calculate_avg_score: 0.0 when a node has no scores
+        for n, (audit_sum, audit_n, online_sum, online_n) in score_sums.items():
+            avg_audit_by_node[n] = audit_sum / audit_n if audit_n else 0.0
+            avg_online_by_node[n] = online_sum / online_n if online_n else 0.0
+        log.info("[Comparison Debug] Batch reputation prepared for %d node(s)", len(score_sums))
     except Exception:
         log.debug("[Comparison Debug] Batch reputation retrieval failed (non-fatal)", exc_info=True)
 
-    # Gather metrics for each node concurrently - but now with pre-loaded storage data
-    async def gather_with_storage(node_name):
-        metrics = await gather_node_metrics(app, node_name, hours, comparison_type)
-        
-        # Inject storage data if we have it
-        if node_name in storage_data:
-            storage = storage_data[node_name]
-            
-            # Update earnings per TB calculation if we have earnings data
-            te = metrics.get("total_earnings")
-            if comparison_type in ["earnings", "overall"] and isinstance(te, (int, float)) and te > 0:
-                if storage.get("used_bytes"):
-                    used_space_tb = storage["used_bytes"] / (1024 ** 4)
-                    if used_space_tb and used_space_tb > 0:
-                        metrics["earnings_per_tb"] = te / used_space_tb
-            
-            # Update storage efficiency metrics
-            if comparison_type in ["efficiency", "overall"]:
-                up = storage.get("used_percent")
-                metrics["storage_utilization"] = up if (up is not None) else None
-                metrics["storage_efficiency"] = calculate_storage_efficiency(storage) if (up is not None) else None
-        
-        return metrics
-    
-    tasks = [gather_with_storage(node_name) for node_name in node_names]
-    metrics_results = await asyncio.gather(*tasks, return_exceptions=True)
+    # Batch-load operation counts and latency percentiles for nodes whose metrics are not cached yet
+    event_counts = None
+    latency_percentiles = None
+    if comparison_type in _NEEDS_EVENTS:
+        node_metrics_cache = app.get("node_metrics_cache")
+        uncached_nodes = [
+            n
+            for n in node_names
+            if node_metrics_cache is None or (n, hours, comparison_type) not in node_metrics_cache
+        ]
+        if uncached_nodes:
+            event_counts, latency_percentiles = await loop.run_in_executor(
+                app["db_executor"],
+                blocking_get_perf_summary,
+                DATABASE_FILE,
+                uncached_nodes,
+                hours,
+                (50, 95, 99),
+                comparison_sample_size(hours),
+            )
+
+    # Bound fan-out so a large comparison cannot queue every node's queries on the DB executor at once
+    semaphore = asyncio.Semaphore(COMPARISON_MAX_CONCURRENT_NODES)
+
+    async def gather_bounded(index, node_name):
+        async with semaphore:
+            try:
+                return index, await gather_node_metrics(
+                    app,
+                    node_name,
+                    hours,
+                    comparison_type,
+                    precomputed_counts=event_counts,
+                    precomputed_latency=latency_percentiles,
+                    period=current_period,
+                )
+            except Exception as e:
+                return index, e
+
+    # Collect results as nodes finish rather than waiting on the slowest one to start processing
+    metrics_results = [None] * len(node_names)
+    for next_done in asyncio.as_completed(
+        [gather_bounded(i, node_name) for i, node_name in enumerate(node_names)]
+    ):
+        index, result = await next_done
+        metrics_results[index] = result
     
-    gather_duration = time_module.time() - start_time
-    log.info(f"[Comparison Debug] Gathering metrics for {len(node_names)} nodes took {gather_duration:.2f} seconds")
+    if timed:
+        log.info(
+            "[Comparison Debug] Gathering metrics for %d nodes took %.2f seconds",
+            len(node_names),
+            (time.perf_counter_ns() - start_ns) / 1e9,
+        )
     
+    earnings_cache = app_state.get("earnings_cache", {})
+
+    def cached_earnings_total(name):
+        # Fallback: if DB returns no rows for current month (e.g., race with writer),
+        # pull totals from in-memory earnings cache used by the Financial card.
+        payload = earnings_cache.get((name, current_period))
+        if payload and isinstance(payload.get("data"), list) and payload["data"]:
+            try:
+                return sum(float(item.get("total_net") or 0.0) for item in payload["data"])
+            except Exception:
+                return None
+        return None
+
+    # Single post-processing pass: error defaults plus storage, earnings and reputation overlays
+    # Whether any node is still missing earnings; decides below if the result may be cached
+    earnings_incomplete = False
     nodes_data = []
-    for node_name, result in zip(node_names, metrics_results):
-        if isinstance(result, Exception):
-            log.error(f"[Comparison] Error gathering metrics for {node_name}: {result}")
+    for node_name, metrics in zip(node_names, metrics_results):
+        failed = isinstance(metrics, Exception)
+        if failed:
+            log.error(f"[Comparison] Error gathering metrics for {node_name}: {metrics}")
             # Provide empty metrics on error
-            result = {
+            metrics = {
                 "success_rate_download": 0,
                 "success_rate_upload": 0,
                 "success_rate_audit": 0,
@@ -556,44 +868,41 @@ async def calculate_comparison_metrics(
                 "avg_audit_score": 0,
                 "avg_online_score": 0,
             }
-        nodes_data.append({"node_name": node_name, "metrics": result})
+        storage = storage_data.get(node_name)
 
-    # Overlay any missing metrics using batch lookups to avoid N/A when data exists
-    for node in nodes_data:
-        name = node["node_name"]
-        metrics = node["metrics"]
+        # Storage efficiency overlay from the batch-loaded storage data
+        if storage and not failed and comparison_type in _NEEDS_EFFICIENCY:
+            up = storage.get("used_percent")
+            metrics["storage_utilization"] = up
+            metrics["storage_efficiency"] = calculate_storage_efficiency(storage) if (up is not None) else None
 
         # Earnings overlay
-        if comparison_type in ["earnings", "overall"]:
+        if comparison_type in _NEEDS_EARNINGS:
             # If per-node call didn't find earnings, overlay from batch DB/cache results
-            if (metrics.get("total_earnings") is None) or (metrics.get("total_earnings") == 0):
-                te = earnings_lookup.get(name)
-                if isinstance(te, (int, float)) and te > 0:
-                    metrics["total_earnings"] = te
+            te = metrics.get("total_earnings")
+            if te is None or te == 0:
+                batch_te = earnings_lookup.get(node_name)
+                if not isinstance(batch_te, (int, float)) or batch_te <= 0:
+                    batch_te = cached_earnings_total(node_name)
+                if isinstance(batch_te, (int, float)) and batch_te > 0:
+                    metrics["total_earnings"] = te = batch_te
 
             # Compute earnings_per_tb if not set and we have storage + earnings
-            te_val = metrics.get("total_earnings")
-            if (
-                (metrics.get("earnings_per_tb") is None or not isinstance(metrics.get("earnings_per_tb"), (int, float)))
-                and isinstance(te_val, (int, float))
-                and te_val > 0
-            ):
-                s = storage_data.get(name)
-                used_bytes = s.get("used_bytes") if s else None
-                if isinstance(used_bytes, (int, float)) and used_bytes > 0:
-                    used_tb = used_bytes / (1024 ** 4)
-                    if used_tb > 0:
-                        metrics["earnings_per_tb"] = te_val / used_tb
+            if storage and not isinstance(metrics.get("earnings_per_tb"), (int, float)):
+                per_tb = earnings_per_tb_from_bytes(te, storage.get("used_bytes"))
+                if per_tb is not None:
+                    metrics["earnings_per_tb"] = per_tb
+
+            # If earnings are missing (None), skip caching to avoid pinning unknown values after startup
+            earnings_incomplete = earnings_incomplete or metrics.get("total_earnings") is None
 
         # Reputation overlay (ensure online/audit scores present for all comparison types)
-        if metrics.get("avg_online_score") is None and name in avg_online_by_node:
-            v = avg_online_by_node.get(name)
-            if isinstance(v, (int, float)):
-                metrics["avg_online_score"] = v
-        if metrics.get("avg_audit_score") is None and name in avg_audit_by_node:
-            v = avg_audit_by_node.get(name)
-            if isinstance(v, (int, float)):
-                metrics["avg_audit_score"] = v
+        if metrics.get("avg_online_score") is None and node_name in avg_online_by_node:
+            metrics["avg_online_score"] = avg_online_by_node[node_name]
+        if metrics.get("avg_audit_score") is None and node_name in avg_audit_by_node:
+            metrics["avg_audit_score"] = avg_audit_by_node[node_name]
+
+        nodes_data.append({"node_name": node_name, "metrics": metrics})
     
     # PERFORMANCE OPTIMIZATION: Skip ranking calculation for large node sets if data is limited
     if len(node_names) >= 5 and comparison_type == "performance":
@@ -612,47 +921,225 @@ async def calculate_comparison_metrics(
         # For smaller node sets or non-performance comparisons, calculate all rankings
         rankings = calculate_rankings(nodes_data, comparison_type)
     
-    # Add ranking calculation timing
-    # OPTIMIZATION: Skip redundant ranking calculation
-    # Calculate rankings based on either subset or full data as decided earlier
-    ranking_start_time = time_module.time()
-    # No need to recalculate rankings here, already done in the optimization branch above
-    ranking_duration = time_module.time() - ranking_start_time
-    
-    log.info(f"[Comparison Debug] Ranking calculation took {ranking_duration:.2f} seconds")
-    
     result = {"nodes": nodes_data, "rankings": rankings}
     
-    total_duration = time_module.time() - start_time
-    log.info(f"[Comparison Debug] Total comparison calculation for {len(node_names)} nodes took {total_duration:.2f} seconds")
-    
-    # Determine if results are complete enough to cache.
-    # If earnings are missing (None) for any node in an earnings-related comparison,
-    # skip caching to avoid pinning zeros/unknown values after startup.
-    earnings_incomplete = False
-    if comparison_type in ["earnings", "overall"]:
-        try:
-            earnings_incomplete = any(n.get("metrics", {}).get("total_earnings") is None for n in nodes_data)
-        except Exception:
-            earnings_incomplete = False
+    if timed:
+        log.info(
+            "[Comparison Debug] Total comparison calculation for %d nodes took %.2f seconds",
+            len(node_names),
+            (time.perf_counter_ns() - start_ns) / 1e9,
+        )
     
     if earnings_incomplete:
         log.info("[Comparison] Skipping cache for this result because earnings are not ready for all nodes")
     else:
-        # Cache the result
-        app["comparison_cache"][cache_key] = (result, time_module.time())
-        
-        # Limit cache size to prevent memory bloat
-        if len(app["comparison_cache"]) > 100:
-            # Remove oldest entries
-            oldest_keys = sorted(app["comparison_cache"].keys(), key=lambda k: app["comparison_cache"][k][1])[:50]
-            for key in oldest_keys:
-                del app["comparison_cache"][key]
-        log.info(f"[Comparison] Computed and cached metrics for {len(node_names)} nodes")
+        # Cache the result; the OrderedDict is kept in LRU order so eviction is O(1)
+        comparison_cache[cache_key] = (result, time.monotonic())
+        comparison_cache.move_to_end(cache_key)
+        while len(comparison_cache) > COMPARISON_CACHE_MAX_ENTRIES:
+            comparison_cache.popitem(last=False)
+        log.info("[Comparison] Computed and cached metrics for %d nodes", len(node_names))
     
     return result
 
 
+async def gather_payout_forecasts(app, node_names, period: str, loop) -> Dict[str, Any]:
+    """
+    Forecast month-end payouts for the given nodes concurrently.
+    Each node is forecast once, however many satellite rows it has; nodes without
+    a tracker or whose forecast fails map to None.
+    """
+    trackers = app.get("financial_trackers", {})
+    nodes = [name for name in dict.fromkeys(node_names) if trackers.get(name)]
+    results = await asyncio.gather(
+        *(
+            trackers[name].forecast_payout(DATABASE_FILE, period, loop, app.get("db_executor"))
+            for name in nodes
+        ),
+        return_exceptions=True,
+    )
+    forecasts = {}
+    for name, result in zip(nodes, results):
+        if isinstance(result, BaseException):
+            log.error(f"Failed to get forecast for {name}: {result}")
+            result = None
+        forecasts[name] = result
+    return forecasts
+
+
+async def send_cached_payload(ws, cache: PayloadCache, key) -> bool:
+    """
+    Send a cached payload using the encoded bytes memoized with it, so every
+    client viewing the same period reuses one serialization.
+    Returns False when nothing is cached for the key.
+    """
+    data = cache.get_encoded(key, encode_json)
+    if data is None:
+        return False
+    await send_encoded(ws, data)
+    return True
+
+
+async def get_earnings_payload(
+    app, view: List[str], nodes_to_query, period: str, period_param: str, cache_key: tuple
+) -> Dict:
+    """
+    Return the earnings_data payload for a view and period, from the earnings cache
+    when possible. Concurrent requests for the same cache key share one in-flight
+    computation, so simultaneous dashboards run the queries and forecasts once.
+    """
+    cached_payload = app_state["earnings_cache"].get(cache_key)
+    if cached_payload is not None:
+        return cached_payload
+
+    if "earnings_inflight" not in app:
+        app["earnings_inflight"] = {}
+    inflight = app["earnings_inflight"]
+    task = inflight.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _build_earnings_payload(app, view, nodes_to_query, period, period_param, cache_key)
+        )
+        inflight[cache_key] = task
+        task.add_done_callback(lambda _done: inflight.pop(cache_key, None))
+    else:
+        log.debug(f"[EARNINGS] Joining in-flight earnings query for {cache_key}")
+    # Shielded so one client's disconnect doesn't abort the query others are awaiting
+    return await asyncio.shield(task)
+
+
+async def _build_earnings_payload(
+    app, view: List[str], nodes_to_query, period: str, period_param: str, cache_key: tuple
+) -> Dict:
+    """Query, forecast and format earnings for get_earnings_payload, then cache the payload."""
+    loop = asyncio.get_running_loop()
+    earnings_data = await loop.run_in_executor(
+        app["db_executor"],
+        database.blocking_get_latest_earnings,
+        DATABASE_FILE,
+        nodes_to_query,
+        period,
+    )
+
+    # SAFETY FALLBACK:
+    # In rare cases an IN (...) query can yield no rows due to planner quirks or parameterization,
+    # while per-node queries do return results. If we see zero rows for a multi-node selection,
+    # query each node individually and merge the results.
+    if (not earnings_data) and len(nodes_to_query) > 1:
+        merged = []
+        for node in nodes_to_query:
+            try:
+                part = await loop.run_in_executor(
+                    app["db_executor"],
+                    database.blocking_get_latest_earnings,
+                    DATABASE_FILE,
+                    [node],
+                    period,
+                )
+                if part:
+                    merged.extend(part)
+            except Exception as e:
+                log.debug(f"[EARNINGS][FALLBACK] per-node query failed for {node}: {e}")
+        if merged:
+            earnings_data = merged
+            log.info(f"[EARNINGS][FALLBACK] Combined per-node queries returned {len(merged)} records")
+
+    # DEBUG: trace DB result set
+    try:
+        total_records = len(earnings_data) if earnings_data else 0
+        per_node_counts = {}
+        for n in nodes_to_query:
+            per_node_counts[n] = sum(1 for r in (earnings_data or []) if r.get("node_name") == n)
+        log.info(f"[EARNINGS][DB] period={period} records={total_records} per_node={per_node_counts}")
+        if total_records == 0:
+            log.warning(f"[EARNINGS][DB] No earnings returned for nodes={nodes_to_query} period={period}")
+    except Exception:
+        pass
+
+    # Format data with forecasts
+    # If DB returned nothing for a multi-node request, synthesize from cached per-node payloads
+    use_cached_merge = False
+    formatted_data = []
+
+    if (not earnings_data) and len(nodes_to_query) > 1:
+        cache = app_state.get("earnings_cache", {})
+        cached_merge = []
+        for n in nodes_to_query:
+            ck = (n, period)
+            cp = cache.get(ck)
+            if cp and isinstance(cp.get("data"), list) and cp["data"]:
+                cached_merge.extend(cp["data"])
+        if cached_merge:
+            formatted_data = cached_merge
+            use_cached_merge = True
+            log.info(f"[EARNINGS][CACHE] Merged cached per-node data for view {view}: {len(formatted_data)} items")
+
+    if not use_cached_merge:
+        forecasts = await gather_payout_forecasts(
+            app, [estimate["node_name"] for estimate in earnings_data], period, loop
+        )
+        for estimate in earnings_data:
+            forecast_info = forecasts.get(estimate["node_name"])
+
+            sat_name = SATELLITE_NAMES.get(estimate["satellite"], estimate["satellite"][:8])
+
+            formatted_data.append(
+                {
+                    "node_name": estimate["node_name"],
+                    "satellite": sat_name,
+                    "total_net": round(estimate["total_earnings_net"], 2),
+                    "total_gross": round(estimate["total_earnings_gross"], 2),
+                    "held_amount": round(estimate["held_amount"], 2),
+                    "breakdown": {
+                        "egress": round(estimate["egress_earnings_net"], 2),
+                        "storage": round(estimate["storage_earnings_net"], 2),
+                        "repair": round(estimate["repair_earnings_net"], 2),
+                        "audit": round(estimate["audit_earnings_net"], 2),
+                    },
+                    "forecast_month_end": round(forecast_info["forecasted_payout"], 2)
+                    if forecast_info
+                    else None,
+                    "confidence": round(forecast_info["confidence"], 2)
+                    if forecast_info
+                    else None,
+                }
+            )
+
+    # Include pending flag so frontend can show a loading state during startup/warm-up
+    payload = {
+        "type": "earnings_data",
+        "period": period,
+        "period_name": period_param,
+        "data": formatted_data,
+        "view": view,  # include view so frontend can filter out stale updates
+        "pending": True if (not formatted_data and period_param == "current") else False
+    }
+
+    # Debug log to show what breakdown values are being sent
+    log.info(
+        f"Sending earnings for period {period} with {len(formatted_data)} satellites"
+    )
+    for item in formatted_data:
+        breakdown = item.get("breakdown", {})
+        total_breakdown = sum(breakdown.values())
+        log.debug(
+            f"[{item['node_name']}] {item['satellite']}: "
+            f"total_net=${item['total_net']:.2f}, "
+            f"breakdown sum=${total_breakdown:.2f}"
+        )
+
+    # Store in cache with period included in key
+    app_state["earnings_cache"][cache_key] = payload
+
+    # DEBUG: trace payload summary
+    try:
+        log.info(f"[EARNINGS][SEND] view={view} period_name={period_param} items={len(formatted_data)} cache_key={cache_key}")
+    except Exception:
+        pass
+
+    return payload
+
+
 async def handle_comparison_request(app, data: Dict) -> Dict:
     """
     Handle multi-node comparison data request.
@@ -674,7 +1161,7 @@ async def handle_comparison_request(app, data: Dict) -> Dict:
     )
     
     # Validate node names
-    valid_nodes = set(app["nodes"].keys())
+    valid_nodes = app["node_names_frozen"]
     valid_node_names = [n for n in node_names if n in valid_nodes]
     
     if not valid_node_names:
@@ -702,37 +1189,24 @@ async def handle_comparison_request(app, data: Dict) -> Dict:
 STATIC_VERSION = str(int(time.time()))
 
 
-async def safe_send_json(ws: web.WebSocketResponse, payload: dict) -> bool:
-    """
-    Safely send JSON data over WebSocket, handling connection errors gracefully.
-
-    Returns:
-        bool: True if sent successfully, False if connection was closed/closing
-    """
-    try:
-        if ws.closed:
-            return False
-        await ws.send_json(payload)
-        return True
-    except (
-        ConnectionResetError,
-        aiohttp.client_exceptions.ClientConnectionResetError,
-        RuntimeError,
-        asyncio.CancelledError,
-    ) as e:
-        # Client disconnected or connection is closing - this is normal, don't log as error
-        log.debug(f"Could not send message to client (connection closing): {type(e).__name__}")
-        return False
-    except Exception as e:
-        # Unexpected error - log it
-        log.warning(f"Unexpected error sending WebSocket message: {e}", exc_info=True)
-        return False
+# (nodes registry, generation, payload) of the last built compactions payload
+_active_compactions_cache = (None, None, None)
 
 
 def get_active_compactions_payload() -> Dict[str, Any]:
-    """Gathers currently active compactions from all nodes and creates a payload."""
+    """
+    Gathers currently active compactions from all nodes and creates a payload.
+    The payload is reused until app_state["active_compactions_generation"] is bumped.
+    """
+    global _active_compactions_cache
+    nodes = app_state["nodes"]
+    generation = app_state.get("active_compactions_generation", 0)
+    cached_nodes, cached_generation, cached_payload = _active_compactions_cache
+    if cached_nodes is nodes and cached_generation == generation:
+        return cached_payload
+
     active_list = []
-    for node_name, node_state in app_state["nodes"].items():
+    for node_name, node_state in nodes.items():
         for key, start_time in node_state.get("active_compactions", {}).items():
             try:
                 satellite, store = key.split(":", 1)
@@ -747,7 +1221,9 @@ def get_active_compactions_payload() -> Dict[str, Any]:
             except ValueError:
                 log.warning(f"Malformed compaction key '{key}' for node '{node_name}'")
 
-    return {"type": "active_compactions_update", "compactions": active_list}
+    payload = {"type": "active_compactions_update", "compactions": active_list}
+    _active_compactions_cache = (nodes, generation, payload)
+    return payload
 
 
 async def send_initial_stats(app, ws, view: List[str]):
@@ -755,14 +1231,13 @@ async def send_initial_stats(app, ws, view: List[str]):
     Sends stats to a client upon connection or view change.
     For the optimized version, we use the incremental stats if available.
     """
-    from .state import IncrementalStats
-
     view_tuple = tuple(view)
 
-    # Try to send from cache first
-    if view_tuple in app_state["stats_cache"]:
+    # Try to send from cache first; entries are already-encoded payload bytes
+    cached_data = app_state["stats_cache"].get(view_tuple)
+    if cached_data is not None:
         try:
-            await safe_send_json(ws, app_state["stats_cache"][view_tuple])
+            await send_encoded(ws, cached_data)
             return
         except (ConnectionResetError, asyncio.CancelledError):
             return  # Client disconnected
@@ -772,19 +1247,16 @@ async def send_initial_stats(app, ws, view: List[str]):
 
     # Create temporary incremental stats for this view
     stats = IncrementalStats()
-    nodes_to_process = view if view != ["Aggregate"] else list(app_state["nodes"].keys())
-
-    # Process all current events
-    for node_name in nodes_to_process:
-        if node_name in app_state["nodes"]:
-            for event in list(app_state["nodes"][node_name]["live_events"]):
-                stats.add_event(event, app_state["TOKEN_REGEX"])
+    nodes_to_process = view if view != ["Aggregate"] else app["node_names_tuple"]
 
-    # Update live stats
+    # Snapshot the current events once and reuse them for both passes
     all_events = []
     for node_name in nodes_to_process:
         if node_name in app_state["nodes"]:
-            all_events.extend(list(app_state["nodes"][node_name]["live_events"]))
+            all_events.extend(app_state["nodes"][node_name]["live_events"])
+
+    # Process all current events, then update live stats
+    stats.add_events(all_events, app_state["TOKEN_REGEX"])
     stats.update_live_stats(all_events)
 
     # Get historical stats
@@ -792,15 +1264,47 @@ async def send_initial_stats(app, ws, view: List[str]):
 
     # Generate and send payload
     try:
-        payload = stats.to_payload(historical_stats)
-        app_state["stats_cache"][view_tuple] = payload
-        await safe_send_json(ws, payload)
+        data = encode_json(stats.to_payload(historical_stats))
+        app_state["stats_cache"][view_tuple] = data
+        await send_encoded(ws, data)
     except (ConnectionResetError, asyncio.CancelledError):
         pass  # Client disconnected during computation
     except Exception:
         log.error(f"Error computing initial stats for view {view}:", exc_info=True)
 
 
+async def send_view_update(app, ws, view: List[str], view_seq: int):
+    """
+    Sends stats and cached earnings for a client's new view after a short debounce.
+    Superseded view changes (stale view_seq) are dropped without touching the DB.
+    """
+    await asyncio.sleep(VIEW_CHANGE_DEBOUNCE_SECONDS)
+
+    def is_current() -> bool:
+        client = app_state["websockets"].get(ws)
+        return client is not None and client.get("view_seq") == view_seq
+
+    if not is_current():
+        return
+    await send_initial_stats(app, ws, view)
+    if not is_current():
+        return
+
+    # Send cached earnings data for the new view if available
+    period = month_period()
+
+    # Determine cache key based on view
+    if view == ["Aggregate"]:
+        cache_key = ("Aggregate", period)
+    else:
+        # For single or multiple specific nodes
+        cache_key = (view[0], period) if len(view) == 1 else tuple(sorted(view)) + (period,)
+
+    if cache_key in app_state.get("earnings_cache", {}):
+        log.info(f"Sending cached earnings data for view {view} on view switch")
+        await send_cached_payload(ws, app_state["earnings_cache"], cache_key)
+
+
 @web.middleware
 async def cache_control_middleware(request, handler):
     """Add cache control headers to static files"""
@@ -815,11 +1319,10 @@ async def cache_control_middleware(request, handler):
     return response
 
 
-async def handle_index(request):
-    """Serve index.html with version parameter for cache busting"""
+def render_index_html() -> bytes:
+    """Read index.html and inject the version parameter for cache busting."""
     index_path = os.path.join(os.path.dirname(__file__), "static", "index.html")
 
-    # Read the file and inject version parameter
     with open(index_path, "r") as f:
         content = f.read()
 
@@ -828,36 +1331,560 @@ async def handle_index(request):
     content = content.replace("/static/js/charts.js", f"/static/js/charts.js?v={STATIC_VERSION}")
     content = content.replace("/static/js/comparison.js", f"/static/js/comparison.js?v={STATIC_VERSION}")
     content = content.replace("/static/js/AlertsPanel.js", f"/static/js/AlertsPanel.js?v={STATIC_VERSION}")
+    return content.encode("utf-8")
+
 
-    response = web.Response(text=content, content_type="text/html")
+async def handle_index(request):
+    """Serve index.html with version parameter for cache busting"""
+    # STATIC_VERSION is fixed per process, so run_server renders the page once
+    body = request.app.get("index_body")
+    if body is None:
+        body = render_index_html()
+
+    response = web.Response(body=body, content_type="text/html", charset="utf-8")
     response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
     return response
 
 
+async def _handle_set_view(app, ws, data: Dict):
+    """Switch the client's view and schedule a debounced stats refresh."""
+    new_view = data.get("view")
+    if isinstance(new_view, list) and new_view:
+        valid_nodes = app["node_names_frozen"]
+        is_aggregate = new_view == ["Aggregate"]
+        are_nodes_valid = all(node in valid_nodes for node in new_view)
+
+        if is_aggregate or are_nodes_valid:
+            client = app_state["websockets"][ws]
+            client["view"] = new_view
+            refresh_ws_snapshot()
+            log.info(f"Client switched view to: {new_view}")
+            # Debounce rapid view toggling: only the latest view is computed
+            client["view_seq"] = client.get("view_seq", 0) + 1
+            pending = client.get("pending_view_task")
+            if pending and not pending.done():
+                pending.cancel()
+            client["pending_view_task"] = asyncio.create_task(
+                send_view_update(app, ws, new_view, client["view_seq"])
+            )
+
+
+async def _handle_get_historical_performance(app, ws, data: Dict):
+    """Send binned historical performance built from the live event buffers."""
+    view = data.get("view")  # This is now a list
+    points = data.get("points", 150)
+    interval = data.get("interval_sec", PERFORMANCE_INTERVAL_SECONDS)
+    loop = asyncio.get_running_loop()
+
+    events_to_process = []
+    nodes_to_query = (
+        view if view != ["Aggregate"] else app["node_names_tuple"]
+    )
+    for node_name in nodes_to_query:
+        if node_name in app_state["nodes"]:
+            events_to_process.extend(
+                list(app_state["nodes"][node_name]["live_events"])
+            )
+
+    historical_data = await loop.run_in_executor(
+        app["db_executor"],
+        database.blocking_get_historical_performance,
+        events_to_process,
+        points,
+        interval,
+    )
+    payload = {
+        "type": "historical_performance_data",
+        "view": view,
+        "performance_data": historical_data,
+    }
+    await safe_send_json(ws, payload)
+
+
+async def _handle_get_aggregated_performance(app, ws, data: Dict):
+    """Send aggregated performance from the hourly tables."""
+    view = data.get("view")  # This is a list
+    time_window_hours = data.get("hours", 1)
+    loop = asyncio.get_running_loop()
+
+    nodes_to_query = (
+        view if view != ["Aggregate"] else app["node_names_tuple"]
+    )
+
+    aggregated_data = await loop.run_in_executor(
+        app["db_executor_heavy"],
+        database.blocking_get_aggregated_performance,
+        nodes_to_query,
+        time_window_hours,
+    )
+
+    payload = {
+        "type": "aggregated_performance_data",
+        "view": view,
+        "performance_data": aggregated_data,
+    }
+    await safe_send_json(ws, payload)
+
+
+async def _handle_get_hashstore_stats(app, ws, data: Dict):
+    """Send filtered hashstore compaction statistics."""
+    filters = data.get("filters", {})
+    loop = asyncio.get_running_loop()
+    hashstore_data = await loop.run_in_executor(
+        app["db_executor_fast"], database.blocking_get_hashstore_stats, filters
+    )
+    payload = {"type": "hashstore_stats_data", "data": hashstore_data}
+    await safe_send_json(ws, payload)
+
+
+async def _handle_get_reputation_data(app, ws, data: Dict):
+    """Phase 1.3: Get current reputation data."""
+    view = data.get("view", ["Aggregate"])
+    nodes_to_query = (
+        view if view != ["Aggregate"] else app["node_names_tuple"]
+    )
+
+    loop = asyncio.get_running_loop()
+
+    reputation_data = await loop.run_in_executor(
+        app["db_executor_fast"],
+        database.blocking_get_latest_reputation,
+        DATABASE_FILE,
+        nodes_to_query,
+    )
+    payload = {"type": "reputation_data", "data": reputation_data}
+    await safe_send_json(ws, payload)
+
+
+async def _handle_get_latency_stats(app, ws, data: Dict):
+    """Phase 2.1: Get latency statistics."""
+    view = data.get("view", ["Aggregate"])
+    hours = data.get("hours", 1)
+    nodes_to_query = (
+        view if view != ["Aggregate"] else app["node_names_tuple"]
+    )
+
+    loop = asyncio.get_running_loop()
+
+    latency_data = await loop.run_in_executor(
+        app["db_executor"],
+        blocking_get_latency_stats,
+        DATABASE_FILE,
+        nodes_to_query,
+        hours,
+    )
+    payload = {"type": "latency_stats", "data": latency_data}
+    await safe_send_json(ws, payload)
+
+
+async def _handle_get_latency_histogram(app, ws, data: Dict):
+    """Phase 2.1: Get latency histogram."""
+    view = data.get("view", ["Aggregate"])
+    hours = data.get("hours", 1)
+    bucket_size = data.get("bucket_size_ms", 100)
+    nodes_to_query = (
+        view if view != ["Aggregate"] else app["node_names_tuple"]
+    )
+
+    loop = asyncio.get_running_loop()
+
+    histogram_data = await loop.run_in_executor(
+        app["db_executor"],
+        blocking_get_latency_histogram,
+        DATABASE_FILE,
+        nodes_to_query,
+        hours,
+        bucket_size,
+    )
+    payload = {"type": "latency_histogram", "data": histogram_data}
+    await safe_send_json(ws, payload)
+
+
+async def _handle_get_storage_data(app, ws, data: Dict):
+    """Phase 2.2: Get current storage data with configurable growth rate window."""
+    view = data.get("view", ["Aggregate"])
+    days = data.get("days", 7)  # Default to 7 days if not specified
+    nodes_to_query = (
+        view if view != ["Aggregate"] else app["node_names_tuple"]
+    )
+
+    log.debug(
+        "Storage data request received for view: %s, nodes: %s, days window: %s",
+        view,
+        nodes_to_query,
+        days,
+    )
+
+    loop = asyncio.get_running_loop()
+
+    storage_data = await loop.run_in_executor(
+        app["db_executor"],
+        database.blocking_get_latest_storage_with_forecast,
+        DATABASE_FILE,
+        nodes_to_query,
+        days,
+    )
+
+    if storage_data and log.isEnabledFor(logging.DEBUG):
+        log.debug("Storage data query returned %d result(s)", len(storage_data))
+        for item in storage_data:
+            log.debug(
+                "  Sending to client: Node=%s, Available=%.2f TB",
+                item.get("node_name"),
+                (item.get("available_bytes") or 0) / BYTES_PER_TB,
+            )
+
+    payload = {"type": "storage_data", "data": storage_data}
+    await safe_send_json(ws, payload)
+
+
+async def _handle_get_storage_history(app, ws, data: Dict):
+    """Phase 2.2: Get storage history."""
+    node_name = data.get("node_name")
+    days = data.get("days", 7)
+
+    if not node_name:
+        await safe_send_json(
+            ws, {"type": "error", "message": "node_name required"}
+        )
+        return
+
+    loop = asyncio.get_running_loop()
+
+    history_data = await loop.run_in_executor(
+        app["db_executor_fast"],
+        database.blocking_get_storage_history,
+        DATABASE_FILE,
+        node_name,
+        days,
+    )
+    payload = {"type": "storage_history", "data": history_data}
+    await safe_send_json(ws, payload)
+
+
+async def _handle_get_active_alerts(app, ws, data: Dict):
+    """Phase 4: Get active alerts."""
+    view = data.get("view", ["Aggregate"])
+    nodes_to_query = (
+        view if view != ["Aggregate"] else app["node_names_tuple"]
+    )
+
+    if "alert_manager" in app:
+        alerts = await app["alert_manager"].get_active_alerts(nodes_to_query)
+        payload = {"type": "active_alerts", "data": alerts}
+        await safe_send_json(ws, payload)
+    else:
+        await safe_send_json(
+            ws, {"type": "error", "message": "Alert manager not initialized"}
+        )
+
+
+async def _handle_acknowledge_alert(app, ws, data: Dict):
+    """Phase 4: Acknowledge an alert."""
+    alert_id = data.get("alert_id")
+
+    if not alert_id:
+        await safe_send_json(
+            ws, {"type": "error", "message": "alert_id required"}
+        )
+        return
+
+    if "alert_manager" in app:
+        success = await app["alert_manager"].acknowledge_alert(alert_id)
+        payload = {
+            "type": "alert_acknowledge_result",
+            "success": success,
+            "alert_id": alert_id,
+        }
+        await safe_send_json(ws, payload)
+    else:
+        await safe_send_json(
+            ws, {"type": "error", "message": "Alert manager not initialized"}
+        )
+
+
+async def _handle_get_insights(app, ws, data: Dict):
+    """Phase 4: Get recent insights."""
+    view = data.get("view", ["Aggregate"])
+    hours = data.get("hours", 24)
+    nodes_to_query = (
+        view if view != ["Aggregate"] else app["node_names_tuple"]
+    )
+
+    loop = asyncio.get_running_loop()
+
+    insights = await loop.run_in_executor(
+        app["db_executor_fast"],
+        database.blocking_get_insights,
+        DATABASE_FILE,
+        nodes_to_query,
+        hours,
+    )
+    payload = {"type": "insights_data", "data": insights}
+    await safe_send_json(ws, payload)
+
+
+async def _handle_get_alert_summary(app, ws, data: Dict):
+    """Phase 4: Get alert summary."""
+    if "alert_manager" in app:
+        summary = app["alert_manager"].get_alert_summary()
+        payload = {"type": "alert_summary", "data": summary}
+        await safe_send_json(ws, payload)
+    else:
+        await safe_send_json(
+            ws,
+            {
+                "type": "alert_summary",
+                "data": {"critical": 0, "warning": 0, "info": 0, "total": 0},
+            },
+        )
+
+
+async def _handle_get_earnings_data(app, ws, data: Dict):
+    """Phase 5.3: Get earnings data for specified period."""
+    view = data.get("view", ["Aggregate"])
+    period_param = data.get("period", "current")
+    nodes_to_query = (
+        view if view != ["Aggregate"] else app["node_names_tuple"]
+    )
+    # DEBUG: trace inbound request
+    try:
+        log.info(f"[EARNINGS][REQ] period_param={period_param} view={view} nodes_to_query={nodes_to_query}")
+    except Exception:
+        pass
+
+    loop = asyncio.get_running_loop()
+
+    # Calculate period based on parameter
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    if period_param == "previous":
+        # Previous month
+        period = recent_month_periods(2, now)[1]
+    elif period_param == "12months":
+        # The totals only change when new estimates are published or the month rolls over
+        twelve_month_cache = app["earnings_12m_cache"]
+        twelve_month_key = tuple(view) + (
+            "12months",
+            month_period(now),
+            app_state.get("earnings_generation", 0),
+        )
+        if await send_cached_payload(ws, twelve_month_cache, twelve_month_key):
+            return
+
+        # Aggregate last 12 months of data, querying all months concurrently
+        monthly_results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    app["db_executor"],
+                    database.blocking_get_latest_earnings,
+                    DATABASE_FILE,
+                    nodes_to_query,
+                    month,
+                )
+                for month in recent_month_periods(12, now)
+            )
+        )
+        earnings_data = [
+            estimate for month_data in monthly_results for estimate in month_data
+        ]
+
+        # Format aggregated data
+        formatted_data = []
+        # Group by node and satellite for 12-month totals
+        totals = sum_earnings_by_satellite(earnings_data)
+
+        # Convert to response format
+        for (node_name, satellite), sums in totals.items():
+            total_net, total_gross, held, egress, storage, repair, audit = sums
+            sat_name = SATELLITE_NAMES.get(satellite, satellite[:8])
+            formatted_data.append(
+                {
+                    "node_name": node_name,
+                    "satellite": sat_name,
+                    "total_net": round(total_net, 2),
+                    "total_gross": round(total_gross, 2),
+                    "held_amount": round(held, 2),
+                    "breakdown": {
+                        "egress": round(egress, 2),
+                        "storage": round(storage, 2),
+                        "repair": round(repair, 2),
+                        "audit": round(audit, 2),
+                    },
+                    "forecast_month_end": None,  # No forecast for historical aggregate
+                    "confidence": None,
+                }
+            )
+
+        payload = {
+            "type": "earnings_data",
+            "period_name": "12months",
+            "data": formatted_data,
+            "view": view  # include view so clients can ignore mismatched payloads
+        }
+        twelve_month_cache[twelve_month_key] = payload
+        await safe_send_json(ws, payload)
+        return
+    else:
+        # 'current' or any other value defaults to current month
+        period = month_period(now)
+
+    # Create cache key including period
+    # Normalize cache key: use 'Aggregate' for aggregate views
+    if view == ["Aggregate"]:
+        cache_key = ("Aggregate", period)
+    else:
+        # CRITICAL: Sort node list to ensure consistent cache keys across requests
+        cache_key = tuple(sorted(nodes_to_query)) + (period,)
+
+    payload = await get_earnings_payload(
+        app, view, nodes_to_query, period, period_param, cache_key
+    )
+    if payload is app_state["earnings_cache"].get(cache_key):
+        await send_cached_payload(ws, app_state["earnings_cache"], cache_key)
+    else:
+        await safe_send_json(ws, payload)
+
+
+async def _handle_get_earnings_history(app, ws, data: Dict):
+    """Phase 5.3: Get earnings history with LAZY IMPORT."""
+    node_name = data.get("node_name")
+    satellite = data.get("satellite")
+    days = data.get("days", 30)
+
+    log.info(
+        f"Earnings history requested: node={node_name}, satellite={satellite}, days={days}"
+    )
+
+    if not node_name:
+        await safe_send_json(
+            ws, {"type": "error", "message": "node_name required"}
+        )
+        return
+
+    loop = asyncio.get_running_loop()
+
+    # OPTIMIZATION: Trigger on-demand historical import if not done yet
+    tracker = app.get("financial_trackers", {}).get(node_name)
+    if tracker and not tracker._historical_imported:
+        # Check again under the lock: concurrent requests must not import twice
+        async with tracker._import_lock:
+            if not tracker._historical_imported:
+                log.info(f"[{node_name}] Lazy-loading historical earnings on first request...")
+                try:
+                    # The import is a long write job; keep it off the pool serving dashboard reads
+                    await tracker.import_historical_payouts(
+                        DATABASE_FILE, loop, app.get("db_executor_heavy")
+                    )
+                    log.info(f"[{node_name}] Historical import complete")
+                except Exception as e:
+                    log.warning(f"[{node_name}] Historical import failed: {e}")
+                finally:
+                    tracker._historical_imported = True  # Mark as attempted
+
+    history_data = await loop.run_in_executor(
+        app["db_executor"],
+        database.blocking_get_earnings_estimates,
+        DATABASE_FILE,
+        [node_name],
+        satellite,
+        None,  # period
+        days,
+    )
+
+    log.info(
+        f"Earnings history query returned {len(history_data) if history_data else 0} records"
+    )
+    if history_data and len(history_data) > 0:
+        log.info(
+            f"Sample record: period={history_data[0].get('period')}, total_net={history_data[0].get('total_earnings_net')}"
+        )
+
+    if history_data and len(history_data) > EARNINGS_HISTORY_CHUNK_SIZE:
+        await send_earnings_history_chunks(ws, node_name, history_data)
+        return
+
+    payload = {"type": "earnings_history", "data": history_data}
+    await safe_send_json(ws, payload)
+
+
+async def send_earnings_history_chunks(ws, node_name: str, history_data: List[Dict]):
+    """
+    Stream a long earnings history as earnings_history_chunk messages followed by
+    earnings_history_end, so the client can start drawing before the last record arrives.
+    """
+    starts = range(0, len(history_data), EARNINGS_HISTORY_CHUNK_SIZE)
+    for seq, start in enumerate(starts):
+        chunk = {
+            "type": "earnings_history_chunk",
+            "node_name": node_name,
+            "seq": seq,
+            "data": history_data[start : start + EARNINGS_HISTORY_CHUNK_SIZE],
+        }
+        if not await safe_send_json(ws, chunk):
+            return  # Client went away; don't encode the rest
+    await safe_send_json(
+        ws,
+        {
+            "type": "earnings_history_end",
+            "node_name": node_name,
+            "chunks": len(starts),
+            "count": len(history_data),
+        },
+    )
+
+
+async def _handle_get_comparison_data(app, ws, data: Dict):
+    """Phase 9: Multi-node comparison."""
+    response = await handle_comparison_request(app, data)
+    await safe_send_json(ws, response)
+
+
+# websocket message type -> handler(app, ws, data)
+WS_MESSAGE_HANDLERS = {
+    "set_view": _handle_set_view,
+    "get_historical_performance": _handle_get_historical_performance,
+    "get_aggregated_performance": _handle_get_aggregated_performance,
+    "get_hashstore_stats": _handle_get_hashstore_stats,
+    "get_reputation_data": _handle_get_reputation_data,
+    "get_latency_stats": _handle_get_latency_stats,
+    "get_latency_histogram": _handle_get_latency_histogram,
+    "get_storage_data": _handle_get_storage_data,
+    "get_storage_history": _handle_get_storage_history,
+    "get_active_alerts": _handle_get_active_alerts,
+    "acknowledge_alert": _handle_acknowledge_alert,
+    "get_insights": _handle_get_insights,
+    "get_alert_summary": _handle_get_alert_summary,
+    "get_earnings_data": _handle_get_earnings_data,
+    "get_earnings_history": _handle_get_earnings_history,
+    "get_comparison_data": _handle_get_comparison_data,
+}
+
+
 async def websocket_handler(request):
-    ws = web.WebSocketResponse(heartbeat=10)
+    # permessage-deflate is negotiated whenever the client offers it (browsers do)
+    ws = web.WebSocketResponse(heartbeat=10, compress=True)
     await ws.prepare(request)
     app = request.app
-    app_state["websockets"][ws] = {"view": ["Aggregate"]}
+    client = app_state["websockets"][ws] = {"view": ["Aggregate"]}
+    refresh_ws_snapshot()
+    # Everything for this client, starting with init, goes through its writer in order;
+    # replies to a burst of requests are coalesced into batch frames
+    open_send_queue(ws, client)
 
     log.info(f"WebSocket client connected. Total clients: {len(app_state['websockets'])}")
 
     try:
-        node_names = list(app["nodes"].keys())
-        await safe_send_json(ws, {"type": "init", "nodes": node_names})
+        await send_encoded(ws, app["init_message"])
         await send_initial_stats(app, ws, ["Aggregate"])
         await safe_send_json(ws, get_active_compactions_payload())
 
         # Send initial earnings data from cache if available
-        import datetime
-
-        now = datetime.datetime.now(datetime.timezone.utc)
-        period = now.strftime("%Y-%m")
-        cache_key = ("Aggregate", period)
+        cache_key = ("Aggregate", month_period())
 
         if cache_key in app_state.get("earnings_cache", {}):
             log.info(f"Sending cached earnings data for Aggregate view on connect")
-            await safe_send_json(ws, app_state["earnings_cache"][cache_key])
+            await send_cached_payload(ws, app_state["earnings_cache"], cache_key)
         else:
             log.info(
                 f"No cached earnings data available on connect, client will receive broadcast when ready"
@@ -865,646 +1892,40 @@ async def websocket_handler(request):
     except (ConnectionResetError, aiohttp.client_exceptions.ClientConnectionResetError):
         # Client disconnected during initial setup
         log.debug("Client disconnected during initial setup")
+        close_send_queue(client)
         if ws in app_state["websockets"]:
             del app_state["websockets"][ws]
+            refresh_ws_snapshot()
         return ws
 
     try:
         async for msg in ws:
             if msg.type == aiohttp.WSMsgType.TEXT:
                 try:
-                    data = json.loads(msg.data)
-                    msg_type = data.get("type")
-
-                    if msg_type == "set_view":
-                        new_view = data.get("view")
-                        if isinstance(new_view, list) and new_view:
-                            valid_nodes = set(app["nodes"].keys())
-                            is_aggregate = new_view == ["Aggregate"]
-                            are_nodes_valid = all(node in valid_nodes for node in new_view)
-
-                            if is_aggregate or are_nodes_valid:
-                                app_state["websockets"][ws]["view"] = new_view
-                                log.info(f"Client switched view to: {new_view}")
-                                await send_initial_stats(app, ws, new_view)
-
-                                # Send cached earnings data for the new view if available
-                                import datetime
-
-                                now = datetime.datetime.now(datetime.timezone.utc)
-                                period = now.strftime("%Y-%m")
-
-                                # Determine cache key based on view
-                                if is_aggregate:
-                                    cache_key = ("Aggregate", period)
-                                else:
-                                    # For single or multiple specific nodes
-                                    if len(new_view) == 1:
-                                        cache_key = (new_view[0], period)
-                                    else:
-                                        cache_key = tuple(sorted(new_view)) + (period,)
-
-                                if cache_key in app_state.get("earnings_cache", {}):
-                                    log.info(
-                                        f"Sending cached earnings data for view {new_view} on view switch"
-                                    )
-                                    await safe_send_json(ws, app_state["earnings_cache"][cache_key])
-
-                    elif msg_type == "get_historical_performance":
-                        view = data.get("view")  # This is now a list
-                        points = data.get("points", 150)
-                        interval = data.get("interval_sec", PERFORMANCE_INTERVAL_SECONDS)
-                        loop = asyncio.get_running_loop()
-
-                        events_to_process = []
-                        nodes_to_query = (
-                            view if view != ["Aggregate"] else list(app_state["nodes"].keys())
-                        )
-                        for node_name in nodes_to_query:
-                            if node_name in app_state["nodes"]:
-                                events_to_process.extend(
-                                    list(app_state["nodes"][node_name]["live_events"])
-                                )
-
-                        historical_data = await loop.run_in_executor(
-                            app["db_executor"],
-                            database.blocking_get_historical_performance,
-                            events_to_process,
-                            points,
-                            interval,
-                        )
-                        payload = {
-                            "type": "historical_performance_data",
-                            "view": view,
-                            "performance_data": historical_data,
-                        }
-                        await safe_send_json(ws, payload)
-
-                    elif msg_type == "get_aggregated_performance":
-                        view = data.get("view")  # This is a list
-                        time_window_hours = data.get("hours", 1)
-                        loop = asyncio.get_running_loop()
-
-                        nodes_to_query = (
-                            view if view != ["Aggregate"] else list(app["nodes"].keys())
-                        )
-
-                        aggregated_data = await loop.run_in_executor(
-                            app["db_executor"],
-                            database.blocking_get_aggregated_performance,
-                            nodes_to_query,
-                            time_window_hours,
-                        )
-
-                        payload = {
-                            "type": "aggregated_performance_data",
-                            "view": view,
-                            "performance_data": aggregated_data,
-                        }
-                        await safe_send_json(ws, payload)
-
-                    elif msg_type == "get_hashstore_stats":
-                        filters = data.get("filters", {})
-                        loop = asyncio.get_running_loop()
-                        hashstore_data = await loop.run_in_executor(
-                            app["db_executor"], database.blocking_get_hashstore_stats, filters
-                        )
-                        payload = {"type": "hashstore_stats_data", "data": hashstore_data}
-                        await safe_send_json(ws, payload)
-
-                    elif msg_type == "get_reputation_data":
-                        # Phase 1.3: Get current reputation data
-                        view = data.get("view", ["Aggregate"])
-                        nodes_to_query = (
-                            view if view != ["Aggregate"] else list(app["nodes"].keys())
-                        )
-
-                        loop = asyncio.get_running_loop()
-                        from .config import DATABASE_FILE
-
-                        reputation_data = await loop.run_in_executor(
-                            app["db_executor"],
-                            database.blocking_get_latest_reputation,
-                            DATABASE_FILE,
-                            nodes_to_query,
-                        )
-                        payload = {"type": "reputation_data", "data": reputation_data}
-                        await safe_send_json(ws, payload)
-
-                    elif msg_type == "get_latency_stats":
-                        # Phase 2.1: Get latency statistics
-                        view = data.get("view", ["Aggregate"])
-                        hours = data.get("hours", 1)
-                        nodes_to_query = (
-                            view if view != ["Aggregate"] else list(app["nodes"].keys())
-                        )
-
-                        loop = asyncio.get_running_loop()
-                        from .config import DATABASE_FILE
-                        from .performance_analyzer import blocking_get_latency_stats
-
-                        latency_data = await loop.run_in_executor(
-                            app["db_executor"],
-                            blocking_get_latency_stats,
-                            DATABASE_FILE,
-                            nodes_to_query,
-                            hours,
-                        )
-                        payload = {"type": "latency_stats", "data": latency_data}
-                        await safe_send_json(ws, payload)
-
-                    elif msg_type == "get_latency_histogram":
-                        # Phase 2.1: Get latency histogram
-                        view = data.get("view", ["Aggregate"])
-                        hours = data.get("hours", 1)
-                        bucket_size = data.get("bucket_size_ms", 100)
-                        nodes_to_query = (
-                            view if view != ["Aggregate"] else list(app["nodes"].keys())
-                        )
-
-                        loop = asyncio.get_running_loop()
-                        from .config import DATABASE_FILE
-                        from .performance_analyzer import blocking_get_latency_histogram
-
-                        histogram_data = await loop.run_in_executor(
-                            app["db_executor"],
-                            blocking_get_latency_histogram,
-                            DATABASE_FILE,
-                            nodes_to_query,
-                            hours,
-                            bucket_size,
-                        )
-                        payload = {"type": "latency_histogram", "data": histogram_data}
-                        await safe_send_json(ws, payload)
-
-                    elif msg_type == "get_storage_data":
-                        # Phase 2.2: Get current storage data with configurable growth rate window
-                        view = data.get("view", ["Aggregate"])
-                        days = data.get("days", 7)  # Default to 7 days if not specified
-                        nodes_to_query = (
-                            view if view != ["Aggregate"] else list(app["nodes"].keys())
-                        )
-
-                        log.info(
-                            f"Storage data request received for view: {view}, nodes: {nodes_to_query}, days window: {days}"
-                        )
-
-                        loop = asyncio.get_running_loop()
-                        from .config import DATABASE_FILE
-                        from .database import blocking_get_latest_storage_with_forecast
-
-                        storage_data = await loop.run_in_executor(
-                            app["db_executor"],
-                            blocking_get_latest_storage_with_forecast,
-                            DATABASE_FILE,
-                            nodes_to_query,
-                            days,
-                        )
-
-                        log.info(
-                            f"Storage data query returned {len(storage_data) if storage_data else 0} result(s)"
-                        )
-                        if storage_data:
-                            for item in storage_data:
-                                log.info(
-                                    f"  Sending to client: Node={item.get('node_name')}, Available={item.get('available_bytes', 0) / (1024**4):.2f} TB"
-                                )
-
-                        payload = {"type": "storage_data", "data": storage_data}
-                        await safe_send_json(ws, payload)
-                        log.info("Storage data payload sent to client")
-
-                    elif msg_type == "get_storage_history":
-                        # Phase 2.2: Get storage history
-                        node_name = data.get("node_name")
-                        days = data.get("days", 7)
-
-                        if not node_name:
-                            await safe_send_json(
-                                ws, {"type": "error", "message": "node_name required"}
-                            )
-                            continue
-
-                        loop = asyncio.get_running_loop()
-                        from .config import DATABASE_FILE
-                        from .database import blocking_get_storage_history
-
-                        history_data = await loop.run_in_executor(
-                            app["db_executor"],
-                            blocking_get_storage_history,
-                            DATABASE_FILE,
-                            node_name,
-                            days,
-                        )
-                        payload = {"type": "storage_history", "data": history_data}
-                        await safe_send_json(ws, payload)
-
-                    elif msg_type == "get_active_alerts":
-                        # Phase 4: Get active alerts
-                        view = data.get("view", ["Aggregate"])
-                        nodes_to_query = (
-                            view if view != ["Aggregate"] else list(app["nodes"].keys())
-                        )
-
-                        if "alert_manager" in app:
-                            alerts = await app["alert_manager"].get_active_alerts(nodes_to_query)
-                            payload = {"type": "active_alerts", "data": alerts}
-                            await safe_send_json(ws, payload)
-                        else:
-                            await safe_send_json(
-                                ws, {"type": "error", "message": "Alert manager not initialized"}
-                            )
-
-                    elif msg_type == "acknowledge_alert":
-                        # Phase 4: Acknowledge an alert
-                        alert_id = data.get("alert_id")
-
-                        if not alert_id:
-                            await safe_send_json(
-                                ws, {"type": "error", "message": "alert_id required"}
-                            )
-                            continue
-
-                        if "alert_manager" in app:
-                            success = await app["alert_manager"].acknowledge_alert(alert_id)
-                            payload = {
-                                "type": "alert_acknowledge_result",
-                                "success": success,
-                                "alert_id": alert_id,
-                            }
-                            await safe_send_json(ws, payload)
-                        else:
-                            await safe_send_json(
-                                ws, {"type": "error", "message": "Alert manager not initialized"}
-                            )
-
-                    elif msg_type == "get_insights":
-                        # Phase 4: Get recent insights
-                        view = data.get("view", ["Aggregate"])
-                        hours = data.get("hours", 24)
-                        nodes_to_query = (
-                            view if view != ["Aggregate"] else list(app["nodes"].keys())
-                        )
-
-                        loop = asyncio.get_running_loop()
-                        from .config import DATABASE_FILE
-                        from .database import blocking_get_insights
-
-                        insights = await loop.run_in_executor(
-                            app["db_executor"],
-                            blocking_get_insights,
-                            DATABASE_FILE,
-                            nodes_to_query,
-                            hours,
-                        )
-                        payload = {"type": "insights_data", "data": insights}
-                        await safe_send_json(ws, payload)
-
-                    elif msg_type == "get_alert_summary":
-                        # Phase 4: Get alert summary
-                        if "alert_manager" in app:
-                            summary = app["alert_manager"].get_alert_summary()
-                            payload = {"type": "alert_summary", "data": summary}
-                            await safe_send_json(ws, payload)
-                        else:
-                            await safe_send_json(
-                                ws,
-                                {
-                                    "type": "alert_summary",
-                                    "data": {"critical": 0, "warning": 0, "info": 0, "total": 0},
-                                },
-                            )
-
-                    elif msg_type == "get_earnings_data":
-                        # Phase 5.3: Get earnings data for specified period
-                        view = data.get("view", ["Aggregate"])
-                        period_param = data.get("period", "current")
-                        nodes_to_query = (
-                            view if view != ["Aggregate"] else list(app["nodes"].keys())
-                        )
-                        # DEBUG: trace inbound request
-                        try:
-                            log.info(f"[EARNINGS][REQ] period_param={period_param} view={view} nodes_to_query={nodes_to_query}")
-                        except Exception:
-                            pass
-
-                        loop = asyncio.get_running_loop()
-                        from .config import DATABASE_FILE
-                        from .financial_tracker import SATELLITE_NAMES
-                        from .database import blocking_get_latest_earnings
-
-                        # Calculate period based on parameter
-                        import datetime
-
-                        now = datetime.datetime.now(datetime.timezone.utc)
-
-                        if period_param == "previous":
-                            # Previous month
-                            if now.month == 1:
-                                period = f"{now.year - 1}-12"
-                            else:
-                                period = f"{now.year}-{str(now.month - 1).zfill(2)}"
-                        elif period_param == "12months":
-                            # Aggregate last 12 months of data
-                            import datetime
-
-                            now = datetime.datetime.now(datetime.timezone.utc)
-
-                            # Get data for last 12 complete months
-                            earnings_data = []
-                            for months_ago in range(12):
-                                month_date = now - datetime.timedelta(days=30 * months_ago)
-                                month_period = month_date.strftime("%Y-%m")
-
-                                month_data = await loop.run_in_executor(
-                                    app["db_executor"],
-                                    blocking_get_latest_earnings,
-                                    DATABASE_FILE,
-                                    nodes_to_query,
-                                    month_period,
-                                )
-                                earnings_data.extend(month_data)
-
-                            # Format aggregated data
-                            formatted_data = []
-                            # Group by node and satellite for 12-month totals
-                            from collections import defaultdict
-
-                            aggregated = defaultdict(
-                                lambda: {
-                                    "total_net": 0,
-                                    "total_gross": 0,
-                                    "held_amount": 0,
-                                    "egress": 0,
-                                    "storage": 0,
-                                    "repair": 0,
-                                    "audit": 0,
-                                }
-                            )
-
-                            for estimate in earnings_data:
-                                key = (estimate["node_name"], estimate["satellite"])
-                                agg = aggregated[key]
-                                agg["total_net"] += estimate.get("total_earnings_net", 0)
-                                agg["total_gross"] += estimate.get("total_earnings_gross", 0)
-                                agg["held_amount"] += estimate.get("held_amount", 0)
-                                agg["egress"] += estimate.get("egress_earnings_net", 0)
-                                agg["storage"] += estimate.get("storage_earnings_net", 0)
-                                agg["repair"] += estimate.get("repair_earnings_net", 0)
-                                agg["audit"] += estimate.get("audit_earnings_net", 0)
-
-                            # Convert to response format
-                            for (node_name, satellite), data in aggregated.items():
-                                sat_name = SATELLITE_NAMES.get(satellite, satellite[:8])
-                                formatted_data.append(
-                                    {
-                                        "node_name": node_name,
-                                        "satellite": sat_name,
-                                        "total_net": round(data["total_net"], 2),
-                                        "total_gross": round(data["total_gross"], 2),
-                                        "held_amount": round(data["held_amount"], 2),
-                                        "breakdown": {
-                                            "egress": round(data["egress"], 2),
-                                            "storage": round(data["storage"], 2),
-                                            "repair": round(data["repair"], 2),
-                                            "audit": round(data["audit"], 2),
-                                        },
-                                        "forecast_month_end": None,  # No forecast for historical aggregate
-                                        "confidence": None,
-                                    }
-                                )
-
-                            payload = {
-                                "type": "earnings_data",
-                                "period_name": "12months",
-                                "data": formatted_data,
-                                "view": view  # include view so clients can ignore mismatched payloads
-                            }
-                            await safe_send_json(ws, payload)
-                            continue
-                        else:
-                            # 'current' or any other value defaults to current month
-                            period = now.strftime("%Y-%m")
-
-                        # Create cache key including period
-                        # Normalize cache key: use 'Aggregate' for aggregate views
-                        if view == ["Aggregate"]:
-                            cache_key = ("Aggregate", period)
-                        else:
-                            # CRITICAL: Sort node list to ensure consistent cache keys across requests
-                            cache_key = tuple(sorted(nodes_to_query)) + (period,)
-
-                        # Try to serve from cache first
-                        if cache_key in app_state.get("earnings_cache", {}):
-                            await safe_send_json(ws, app_state["earnings_cache"][cache_key])
-                            continue
-
-                        earnings_data = await loop.run_in_executor(
-                            app["db_executor"],
-                            blocking_get_latest_earnings,
-                            DATABASE_FILE,
-                            nodes_to_query,
-                            period,
-                        )
-
-                        # SAFETY FALLBACK:
-                        # In rare cases an IN (...) query can yield no rows due to planner quirks or parameterization,
-                        # while per-node queries do return results. If we see zero rows for a multi-node selection,
-                        # query each node individually and merge the results.
-                        if (not earnings_data) and len(nodes_to_query) > 1:
-                            merged = []
-                            for node in nodes_to_query:
-                                try:
-                                    part = await loop.run_in_executor(
-                                        app["db_executor"],
-                                        blocking_get_latest_earnings,
-                                        DATABASE_FILE,
-                                        [node],
-                                        period,
-                                    )
-                                    if part:
-                                        merged.extend(part)
-                                except Exception as e:
-                                    log.debug(f"[EARNINGS][FALLBACK] per-node query failed for {node}: {e}")
-                            if merged:
-                                earnings_data = merged
-                                log.info(f"[EARNINGS][FALLBACK] Combined per-node queries returned {len(merged)} records")
-
-                        # DEBUG: trace DB result set
-                        try:
-                            total_records = len(earnings_data) if earnings_data else 0
-                            per_node_counts = {}
-                            for n in nodes_to_query:
-                                per_node_counts[n] = sum(1 for r in (earnings_data or []) if r.get("node_name") == n)
-                            log.info(f"[EARNINGS][DB] period={period} records={total_records} per_node={per_node_counts}")
-                            if total_records == 0:
-                                log.warning(f"[EARNINGS][DB] No earnings returned for nodes={nodes_to_query} period={period}")
-                        except Exception:
-                            pass
-
-                        # Format data with forecasts
-                        # If DB returned nothing for a multi-node request, synthesize from cached per-node payloads
-                        use_cached_merge = False
-                        formatted_data = []
-
-                        if (not earnings_data) and len(nodes_to_query) > 1:
-                            cache = app_state.get("earnings_cache", {})
-                            cached_merge = []
-                            for n in nodes_to_query:
-                                ck = (n, period)
-                                cp = cache.get(ck)
-                                if cp and isinstance(cp.get("data"), list) and cp["data"]:
-                                    cached_merge.extend(cp["data"])
-                            if cached_merge:
-                                formatted_data = cached_merge
-                                use_cached_merge = True
-                                log.info(f"[EARNINGS][CACHE] Merged cached per-node data for view {view}: {len(formatted_data)} items")
-
-                        if not use_cached_merge:
-                            for estimate in earnings_data:
-                                # Calculate forecast if tracker available
-                                tracker = app.get("financial_trackers", {}).get(estimate["node_name"])
-                                forecast_info = None
-                                if tracker:
-                                    try:
-                                        forecast_info = await tracker.forecast_payout(
-                                            DATABASE_FILE, period, loop, app.get("db_executor")
-                                        )
-                                    except Exception as e:
-                                        log.error(
-                                            f"Failed to get forecast for {estimate['node_name']}: {e}"
-                                        )
-
-                                sat_name = SATELLITE_NAMES.get(
-                                    estimate["satellite"], estimate["satellite"][:8]
-                                )
-
-                                formatted_data.append(
-                                    {
-                                        "node_name": estimate["node_name"],
-                                        "satellite": sat_name,
-                                        "total_net": round(estimate["total_earnings_net"], 2),
-                                        "total_gross": round(estimate["total_earnings_gross"], 2),
-                                        "held_amount": round(estimate["held_amount"], 2),
-                                        "breakdown": {
-                                            "egress": round(estimate["egress_earnings_net"], 2),
-                                            "storage": round(estimate["storage_earnings_net"], 2),
-                                            "repair": round(estimate["repair_earnings_net"], 2),
-                                            "audit": round(estimate["audit_earnings_net"], 2),
-                                        },
-                                        "forecast_month_end": round(
-                                            forecast_info["forecasted_payout"], 2
-                                        )
-                                        if forecast_info
-                                        else None,
-                                        "confidence": round(forecast_info["confidence"], 2)
-                                        if forecast_info
-                                        else None,
-                                    }
-                                )
-
-                        # Include pending flag so frontend can show a loading state during startup/warm-up
-                        payload = {
-                            "type": "earnings_data",
-                            "period": period,
-                            "period_name": period_param,
-                            "data": formatted_data,
-                            "view": view,  # include view so frontend can filter out stale updates
-                            "pending": True if (not formatted_data and period_param == "current") else False
-                        }
-
-                        # Debug log to show what breakdown values are being sent
-                        log.info(
-                            f"Sending earnings for period {period} with {len(formatted_data)} satellites"
-                        )
-                        for item in formatted_data:
-                            breakdown = item.get("breakdown", {})
-                            total_breakdown = sum(breakdown.values())
-                            log.debug(
-                                f"[{item['node_name']}] {item['satellite']}: "
-                                f"total_net=${item['total_net']:.2f}, "
-                                f"breakdown sum=${total_breakdown:.2f}"
-                            )
-
-                        # Store in cache with period included in key
-                        if "earnings_cache" not in app_state:
-                            app_state["earnings_cache"] = {}
-                        app_state["earnings_cache"][cache_key] = payload
-
-                        # DEBUG: trace payload summary
-                        try:
-                            log.info(f"[EARNINGS][SEND] view={view} period_name={period_param} items={len(formatted_data)} cache_key={cache_key}")
-                        except Exception:
-                            pass
-
-                        await safe_send_json(ws, payload)
-
-                    elif msg_type == "get_earnings_history":
-                        # Phase 5.3: Get earnings history with LAZY IMPORT
-                        node_name = data.get("node_name")
-                        satellite = data.get("satellite")
-                        days = data.get("days", 30)
-
-                        log.info(
-                            f"Earnings history requested: node={node_name}, satellite={satellite}, days={days}"
-                        )
-
-                        if not node_name:
-                            await safe_send_json(
-                                ws, {"type": "error", "message": "node_name required"}
-                            )
-                            continue
-
-                        loop = asyncio.get_running_loop()
-                        from .config import DATABASE_FILE
-                        from .database import blocking_get_earnings_estimates
-
-                        # OPTIMIZATION: Trigger on-demand historical import if not done yet
-                        tracker = app.get("financial_trackers", {}).get(node_name)
-                        if tracker and not hasattr(tracker, '_historical_imported'):
-                            log.info(f"[{node_name}] Lazy-loading historical earnings on first request...")
-                            try:
-                                await tracker.import_historical_payouts(
-                                    DATABASE_FILE, loop, app.get("db_executor")
-                                )
-                                tracker._historical_imported = True
-                                log.info(f"[{node_name}] Historical import complete")
-                            except Exception as e:
-                                log.warning(f"[{node_name}] Historical import failed: {e}")
-                                tracker._historical_imported = True  # Mark as attempted
-
-                        history_data = await loop.run_in_executor(
-                            app["db_executor"],
-                            blocking_get_earnings_estimates,
-                            DATABASE_FILE,
-                            [node_name],
-                            satellite,
-                            None,  # period
-                            days,
-                        )
-
-                        log.info(
-                            f"Earnings history query returned {len(history_data) if history_data else 0} records"
-                        )
-                        if history_data and len(history_data) > 0:
-                            log.info(
-                                f"Sample record: period={history_data[0].get('period')}, total_net={history_data[0].get('total_earnings_net')}"
-                            )
-
-                        payload = {"type": "earnings_history", "data": history_data}
-                        await safe_send_json(ws, payload)
-
-                    elif msg_type == "get_comparison_data":
-                        # Phase 9: Multi-node comparison
-                        response = await handle_comparison_request(app, data)
-                        await safe_send_json(ws, response)
-
+                    data = msg.json(loads=json_loads)
+                except ValueError:
+                    log.warning("Could not parse websocket message:", exc_info=True)
+                    continue
+                if not isinstance(data, dict):
+                    log.warning(f"Ignoring websocket message that is not a JSON object: {type(data).__name__}")
+                    continue
+                msg_type = data.get("type")
+
+                handler = WS_MESSAGE_HANDLERS.get(msg_type) if isinstance(msg_type, str) else None
+                if handler is None:
+                    continue
+                try:
+                    await handler(app, ws, data)
                 except Exception:
-                    log.error("Could not parse websocket message:", exc_info=True)
+                    log.error(f"Error handling websocket message '{msg_type}':", exc_info=True)
 
     finally:
-        if ws in app_state["websockets"]:
-            del app_state["websockets"][ws]
+        client = app_state["websockets"].pop(ws, None)
+        refresh_ws_snapshot()
+        close_send_queue(client)
+        pending = client.get("pending_view_task") if client else None
+        if pending and not pending.done():
+            pending.cancel()
         log.info(f"WebSocket client disconnected. Total clients: {len(app_state['websockets'])}")
     return ws
 
@@ -1512,6 +1933,21 @@ async def websocket_handler(request):
 def run_server(nodes_config: Dict[str, Any]):
     app = web.Application(middlewares=[cache_control_middleware])
     app["nodes"] = nodes_config
+    # Node names are fixed at startup; reuse them instead of rebuilding per message
+    app["node_names_tuple"] = tuple(nodes_config.keys())
+    app["node_names_frozen"] = frozenset(nodes_config.keys())
+    # The node list is static after startup, so the init message is encoded once
+    app["init_message"] = encode_json({"type": "init", "nodes": list(app["node_names_tuple"])})
+    app["index_body"] = render_index_html()
+    # Per-node comparison metrics: TTL cache plus the single-flight registry of running gathers
+    app["node_metrics_cache"] = BoundedTTLCache(NODE_METRICS_CACHE_SIZE, NODE_METRICS_CACHE_TTL_SECONDS)
+    app["metrics_inflight"] = {}
+    # {(node, period, earnings_generation): total net earnings}, shared by all time ranges
+    app["earnings_totals_cache"] = BoundedTTLCache(NODE_METRICS_CACHE_SIZE, NODE_METRICS_CACHE_TTL_SECONDS)
+    # {(*view, "12months", month, earnings_generation): earnings_data payload}
+    app["earnings_12m_cache"] = PayloadCache(COMPARISON_CACHE_MAX_ENTRIES, EARNINGS_12M_CACHE_TTL_SECONDS)
+    # {earnings cache_key: task} for current/previous earnings queries already running
+    app["earnings_inflight"] = {}
     # Record server start time for cache warm-up logic
     app["start_time"] = time.time()
 
@@ -1526,4 +1962,8 @@ def run_server(nodes_config: Dict[str, Any]):
     log.info(f"Server starting on http://{SERVER_HOST}:{SERVER_PORT}")
     log.info(f"Static files version: {STATIC_VERSION}")
     log.info(f"Monitoring nodes: {list(app['nodes'].keys())}")
-    web.run_app(app, host=SERVER_HOST, port=SERVER_PORT)
+    # uvloop cuts the per-callback cost of the many tasks, gathers and executor hops
+    loop = uvloop.new_event_loop() if USE_UVLOOP else None
+    if loop is not None:
+        log.info("Using uvloop event loop")
+    web.run_app(app, host=SERVER_HOST, port=SERVER_PORT, loop=loop)
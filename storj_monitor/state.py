@@ -1,10 +1,107 @@
 import asyncio
 import re
+import time
 from dataclasses import dataclass, field
-from typing import Dict, Any
-from collections import Counter
+from typing import Dict, Any, Optional
+from collections import Counter, OrderedDict, deque
 import heapq
 
+from .config import (
+    EARNINGS_CACHE_MAX_ENTRIES,
+    EARNINGS_CACHE_TTL_SECONDS,
+    STATS_CACHE_MAX_VIEWS,
+    STATS_CACHE_TTL_SECONDS,
+)
+
+_MISSING = object()
+
+
+class BoundedTTLCache:
+    """
+    Small LRU cache with a maximum size and a per-entry time-to-live.
+    Used for per-view payloads so rarely used view combinations cannot accumulate.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Any, tuple] = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def pop(self, key, default: Optional[Any] = None):
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def keys(self) -> list:
+        """Return the keys of entries that have not expired, least recently used first."""
+        now = time.monotonic()
+        return [key for key, (expires_at, _value) in self._data.items() if expires_at > now]
+
+
+class PayloadCache(BoundedTTLCache):
+    """
+    BoundedTTLCache of JSON payload dicts that also keeps each payload's encoded
+    bytes, so repeated sends of an unchanged payload skip serialization.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize, ttl)
+        self._encoded: Dict[Any, tuple] = {}
+
+    def get_encoded(self, key, encode) -> Optional[bytes]:
+        """Return encode(payload) for key, reusing the bytes while the payload is unchanged."""
+        payload = self.get(key)
+        if payload is None:
+            return None
+        entry = self._encoded.get(key)
+        if entry is not None and entry[0] is payload:
+            return entry[1]
+        data = encode(payload)
+        self._encoded[key] = (payload, data)
+        if len(self._encoded) > self.maxsize:
+            # Forget encodings of evicted payloads
+            self._encoded = {k: v for k, v in self._encoded.items() if k in self._data}
+        return data
+
+    def pop(self, key, default: Optional[Any] = None):
+        self._encoded.pop(key, None)
+        return super().pop(key, default)
+
+    def clear(self):
+        self._encoded.clear()
+        super().clear()
+
 
 # Incremental Stats Accumulator
 @dataclass
@@ -51,11 +148,11 @@ class IncrementalStats:
     # Hot pieces tracking
     hot_pieces: Dict[str, Dict[str, int]] = field(default_factory=dict)
 
-    # Last processed event index per node for incremental updates
-    last_processed_indices: Dict[str, int] = field(default_factory=dict)
+    # Last processed event sequence number per node (robust against prunes)
+    last_processed_seq: Dict[str, int] = field(default_factory=dict)
 
-    # Last processed timestamp per node (robust against prunes)
-    last_processed_ts: Dict[str, float] = field(default_factory=dict)
+    # Min-heap of (ts_unix, dl_bytes, ul_bytes) behind the live counters
+    live_window: list = field(default_factory=list)
 
     def get_or_create_satellite(self, sat_id: str) -> Dict[str, int]:
         """Get or create satellite stats."""
@@ -82,6 +179,17 @@ class IncrementalStats:
         """Add a single event to the running statistics."""
         from .log_processor import get_size_bucket
 
+        self._add_event(event, TOKEN_REGEX, get_size_bucket)
+
+    def add_events(self, events, TOKEN_REGEX: re.Pattern):
+        """Add a batch of events, resolving per-call lookups once for the whole batch."""
+        from .log_processor import get_size_bucket
+
+        add = self._add_event
+        for event in events:
+            add(event, TOKEN_REGEX, get_size_bucket)
+
+    def _add_event(self, event: Dict[str, Any], TOKEN_REGEX: re.Pattern, get_size_bucket):
         # Extract event data
         category = event["category"]
         status = event["status"]
@@ -259,18 +367,34 @@ class IncrementalStats:
                             pass
 
     def update_live_stats(self, events: list[dict[str, any]]):
-        """Update live stats for the last minute."""
-        import time
-
-        one_min_ago = time.time() - 60
+        """Rebuild live stats for the last minute from the given events."""
         self.live_dl_bytes, self.live_ul_bytes = 0, 0
+        self.live_window = []
+        self.add_live_events(events)
+
+    def add_live_events(self, events, now: Optional[float] = None):
+        """Add newly seen successful transfers to the last-minute window."""
+        one_min_ago = (time.time() if now is None else now) - 60
+        window = self.live_window
         for event in events:
             if event["ts_unix"] > one_min_ago and event["status"] == "success":
-                if event["category"] == "get":
+                category = event["category"]
+                if category == "get":
+                    heapq.heappush(window, (event["ts_unix"], event["size"], 0))
                     self.live_dl_bytes += event["size"]
-                elif event["category"] == "put":
+                elif category == "put":
+                    heapq.heappush(window, (event["ts_unix"], 0, event["size"]))
                     self.live_ul_bytes += event["size"]
 
+    def expire_live_stats(self, now: Optional[float] = None):
+        """Subtract transfers that have left the last-minute window."""
+        one_min_ago = (time.time() if now is None else now) - 60
+        window = self.live_window
+        while window and window[0][0] <= one_min_ago:
+            _ts, dl_bytes, ul_bytes = heapq.heappop(window)
+            self.live_dl_bytes -= dl_bytes
+            self.live_ul_bytes -= ul_bytes
+
     def to_payload(self, historical_stats: list[dict] = None) -> dict[str, any]:
         """Convert stats to a JSON payload with sliding time window."""
         import datetime
@@ -366,13 +490,21 @@ class IncrementalStats:
 # --- In-Memory State ---
 app_state: Dict[str, Any] = {
     "websockets": {},  # {ws: {"view": ["Aggregate"]}}
+    "ws_snapshot": (None, ()),  # (source dict, ((ws, view_tuple), ...)), swapped on client changes
     "nodes": {},  # { "node_name": NodeState }
+    "active_compactions_generation": 0,  # Bumped on every active_compactions change
+    "earnings_generation": 0,  # Bumped whenever new earnings estimates are published
     "geoip_cache": {},
     "db_write_lock": asyncio.Lock(),  # Lock to serialize DB write operations
     "db_write_queue": asyncio.Queue(),  # size is set in config
-    "stats_cache": {},  # Cache for pre-computed stats payloads
+    "stats_cache": BoundedTTLCache(
+        STATS_CACHE_MAX_VIEWS, STATS_CACHE_TTL_SECONDS
+    ),  # { view_tuple: JSON-encoded stats payload bytes }, bounded per view
+    "earnings_cache": PayloadCache(
+        EARNINGS_CACHE_MAX_ENTRIES, EARNINGS_CACHE_TTL_SECONDS
+    ),  # { (view..., period): earnings_data payload }, bounded, with memoized encoded bytes
     "incremental_stats": {},  # New: { view_tuple: IncrementalStats }
-    "websocket_event_queue": [],  # Queue for batching websocket events
+    "websocket_event_queue": deque(),  # Queue for batching websocket events
     "websocket_queue_lock": asyncio.Lock(),  # Lock for websocket queue operations
     "TOKEN_REGEX": re.compile(
         r"\b(?:\d{1,3}\.){3}\d{1,3}(?::\d+)?\b|\b\d+\b"
@@ -42,7 +42,8 @@ let storageState = {
 window.storageState = storageState; // Make globally accessible for charts
 let earningsState = {
     period: 'current', // current, previous, 12months
-    cachedData: null
+    cachedData: null,
+    historyChunks: {} // node_name -> records received so far from a streamed earnings history
 };
 let cardVisibilityState = {};
 let previousCardVisibilityState = {}; // Track previous state to detect transitions
@@ -997,7 +998,7 @@ function processLivePerformanceUpdate(data) { const { node_name, bins } = data;
 
 // --- WebSocket Connection & Data Handling ---
 const connectionManager = { overlay: document.getElementById('connection-overlay'), reconnectDelay: 1000, maxReconnectDelay: 30000, connect: function() { const wsProtocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:'; ws = new WebSocket(`${wsProtocol}//${window.location.host}/ws`); window.ws = ws;  // Update global reference for comparison.js and other components
- ws.onopen = () => { this.overlay.style.display = 'none'; this.reconnectDelay = 1000; console.log("[WebSocket] Connection opened."); requestHashstoreData(); setTimeout(() => { if (ws && ws.readyState === WebSocket.OPEN) { ws.send(JSON.stringify({ type: 'get_reputation_data', view: currentNodeView })); const latencyHours = { '30m': 0.5, '1h': 1, '6h': 6, '12h': 12, '24h': 24 }[latencyState.range]; ws.send(JSON.stringify({ type: 'get_latency_stats', view: currentNodeView, hours: latencyHours })); ws.send(JSON.stringify({ type: 'get_storage_data', view: currentNodeView })); requestEarningsData(); } }, 1000); }; ws.onmessage = (event) => { const data = JSON.parse(event.data); if (data.type !== 'log_entry' && data.type !== 'performance_batch_update' && data.type !== 'log_entry_batch') { console.log(`[WebSocket] Received message type: ${data.type}`); } handleWebSocketMessage(data); }; ws.onclose = () => { window.ws = null;  // Clear global reference on disconnect
+ ws.onopen = () => { this.overlay.style.display = 'none'; this.reconnectDelay = 1000; console.log("[WebSocket] Connection opened."); requestHashstoreData(); setTimeout(() => { if (ws && ws.readyState === WebSocket.OPEN) { ws.send(JSON.stringify({ type: 'get_reputation_data', view: currentNodeView })); const latencyHours = { '30m': 0.5, '1h': 1, '6h': 6, '12h': 12, '24h': 24 }[latencyState.range]; ws.send(JSON.stringify({ type: 'get_latency_stats', view: currentNodeView, hours: latencyHours })); ws.send(JSON.stringify({ type: 'get_storage_data', view: currentNodeView })); requestEarningsData(); } }, 1000); }; ws.onmessage = (event) => { const frame = JSON.parse(event.data); const messages = frame.type === 'batch' ? frame.messages : [frame]; for (const data of messages) { if (data.type !== 'log_entry' && data.type !== 'performance_batch_update' && data.type !== 'log_entry_batch') { console.log(`[WebSocket] Received message type: ${data.type}`); } handleWebSocketMessage(data); } }; ws.onclose = () => { window.ws = null;  // Clear global reference on disconnect
  this.overlay.style.display = 'flex'; setTimeout(() => this.connect(), this.reconnectDelay); this.reconnectDelay = Math.min(this.maxReconnectDelay, this.reconnectDelay * 2); console.warn(`[WebSocket] Connection closed. Reconnecting in ${this.reconnectDelay}ms.`); }; ws.onerror = err => { console.error("[WebSocket] Error:", err); ws.close(); }; } };
 function handleWebSocketMessage(data) {
     switch(data.type) {
@@ -1165,6 +1166,19 @@ function handleWebSocketMessage(data) {
                 charts.updateEarningsHistoryChart(data.data);
             }
             break;
+        case 'earnings_history_chunk': {
+            // Long histories arrive in chunks; draw what we have so far
+            const records = data.seq === 0 ? [] : (earningsState.historyChunks[data.node_name] || []);
+            records.push(...data.data);
+            earningsState.historyChunks[data.node_name] = records;
+            if (isCardVisible('earnings-card')) {
+                charts.updateEarningsHistoryChart(records);
+            }
+            break;
+        }
+        case 'earnings_history_end':
+            delete earningsState.historyChunks[data.node_name];
+            break;
         case 'comparison_data':
             if (window.updateComparisonDisplay) {
                 window.updateComparisonDisplay(data);
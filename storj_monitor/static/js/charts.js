@@ -679,7 +679,7 @@ export function createLatencyHistogramChart() {
 export function updateLatencyHistogramChart(histogramData) {
     if (!latencyHistogramChartInstance) createLatencyHistogramChart();
     
-    if (!histogramData || histogramData.length === 0) {
+    if (!histogramData || !histogramData.count || histogramData.count.length === 0) {
         // Clear the chart when there's no data
         latencyHistogramChartInstance.data.labels = [];
         latencyHistogramChartInstance.data.datasets[0].data = [];
@@ -687,9 +687,10 @@ export function updateLatencyHistogramChart(histogramData) {
         return;
     }
     
-    // histogramData is an array of buckets from backend
-    const labels = histogramData.map(bucket => bucket.label || `${bucket.bucket_start_ms}-${bucket.bucket_end_ms}ms`);
-    const data = histogramData.map(bucket => bucket.count);
+    // histogramData is columnar: bucket starts and counts share an index
+    const size = histogramData.bucket_size_ms;
+    const labels = histogramData.bucket_start_ms.map(start => `${start}-${start + size}ms`);
+    const data = histogramData.count;
     
     latencyHistogramChartInstance.data.labels = labels;
     latencyHistogramChartInstance.data.datasets[0].data = data;
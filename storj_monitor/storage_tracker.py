@@ -15,6 +15,7 @@ from .config import (
     STORAGE_CRITICAL_PERCENT,
     STORAGE_FORECAST_CRITICAL_DAYS,
     STORAGE_FORECAST_WARNING_DAYS,
+    STORAGE_POLL_MAX_CONCURRENT_NODES,
     STORAGE_WARNING_PERCENT,
 )
 
@@ -41,11 +42,6 @@ async def track_storage(
         if not dashboard:
             return None
 
-        # Get per-satellite data
-        satellites_data = await api_client.get_satellites()
-        if not satellites_data:
-            satellites_data = {}
-
         timestamp = datetime.datetime.now(datetime.timezone.utc)
 
         # Extract capacity data - API returns nested structure
@@ -205,72 +201,39 @@ async def calculate_storage_forecast(
     """
     try:
         from .config import DATABASE_FILE
-        from .database import blocking_get_storage_history
+        from .database import blocking_get_storage_regression_sums
 
         loop = asyncio.get_running_loop()
+        time_windows = [1, 7, 30]  # days
 
-        # Get 30 days of history (maximum window we need)
-        history_30d = await loop.run_in_executor(
-            app["db_executor"], blocking_get_storage_history, DATABASE_FILE, node_name, 30
+        # SQLite reduces each window to its regression sums; no rows are shipped
+        window_sums = await loop.run_in_executor(
+            app["db_executor"],
+            blocking_get_storage_regression_sums,
+            DATABASE_FILE,
+            node_name,
+            time_windows,
         )
 
-        if len(history_30d) < 2:
-            # Not enough data for forecast
-            log.info(
-                f"[{node_name}] Insufficient storage history for growth rate calculation: {len(history_30d)} records (need 2+)"
-            )
-            return None
-
-        # Filter out records with None used_bytes (from log-based snapshots)
-        valid_history_30d = [h for h in history_30d if h.get("used_bytes") is not None]
-
-        if len(valid_history_30d) < 2:
+        data_points = window_sums[time_windows[-1]][0] if window_sums else 0
+        if data_points < 2:
             # Not enough valid data for forecast
-            log.warning(
-                f"[{node_name}] Cannot calculate growth rate: {len(valid_history_30d)} records with used_bytes out of {len(history_30d)} total. "
+            log.info(
+                f"[{node_name}] Insufficient storage history for growth rate calculation: {data_points} records with used_bytes (need 2+). "
                 f"Growth rate requires API-based storage data (not log-based). Enable storage polling via NODE_API_URL config."
             )
             return None
 
         # Calculate growth rates for multiple time windows
-        time_windows = [1, 7, 30]  # days
         growth_rates = {}
 
         for days in time_windows:
-            # Filter history to the specified window
-            cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)
-            valid_history = [
-                h
-                for h in valid_history_30d
-                if datetime.datetime.fromisoformat(h["timestamp"]) >= cutoff
-            ]
-
-            if len(valid_history) < 2:
-                # Not enough data for this window
-                growth_rates[f"{days}d"] = {
-                    "growth_rate_bytes_per_day": None,
-                    "growth_rate_gb_per_day": None,
-                    "days_until_full": None,
-                    "data_points": len(valid_history),
-                }
-                continue
+            n = window_sums[days][0]
 
-            # Calculate linear regression for this window
-            timestamps = [
-                (datetime.datetime.fromisoformat(h["timestamp"]).timestamp() / 86400)
-                for h in valid_history
-            ]  # Convert to days
-            used_bytes = [h["used_bytes"] for h in valid_history]
-
-            n = len(timestamps)
-            sum_x = sum(timestamps)
-            sum_y = sum(used_bytes)
-            sum_xy = sum(x * y for x, y in zip(timestamps, used_bytes))
-            sum_x2 = sum(x * x for x in timestamps)
-
-            # Calculate slope (bytes per day)
-            denominator = (n * sum_x2) - (sum_x * sum_x)
-            if denominator == 0:
+            # Calculate linear regression for this window (bytes per day)
+            slope = _growth_slope(*window_sums[days])
+            if slope is None:
+                # Not enough data (or no time spread) for this window
                 growth_rates[f"{days}d"] = {
                     "growth_rate_bytes_per_day": None,
                     "growth_rate_gb_per_day": None,
@@ -279,8 +242,6 @@ async def calculate_storage_forecast(
                 }
                 continue
 
-            slope = ((n * sum_xy) - (sum_x * sum_y)) / denominator
-
             # Calculate days until full for this growth rate
             days_until_full = None if slope <= 0 else current_available / slope
 
@@ -307,13 +268,21 @@ async def calculate_storage_forecast(
         return None
 
 
+def _growth_slope(n, sum_x, sum_y, sum_xy, sum_x2, min_x, max_x) -> Optional[float]:
+    """Least-squares slope from regression sums, or None for fewer than 2 points or no time spread."""
+    if n < 2 or min_x == max_x:
+        return None
+    return ((n * sum_xy) - (sum_x * sum_y)) / ((n * sum_x2) - (sum_x * sum_x))
+
+
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
 def _format_bytes(bytes_value: int) -> str:
     """Format bytes as human-readable string."""
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.2f} {unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.2f} PB"
+    # Each unit spans 10 bits, so the bit length picks the unit directly
+    unit_index = min(max(int(abs(bytes_value)).bit_length() - 1, 0) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / (1 << (10 * unit_index)):.2f} {_BYTE_UNITS[unit_index]}"
 
 
 async def storage_polling_task(app: dict[str, Any]):
@@ -325,6 +294,13 @@ async def storage_polling_task(app: dict[str, Any]):
     # Wait a bit for initial setup
     await asyncio.sleep(15)
 
+    # Poll nodes concurrently so a cycle takes as long as the slowest node, not the sum
+    semaphore = asyncio.Semaphore(STORAGE_POLL_MAX_CONCURRENT_NODES)
+
+    async def poll_node(node_name, api_client):
+        async with semaphore:
+            return await track_storage(app, node_name, api_client)
+
     while True:
         try:
             api_clients = app.get("api_clients", {})
@@ -334,11 +310,16 @@ async def storage_polling_task(app: dict[str, Any]):
                 await asyncio.sleep(NODE_API_POLL_INTERVAL)
                 continue
 
-            for node_name, api_client in api_clients.items():
-                if not api_client.is_available:
-                    continue
+            available = [(name, client) for name, client in api_clients.items() if client.is_available]
+            results = await asyncio.gather(
+                *(poll_node(node_name, api_client) for node_name, api_client in available),
+                return_exceptions=True,
+            )
 
-                result = await track_storage(app, node_name, api_client)
+            for (node_name, _api_client), result in zip(available, results):
+                if isinstance(result, Exception):
+                    log.error(f"[{node_name}] Storage poll failed: {result}")
+                    continue
                 if result and result.get("alerts"):
                     # Broadcast alerts to websocket clients
                     from .state import app_state
@@ -9,14 +9,31 @@ Default API endpoint: http://localhost:14002
 """
 
 import asyncio
+import json
 import logging
+import random
+import time
 from typing import Optional, Dict, Any
 import aiohttp
 
-from .config import NODE_API_TIMEOUT, NODE_API_DEFAULT_PORT, ALLOW_REMOTE_API
+from .config import (
+    NODE_API_DASHBOARD_CACHE_SECONDS,
+    NODE_API_TIMEOUT,
+    NODE_API_DEFAULT_PORT,
+    ALLOW_REMOTE_API,
+    PERF_USE_ORJSON,
+)
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
 
 log = logging.getLogger("StorjMonitor.APIClient")
 
+# Parser for node API responses (satellite and paystub payloads can be large)
+json_loads = orjson.loads if PERF_USE_ORJSON and orjson is not None else json.loads
+
 
 class StorjNodeAPIClient:
     """
@@ -34,9 +51,13 @@ class StorjNodeAPIClient:
         self._health_check_task: Optional[asyncio.Task] = None
         self._reconnect_attempts = 0
         self._max_reconnect_attempts = 10
+        self._reconnect_backoff = 1.0  # seconds; grows with jitter between failed reconnects
         self._health_check_interval = 30  # seconds
         self._last_successful_request = None
         self._connection_state = "disconnected"  # disconnected, connecting, connected, error
+        # Last good dashboard as (monotonic time, data) and the fetch callers are currently sharing
+        self._dashboard_cache = (0.0, None)
+        self._dashboard_inflight: Optional[asyncio.Future] = None
 
     async def start(self):
         """Initialize the API client and verify connectivity with auto-reconnect."""
@@ -55,12 +76,18 @@ class StorjNodeAPIClient:
 
             self.session = aiohttp.ClientSession(
                 timeout=aiohttp.ClientTimeout(total=self.timeout),
-                connector=aiohttp.TCPConnector(limit=10),
+                # Keep the idle connection (and resolved address) across the 30s health
+                # checks and polls instead of reconnecting for each request
+                connector=aiohttp.TCPConnector(
+                    limit=10,
+                    keepalive_timeout=2 * self._health_check_interval,
+                    ttl_dns_cache=300,
+                ),
                 raise_for_status=False,  # Handle status codes manually
             )
 
-            # Test connectivity
-            data = await self.get_dashboard()
+            # Test connectivity with a fresh request, bypassing the shared dashboard cache
+            data = await self._fetch_dashboard()
 
             # Debug: Log what we received
             log.debug(f"[{self.node_name}] API response type: {type(data)}")
@@ -71,7 +98,8 @@ class StorjNodeAPIClient:
                 self.is_available = True
                 self._connection_state = "connected"
                 self._reconnect_attempts = 0
-                self._last_successful_request = asyncio.get_event_loop().time()
+                self._reconnect_backoff = 1.0
+                self._last_successful_request = time.monotonic()
                 node_id = data.get("nodeID", "unknown")[:12]
                 wallet = data.get("wallet", "unknown")[:12]
                 version = data.get("version", "unknown")
@@ -110,12 +138,13 @@ class StorjNodeAPIClient:
                     # Attempt reconnection
                     if self._reconnect_attempts < self._max_reconnect_attempts:
                         self._reconnect_attempts += 1
-                        backoff = min(2**self._reconnect_attempts, 300)  # Max 5 minutes
+                        backoff = self._next_reconnect_backoff()
                         log.info(
                             f"[{self.node_name}] API reconnection attempt {self._reconnect_attempts}/"
-                            f"{self._max_reconnect_attempts} in {backoff}s"
+                            f"{self._max_reconnect_attempts} in {backoff:.0f}s"
                         )
-                        await asyncio.sleep(backoff)
+                        if backoff:
+                            await asyncio.sleep(backoff)
                         await self._connect()
                     else:
                         log.warning(
@@ -129,7 +158,7 @@ class StorjNodeAPIClient:
                     try:
                         data = await self.get_dashboard()
                         if data and "nodeID" in data:
-                            self._last_successful_request = asyncio.get_event_loop().time()
+                            self._last_successful_request = time.monotonic()
                             log.debug(f"[{self.node_name}] API health check passed")
                         else:
                             log.warning(
@@ -148,6 +177,18 @@ class StorjNodeAPIClient:
             except Exception as e:
                 log.error(f"[{self.node_name}] Error in health check loop: {e}", exc_info=True)
 
+    def _next_reconnect_backoff(self) -> float:
+        """
+        Seconds to wait before the next reconnect attempt. The first attempt goes
+        out right away (most drops are transient); later ones use decorrelated
+        jitter, capped at 5 minutes, so many node clients don't retry in lockstep.
+        """
+        if self._reconnect_attempts <= 1:
+            self._reconnect_backoff = 1.0
+            return 0.0
+        self._reconnect_backoff = min(300.0, random.uniform(1.0, self._reconnect_backoff * 3))
+        return self._reconnect_backoff
+
     async def stop(self):
         """Clean up the API client."""
         # Cancel health check task
@@ -188,8 +229,8 @@ class StorjNodeAPIClient:
                 log.debug(f"[{self.node_name}] API status: {resp.status} for {url}")
 
                 if resp.status == 200:
-                    json_data = await resp.json()
-                    self._last_successful_request = asyncio.get_event_loop().time()
+                    json_data = await resp.json(loads=json_loads)
+                    self._last_successful_request = time.monotonic()
                     # Handle null/None responses (valid JSON for periods with no data)
                     if json_data is None:
                         log.debug(f"[{self.node_name}] API returned null for {path}")
@@ -249,8 +290,32 @@ class StorjNodeAPIClient:
         Get general dashboard data.
 
         Returns dict with keys: nodeID, wallet, diskSpace, satellites, bandwidth, etc.
+
+        A successful response is reused for NODE_API_DASHBOARD_CACHE_SECONDS, and
+        concurrent callers (storage, earnings, health check) share one request.
         """
-        return await self._get("/api/sno")
+        fetched_at, data = self._dashboard_cache
+        age = time.monotonic() - fetched_at
+        if data is not None and age < NODE_API_DASHBOARD_CACHE_SECONDS:
+            return data
+
+        task = self._dashboard_inflight
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_dashboard())
+            self._dashboard_inflight = task
+            task.add_done_callback(self._clear_dashboard_inflight)
+        return await asyncio.shield(task)
+
+    async def _fetch_dashboard(self) -> Optional[Dict]:
+        """Request the dashboard and remember a successful response."""
+        data = await self._get("/api/sno")
+        if data is not None:
+            self._dashboard_cache = (time.monotonic(), data)
+        return data
+
+    def _clear_dashboard_inflight(self, task: asyncio.Future):
+        if self._dashboard_inflight is task:
+            self._dashboard_inflight = None
 
     async def get_satellites(self) -> Optional[Dict]:
         """
@@ -342,20 +407,17 @@ async def auto_discover_api_endpoint(node_config: Dict[str, Any]) -> Optional[st
             candidates = [f"http://{host}:{NODE_API_DEFAULT_PORT}"]
             log.info(f"[{node_name}] Attempting auto-discovery for remote node at {host}...")
 
-    # Test each candidate
-    for endpoint in candidates:
-        try:
-            timeout = aiohttp.ClientTimeout(total=2)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(f"{endpoint}/api/sno") as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        if data and "nodeID" in data:
-                            log.info(f"[{node_name}] Auto-discovered API endpoint: {endpoint}")
-                            return endpoint
-        except Exception:
-            # Silently continue to next candidate
-            continue
+    # Probe all candidates concurrently over one session; earlier candidates are preferred
+    if candidates:
+        timeout = aiohttp.ClientTimeout(total=2)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(
+                *(_probe_api_endpoint(session, endpoint) for endpoint in candidates)
+            )
+        for endpoint, found in zip(candidates, results):
+            if found:
+                log.info(f"[{node_name}] Auto-discovered API endpoint: {endpoint}")
+                return endpoint
 
     log.info(
         f"[{node_name}] Could not auto-discover API. Enhanced features disabled. "
@@ -364,6 +426,19 @@ async def auto_discover_api_endpoint(node_config: Dict[str, Any]) -> Optional[st
     return None
 
 
+async def _probe_api_endpoint(session: aiohttp.ClientSession, endpoint: str) -> bool:
+    """Return True if endpoint answers /api/sno like a storage node."""
+    try:
+        async with session.get(f"{endpoint}/api/sno") as resp:
+            if resp.status == 200:
+                data = await resp.json(loads=json_loads)
+                return bool(data and "nodeID" in data)
+    except Exception:
+        # Unreachable or not a node API; the caller tries the other candidates
+        pass
+    return False
+
+
 def _is_localhost(host: str) -> bool:
     """Check if host is localhost."""
     return host in ("localhost", "127.0.0.1", "::1", "0.0.0.0")
@@ -1,6 +1,8 @@
 import asyncio
 import logging
 import time
+from collections import defaultdict
+from itertools import takewhile
 
 from .state import app_state
 from .config import (
@@ -21,7 +23,7 @@ from .database import (
     blocking_db_prune,
     get_historical_stats,
 )
-from .websocket_utils import robust_broadcast, safe_send_json
+from .websocket_utils import encode_json, get_ws_snapshot, robust_broadcast, send_encoded
 
 log = logging.getLogger("StorjMonitor.Tasks")
 
@@ -136,15 +138,14 @@ async def incremental_stats_updater_task(app):
         await asyncio.sleep(STATS_INTERVAL_SECONDS)
 
         try:
-            # Snapshot of websockets to avoid concurrent modification errors
-            websockets_snapshot = dict(app_state["websockets"])
-            active_views = {
-                tuple(state.get("view", ["Aggregate"])) for state in websockets_snapshot.values()
-            }
-            if not active_views:
+            # Group clients by view once, so each view is computed and encoded once
+            view_groups = defaultdict(list)
+            for ws, view_tuple in get_ws_snapshot():
+                view_groups[view_tuple or ("Aggregate",)].append(ws)
+            if not view_groups:
                 continue
 
-            for view_tuple in active_views:
+            for view_tuple, recipients in view_groups.items():
                 view_list = list(view_tuple)
 
                 # Ensure a stats object exists for this view
@@ -159,55 +160,44 @@ async def incremental_stats_updater_task(app):
                 )
                 new_events_processed = False
 
-                # Process new events for each node (timestamp-based to survive deque pruning)
+                # Process new events for each node (sequence-based to survive deque pruning)
                 for node_name in nodes_to_process:
                     node_state = app_state["nodes"].get(node_name)
                     if not node_state:
                         continue
 
-                    all_events = list(node_state["live_events"])
-                    if not all_events:
-                        continue
-
-                    # Cursor by timestamp so pruning of left-side events doesn't break progression
-                    last_ts = stats.last_processed_ts.get(node_name, 0.0)
-                    new_events = [e for e in all_events if e.get("ts_unix", 0) > last_ts]
+                    # Walk back from the newest event only as far as the cursor;
+                    # pruning from the left never moves it
+                    last_seq = stats.last_processed_seq.get(node_name, 0)
+                    new_events = list(
+                        takewhile(
+                            lambda e, last_seq=last_seq: e.get("seq", 0) > last_seq,
+                            reversed(node_state["live_events"]),
+                        )
+                    )
 
                     if new_events:
-                        for event in new_events:
-                            stats.add_event(event, app_state["TOKEN_REGEX"])
-                        # Advance cursor to newest processed timestamp
-                        stats.last_processed_ts[node_name] = max(
-                            e.get("ts_unix", last_ts) for e in new_events
-                        )
+                        new_events.reverse()
+                        stats.add_events(new_events, app_state["TOKEN_REGEX"])
+                        stats.add_live_events(new_events)
+                        stats.last_processed_seq[node_name] = new_events[-1]["seq"]
                         new_events_processed = True
 
                     # Reset flag after attempting to process
                     node_state["has_new_events"] = False
 
-                # --- Always update live stats to keep aggregates current ---
-                all_events_for_view = [
-                    event
-                    for node_name in nodes_to_process
-                    if node_name in app_state["nodes"]
-                    for event in app_state["nodes"][node_name]["live_events"]
-                ]
-                stats.update_live_stats(all_events_for_view)
+                # --- Slide the live window: drop transfers older than a minute ---
+                stats.expire_live_stats()
 
                 historical_stats = get_historical_stats(view_list, app_state["nodes"])
-                payload = stats.to_payload(historical_stats)
-                app_state["stats_cache"][view_tuple] = payload
+                # Encode once per view; the same bytes serve this broadcast and later cache hits
+                data = encode_json(stats.to_payload(historical_stats))
+                app_state["stats_cache"][view_tuple] = data
 
                 # --- Broadcast every cycle to keep UI time window and highlights fresh ---
-                recipients = [
-                    ws
-                    for ws, state in websockets_snapshot.items()
-                    if tuple(state.get("view", ["Aggregate"])) == view_tuple
-                ]
-                # Send concurrently and never block on a single slow/broken client
-                send_tasks = [safe_send_json(ws, payload) for ws in recipients]
-                if send_tasks:
-                    await asyncio.gather(*send_tasks, return_exceptions=True)
+                # Queued per client; never block on a single slow/broken client
+                send_tasks = [send_encoded(ws, data, broadcast=True) for ws in recipients]
+                await asyncio.gather(*send_tasks, return_exceptions=True)
 
         except Exception:
             log.error("Error in incremental_stats_updater_task:", exc_info=True)
@@ -269,11 +259,12 @@ async def websocket_batch_broadcaster_task(app):
         await asyncio.sleep(WEBSOCKET_BATCH_INTERVAL_MS / 1000.0)
         try:
             async with app_state["websocket_queue_lock"]:
-                if not app_state["websocket_event_queue"]:
+                event_queue = app_state["websocket_event_queue"]
+                if not event_queue:
                     continue
-                events_to_send = app_state["websocket_event_queue"][:WEBSOCKET_BATCH_SIZE]
-                app_state["websocket_event_queue"] = app_state["websocket_event_queue"][
-                    WEBSOCKET_BATCH_SIZE:
+                # Pop only this batch; the rest of the queue is left in place
+                events_to_send = [
+                    event_queue.popleft() for _ in range(min(len(event_queue), WEBSOCKET_BATCH_SIZE))
                 ]
 
             base_arrival_time = events_to_send[0]["arrival_time"]
@@ -333,6 +324,8 @@ async def start_background_tasks(app):
         GEOIP_DATABASE_PATH,
         DATABASE_FILE,
         DB_THREAD_POOL_SIZE,
+        DB_FAST_POOL_SIZE,
+        DB_HEAVY_POOL_SIZE,
         DB_CONNECTION_POOL_SIZE,
         DB_CONNECTION_TIMEOUT,
     )
@@ -355,6 +348,16 @@ async def start_background_tasks(app):
 
     app["db_executor"] = concurrent.futures.ThreadPoolExecutor(max_workers=DB_THREAD_POOL_SIZE)
     log.info(f"Database thread pool initialized with {DB_THREAD_POOL_SIZE} workers")
+    # Separate pools so long-running scans cannot block quick lookups (head-of-line blocking)
+    app["db_executor_fast"] = concurrent.futures.ThreadPoolExecutor(
+        max_workers=DB_FAST_POOL_SIZE, thread_name_prefix="db-fast"
+    )
+    app["db_executor_heavy"] = concurrent.futures.ThreadPoolExecutor(
+        max_workers=DB_HEAVY_POOL_SIZE, thread_name_prefix="db-heavy"
+    )
+    log.info(
+        f"Database query pools initialized (fast: {DB_FAST_POOL_SIZE}, heavy: {DB_HEAVY_POOL_SIZE} workers)"
+    )
     app["log_executor"] = concurrent.futures.ThreadPoolExecutor(max_workers=len(app["nodes"]) + 1)
     app["tasks"] = []
     app["log_reader_shutdown_events"] = {}
@@ -379,6 +382,7 @@ async def start_background_tasks(app):
                 "active_compactions": {},
                 "unprocessed_performance_events": [],
                 "has_new_events": False,
+                "event_seq": 0,
             }
 
         # Setup log reader
@@ -481,7 +485,7 @@ async def cleanup_background_tasks(app):
     log.info("Database connection pool cleaned up.")
 
     # Shutdown executors
-    for executor_name in ["db_executor", "log_executor"]:
+    for executor_name in ["db_executor", "db_executor_fast", "db_executor_heavy", "log_executor"]:
         if executor_name in app and app[executor_name]:
             app[executor_name].shutdown(wait=True)
             log.info(f"{executor_name} shut down.")
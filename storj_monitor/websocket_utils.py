@@ -1,16 +1,85 @@
 import asyncio
+import json
 import logging
-from typing import Optional
+from collections import deque
+from typing import Any, Optional
 
 import aiohttp
 
+from .config import PERF_USE_ORJSON, WEBSOCKET_SEND_QUEUE_SIZE
+from .state import app_state
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
 
 log = logging.getLogger("StorjMonitor.WebsocketUtils")
 
+USE_ORJSON = PERF_USE_ORJSON and orjson is not None
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if USE_ORJSON else 0
+
+
+def json_loads(data) -> Any:
+    """Decode an inbound WebSocket JSON message (str or bytes)."""
+    if USE_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_json(payload: Any) -> bytes:
+    """Encode a payload as the UTF-8 body of a JSON text frame."""
+    if USE_ORJSON:
+        # Accept numpy results as-is instead of converting them before sending
+        return orjson.dumps(payload, option=ORJSON_OPTIONS)
+    return json.dumps(payload).encode("utf-8")
+
 
 async def safe_send_json(ws, payload):
     """
     Safely send JSON data over WebSocket, handling connection errors gracefully.
+    Clients with an outbound queue (see open_send_queue) get the encoded
+    message queued for their writer task instead of a direct frame.
+
+    Returns:
+        bool: True if sent (or queued) successfully, False if connection was closed/closing
+    """
+    if ws.closed:
+        return False
+    try:
+        data = encode_json(payload)
+    except Exception as e:
+        log.warning(f"Could not serialize WebSocket payload: {e}", exc_info=True)
+        return False
+    return await send_encoded(ws, data)
+
+
+async def send_encoded(ws, data: bytes, broadcast: bool = False) -> bool:
+    """
+    Send a pre-encoded JSON message, through the client's outbound queue when it has one.
+    Broadcasts may be dropped for a client that is not keeping up; replies never are.
+
+    Returns:
+        bool: True if sent (or queued) successfully, False if connection was closed/closing
+    """
+    client = app_state["websockets"].get(ws)
+    send_queue = client.get("send_queue") if client else None
+    if send_queue is not None:
+        if ws.closed:
+            return False
+        if send_queue.put(data, broadcast):
+            log.debug("Client send queue full, dropped its oldest broadcast")
+        return True
+    return await safe_send_text(ws, data)
+
+
+async def safe_send_text(ws, data: bytes) -> bool:
+    """
+    Safely send pre-encoded JSON bytes as a TEXT frame.
+
+    Writing the frame directly skips aiohttp's send_str/send_json
+    str -> bytes round-trip for payloads that are already encoded.
 
     Returns:
         bool: True if sent successfully, False if connection was closed/closing
@@ -18,7 +87,7 @@ async def safe_send_json(ws, payload):
     try:
         if ws.closed:
             return False
-        await ws.send_json(payload)
+        await ws.send_frame(data, aiohttp.WSMsgType.TEXT)
         return True
     except (
         ConnectionResetError,
@@ -27,14 +96,135 @@ async def safe_send_json(ws, payload):
         asyncio.CancelledError,
     ) as e:
         # Client disconnected or connection is closing - this is normal
-        log.debug(f"Could not send broadcast to client (connection closing): {type(e).__name__}")
+        log.debug(f"Could not send message to client (connection closing): {type(e).__name__}")
         return False
     except Exception as e:
         # Unexpected error - log it
-        log.warning(f"Unexpected error sending WebSocket broadcast: {e}", exc_info=True)
+        log.warning(f"Unexpected error sending WebSocket message: {e}", exc_info=True)
         return False
 
 
+class OutboundQueue:
+    """
+    Ordered outbound messages for one client. Replies are always kept; at most
+    max_broadcasts broadcasts are held, and the oldest one gives way to a new one.
+    """
+
+    def __init__(self, max_broadcasts: int):
+        self.max_broadcasts = max_broadcasts
+        self._items: deque = deque()  # (data, is_broadcast)
+        self._broadcasts = 0
+        self._ready = asyncio.Event()
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, data: bytes, broadcast: bool = False) -> bool:
+        """Queue a message. Returns True if an older broadcast was dropped to make room."""
+        dropped = False
+        if broadcast:
+            if self._broadcasts >= self.max_broadcasts:
+                for i, (_data, is_broadcast) in enumerate(self._items):
+                    if is_broadcast:
+                        del self._items[i]
+                        break
+                dropped = True
+            else:
+                self._broadcasts += 1
+        self._items.append((data, broadcast))
+        self._ready.set()
+        return dropped
+
+    async def get_all(self) -> list:
+        """Wait for at least one message, then take everything queued."""
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        messages = [data for data, _is_broadcast in self._items]
+        self._items.clear()
+        self._broadcasts = 0
+        return messages
+
+
+def open_send_queue(ws, client: dict) -> asyncio.Task:
+    """
+    Give a connected client an outbound queue drained by a writer task,
+    so replies and broadcasts never wait on a slow client.
+    The task is stored on the client state; cancel it with close_send_queue.
+    """
+    send_queue = OutboundQueue(WEBSOCKET_SEND_QUEUE_SIZE)
+    client["send_queue"] = send_queue
+    client["send_writer_task"] = asyncio.create_task(_send_queue_writer(ws, send_queue))
+    return client["send_writer_task"]
+
+
+def close_send_queue(client: Optional[dict]):
+    """Stop a client's writer task, dropping any unsent messages."""
+    writer = client.get("send_writer_task") if client else None
+    if writer and not writer.done():
+        writer.cancel()
+
+
+def batch_frame(messages: list) -> bytes:
+    """Join already-encoded JSON messages into one {"type": "batch"} frame body."""
+    return b'{"type":"batch","messages":[' + b",".join(messages) + b"]}"
+
+
+async def _send_queue_writer(ws, send_queue: OutboundQueue):
+    """
+    Sends queued messages for one client. A lone message goes out unchanged with no
+    added latency; messages that piled up while the previous frame was being
+    written are coalesced into a single batch frame.
+    """
+    while True:
+        messages = await send_queue.get_all()
+        data = messages[0] if len(messages) == 1 else batch_frame(messages)
+        if ws.closed:
+            continue
+        # Write the frame directly: safe_send_text swallows CancelledError, which
+        # would keep close_send_queue from stopping a writer blocked mid-send
+        try:
+            await ws.send_frame(data, aiohttp.WSMsgType.TEXT)
+        except (
+            ConnectionResetError,
+            aiohttp.client_exceptions.ClientConnectionResetError,
+            RuntimeError,
+        ) as e:
+            log.debug(f"Could not send queued message to client (connection closing): {type(e).__name__}")
+        except Exception as e:
+            log.warning(f"Unexpected error sending queued WebSocket message: {e}", exc_info=True)
+
+
+def _build_ws_snapshot(websockets_dict) -> tuple:
+    return tuple((ws, tuple(state.get("view") or ())) for ws, state in list(websockets_dict.items()))
+
+
+def refresh_ws_snapshot():
+    """
+    Rebuild the read-only (ws, view_tuple) snapshot of connected clients.
+    Call after any connect, disconnect or view change; readers never lock or hash the registry.
+    """
+    websockets_dict = app_state["websockets"]
+    app_state["ws_snapshot"] = (websockets_dict, _build_ws_snapshot(websockets_dict))
+
+
+def get_ws_snapshot(websockets_dict=None) -> tuple:
+    """
+    Returns ((ws, view_tuple), ...) for the given client registry.
+    The published snapshot of the live registry is kept current by refresh_ws_snapshot;
+    any other registry is snapshotted on the spot.
+    """
+    if websockets_dict is None:
+        websockets_dict = app_state["websockets"]
+    source, pairs = app_state["ws_snapshot"]
+    if source is websockets_dict:
+        return pairs
+    pairs = _build_ws_snapshot(websockets_dict)
+    if websockets_dict is app_state["websockets"]:
+        app_state["ws_snapshot"] = (websockets_dict, pairs)
+    return pairs
+
+
 async def robust_broadcast(websockets_dict, payload, node_name: Optional[str] = None):
     """
     Sends a JSON payload to all relevant WebSocket clients.
@@ -43,21 +233,22 @@ async def robust_broadcast(websockets_dict, payload, node_name: Optional[str] =
     """
     # If this is a node-specific message, filter the recipients to those
     # viewing the specific node or the aggregate view.
+    snapshot = get_ws_snapshot(websockets_dict)
     if node_name:
-        recipients = {
-            ws
-            for ws, state in websockets_dict.items()
-            if state.get("view")
-            and (state.get("view") == ["Aggregate"] or node_name in state.get("view"))
-        }
+        recipients = [
+            ws for ws, view in snapshot if view == ("Aggregate",) or node_name in view
+        ]
     else:  # Broadcast to all connected clients
-        recipients = set(websockets_dict.keys())
+        recipients = [ws for ws, _view in snapshot]
 
     if not recipients:
         return
 
-    # Create tasks for all send operations to run them concurrently
-    tasks = [safe_send_json(ws, payload) for ws in recipients]
+    # Serialize once and share the prepared frame body across all recipients
+    data = encode_json(payload)
+
+    # Queue for clients with a writer task; a slow client never holds up the rest
+    tasks = [send_encoded(ws, data, broadcast=True) for ws in recipients]
 
     if tasks:
         # Wait for all send operations to complete.
@@ -38,7 +38,7 @@ def mock_websocket():
     """Create a mock WebSocket connection."""
     ws = AsyncMock(spec=web.WebSocketResponse)
     ws.send_json = AsyncMock()
-    ws.send_str = AsyncMock()
+    ws.send_frame = AsyncMock()
     ws.closed = False
     ws.exception = Mock(return_value=None)
     return ws
@@ -67,7 +67,7 @@ async def test_websocket_initial_connection(mock_app, mock_websocket, temp_db):
         "has_new_events": False,
     }
     app_state["websockets"] = {}
-    app_state["stats_cache"] = {}
+    app_state["stats_cache"].clear()
 
     # Simulate connection
     app_state["websockets"][mock_websocket] = {"view": ["Aggregate"]}
@@ -103,7 +103,7 @@ async def test_websocket_view_change(mock_app, mock_websocket, temp_db):
         "unprocessed_performance_events": [],
         "has_new_events": False,
     }
-    app_state["stats_cache"] = {}
+    app_state["stats_cache"].clear()
 
     # Simulate view change message
 
@@ -148,8 +148,9 @@ async def test_websocket_statistics_broadcast(mock_websocket):
     await robust_broadcast(app_state["websockets"], payload)
 
     # Verify both clients received the message
-    assert ws1.send_json.called
-    assert ws2.send_json.called
+    assert ws1.send_frame.called
+    assert ws2.send_frame.called
+    assert json.loads(ws1.send_frame.call_args[0][0]) == payload
 
 
 @pytest.mark.asyncio
@@ -188,8 +189,9 @@ async def test_websocket_node_specific_broadcast(mock_websocket):
     await robust_broadcast(app_state["websockets"], payload, node_name="test-node")
 
     # Verify only test-node and aggregate clients received it
-    assert ws_node1.send_json.called
-    assert ws_aggregate.send_json.called
+    assert ws_node1.send_frame.called
+    assert ws_aggregate.send_frame.called
+    assert not ws_node2.send_frame.called
     # ws_node2 should not receive it (different node)
 
 
@@ -377,7 +379,7 @@ async def test_websocket_error_handling():
 
     # Create WebSocket that raises error
     ws_error = AsyncMock(spec=web.WebSocketResponse)
-    ws_error.send_json = AsyncMock(side_effect=ConnectionResetError("Connection lost"))
+    ws_error.send_frame = AsyncMock(side_effect=ConnectionResetError("Connection lost"))
     ws_error.closed = True
 
     # Create normal WebSocket
@@ -399,7 +401,7 @@ async def test_websocket_error_handling():
         pytest.fail(f"robust_broadcast should not raise exception: {e}")
 
     # Normal client should still receive message
-    assert ws_normal.send_json.called
+    assert ws_normal.send_frame.called
 
 
 @pytest.mark.asyncio
@@ -480,7 +482,7 @@ async def test_websocket_concurrent_clients():
 
     # Verify all clients received message
     for ws in clients:
-        assert ws.send_json.called
+        assert ws.send_frame.called
 
 
 @pytest.mark.asyncio
@@ -586,3 +588,69 @@ async def test_websocket_heartbeat():
 
     assert ws.ping.called
     assert not ws.closed
+
+
+@pytest.mark.asyncio
+async def test_websocket_view_change_debounce_drops_stale_views(mock_app, monkeypatch):
+    """
+    Test set_view debouncing:
+    1. Client switches view twice in quick succession
+    2. Only the latest view is computed and sent
+    """
+    from storj_monitor import server
+    from storj_monitor.state import app_state
+
+    monkeypatch.setattr(server, "VIEW_CHANGE_DEBOUNCE_SECONDS", 0)
+    sent_views = []
+
+    async def fake_send_initial_stats(app, ws, view):
+        sent_views.append(view)
+
+    monkeypatch.setattr(server, "send_initial_stats", fake_send_initial_stats)
+
+    ws = AsyncMock(spec=web.WebSocketResponse)
+    ws.closed = False
+    app_state["websockets"] = {ws: {"view": ["test-node"], "view_seq": 2}}
+    monkeypatch.setitem(app_state, "earnings_cache", {})
+
+    # A superseded view change is dropped
+    await server.send_view_update(mock_app, ws, ["Aggregate"], 1)
+    assert sent_views == []
+
+    # The latest view change is sent
+    await server.send_view_update(mock_app, ws, ["test-node"], 2)
+    assert sent_views == [["test-node"]]
+
+
+@pytest.mark.asyncio
+async def test_initial_stats_are_queued_ahead_of_later_replies(mock_app, monkeypatch):
+    """
+    Test connect-time ordering:
+    1. Initial stats go through the client's outbound queue
+    2. A reply sent afterwards reaches the client after them, not before
+    """
+    from storj_monitor import server
+    from storj_monitor.state import app_state
+    from storj_monitor.websocket_utils import close_send_queue, json_loads, open_send_queue
+
+    ws = AsyncMock(spec=web.WebSocketResponse)
+    ws.closed = False
+    client = {"view": ["Aggregate"]}
+    monkeypatch.setitem(app_state, "websockets", {ws: client})
+    monkeypatch.setitem(app_state, "stats_cache", {("Aggregate",): b'{"type":"stats_update"}'})
+    open_send_queue(ws, client)
+    try:
+        await server.send_initial_stats(mock_app, ws, ["Aggregate"])
+        await server.safe_send_json(ws, {"type": "active_compactions_update"})
+        await asyncio.sleep(0)
+
+        frames = [json_loads(call.args[0]) for call in ws.send_frame.await_args_list]
+        assert frames == [
+            {
+                "type": "batch",
+                "messages": [{"type": "stats_update"}, {"type": "active_compactions_update"}],
+            }
+        ]
+    finally:
+        close_send_queue(client)
+        await asyncio.sleep(0)
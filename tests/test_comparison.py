@@ -6,7 +6,10 @@ import pytest
 from storj_monitor.server import (
     parse_time_range,
     calculate_percentile,
+    calculate_percentiles,
     calculate_success_rate,
+    count_outcomes_by_action,
+    comparison_sample_size,
     calculate_earnings_per_tb,
     calculate_storage_efficiency,
     calculate_avg_score,
@@ -296,6 +299,93 @@ def test_calculate_storage_efficiency_boundary_values():
     assert efficiency == 10.0  # 100 - (100 - 10) = 10
 
 
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_calculate_percentiles_matches_single_percentile(monkeypatch, use_numpy):
+    """Test that the single-sort variant agrees with calculate_percentile."""
+    from storj_monitor import server
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    monkeypatch.setattr(server, "USE_NUMPY", use_numpy)
+    data = [float(x) for x in range(1000, 0, -7)]
+
+    result = calculate_percentiles(data, (50, 95, 99))
+
+    assert result == {p: calculate_percentile(data, p) for p in (50, 95, 99)}
+    assert calculate_percentiles([], (50, 95)) == {50: 0.0, 95: 0.0}
+    if use_numpy:
+        import numpy as np
+
+        assert calculate_percentiles(np.array(data), (50, 95, 99)) == result
+        # Duplicate ranks (tiny inputs) resolve to the same value
+        assert calculate_percentiles([3.0, 1.0], (50, 95, 99)) == {50: 1.0, 95: 3.0, 99: 3.0}
+
+
+def test_calculate_percentiles_numpy_matches_python_rounding(monkeypatch):
+    """Test numpy's nearest method picks the same ranks as the pure-Python path."""
+    import random
+
+    from storj_monitor import server
+
+    pytest.importorskip("numpy")
+    rng = random.Random(1234)
+    percentiles = (1, 25, 50, 75, 90, 95, 99)
+    for n in (1, 2, 3, 5, 10, 11, 101, 1000, 1001):
+        data = [rng.uniform(0, 5000) for _ in range(n)]
+        monkeypatch.setattr(server, "USE_NUMPY", False)
+        expected = calculate_percentiles(data, percentiles)
+        monkeypatch.setattr(server, "USE_NUMPY", True)
+        assert calculate_percentiles(data, percentiles) == expected
+
+
+def test_count_outcomes_by_action_single_pass():
+    """Test per-action success/total counting agrees with calculate_success_rate."""
+    events = [
+        {"action": "GET", "status": "success"},
+        {"action": "GET", "status": "failed"},
+        {"action": "PUT", "status": "success"},
+        {"action": "GET_AUDIT", "status": "success"},
+        {"action": "GET_REPAIR", "status": "success"},
+        {"status": "success"},
+    ]
+
+    counts = count_outcomes_by_action(events)
+
+    assert counts == {"GET": [1, 2], "PUT": [1, 1], "GET_AUDIT": [1, 1]}
+    downloads = [e for e in events if e.get("action") == "GET"]
+    assert counts["GET"][0] / counts["GET"][1] * 100 == calculate_success_rate(downloads)
+
+
+def test_calculate_rankings_numpy_matches_python(monkeypatch):
+    """Test that the vectorized ranking path matches the pure-Python one, ties included."""
+    pytest.importorskip("numpy")
+    from storj_monitor import server
+
+    nodes_data = [
+        {"node_name": "A", "metrics": {"success_rate": 99.0, "avg_latency_p50": 0, "total_earnings": None}},
+        {"node_name": "B", "metrics": {"success_rate": 98.0, "avg_latency_p50": 120, "total_earnings": 5.0}},
+        {"node_name": "C", "metrics": {"success_rate": 99.0, "avg_latency_p50": 80}},
+        {"node_name": "D", "metrics": {"success_rate": None, "avg_latency_p50": 80, "total_earnings": 5.0}},
+    ]
+
+    monkeypatch.setattr(server, "USE_NUMPY", False)
+    expected = calculate_rankings(nodes_data, "overall")
+    monkeypatch.setattr(server, "USE_NUMPY", True)
+    result = calculate_rankings(nodes_data, "overall")
+
+    assert result == expected
+    assert result["success_rate"] == ["A", "C", "B", "D"]
+    assert result["avg_latency_p50"] == ["C", "D", "B", "A"]
+
+
+def test_comparison_sample_size_scales_with_window():
+    """Test that the per-node event sample grows with the window within bounds."""
+    assert comparison_sample_size(1) == 2000
+    assert comparison_sample_size(24) == 12000
+    assert comparison_sample_size(24 * 7) == 50000
+    assert comparison_sample_size(24 * 30) == 50000
+
+
 def test_calculate_percentile_edge_cases():
     """
     Test percentile calculation with edge cases.
@@ -328,4 +418,469 @@ def test_calculate_percentile_edge_cases():
     # - 75th: position = 0.75 * 99 = 74.25, rounds to 74, value = 75
     assert calculate_percentile(data, 25) == 26  # 1st quartile
     assert calculate_percentile(data, 50) == 51  # Median
-    assert calculate_percentile(data, 75) == 75  # 3rd quartile
\ No newline at end of file
+    assert calculate_percentile(data, 75) == 75  # 3rd quartile
+
+@pytest.mark.asyncio
+async def test_handle_comparison_request_rejects_unknown_nodes():
+    """Test that comparison requests are validated against the cached node-name set."""
+    from storj_monitor.server import handle_comparison_request
+
+    app = {
+        "nodes": {"TestNode": {}},
+        "node_names_frozen": frozenset({"TestNode"}),
+    }
+
+    response = await handle_comparison_request(app, {"node_names": ["Unknown"]})
+
+    assert response["error"] == "No valid nodes specified"
+    assert response["nodes"] == []
+
+
+@pytest.mark.asyncio
+async def test_gather_node_metrics_reuses_per_node_cache(monkeypatch):
+    """Test that per-node metrics are cached and handed out as copies."""
+    from storj_monitor import database
+    from storj_monitor.server import gather_node_metrics
+
+    calls = {"events": 0}
+
+    def fake_get_events(db_path, node_names, hours, limit):
+        calls["events"] += 1
+        return [{"action": "GET", "status": "success", "duration_ms": 10}]
+
+    monkeypatch.setattr(database, "blocking_get_events", fake_get_events)
+    monkeypatch.setattr(database, "blocking_get_event_counts", lambda *a: [])
+    monkeypatch.setattr(
+        database,
+        "blocking_get_latency_percentiles_batch",
+        lambda db_path, node_names, *a: {n: {50: 10.0, 95: 10.0, 99: 10.0} for n in node_names},
+    )
+    monkeypatch.setattr(database, "blocking_get_latest_reputation", lambda *a: [])
+
+    app = {"db_executor": None, "nodes": {"TestNode": {}}}
+
+    first = await gather_node_metrics(app, "TestNode", 24, "performance")
+    first["storage_utilization"] = 42  # callers overlay data in place
+    second = await gather_node_metrics(app, "TestNode", 24, "performance")
+
+    assert calls["events"] == 1
+    assert second["avg_latency_p50"] == 10.0
+    assert "storage_utilization" not in second
+
+    await gather_node_metrics(app, "TestNode", 24 * 7, "performance")
+    assert calls["events"] == 2
+
+
+@pytest.mark.asyncio
+async def test_calculate_comparison_metrics_bounds_concurrency(monkeypatch):
+    """Test that per-node gathering is bounded and results keep the requested node order."""
+    import asyncio
+
+    from storj_monitor import database, server
+
+    monkeypatch.setattr(server, "COMPARISON_MAX_CONCURRENT_NODES", 2)
+    monkeypatch.setattr(database, "blocking_get_event_counts_batch", lambda *a: {})
+    monkeypatch.setattr(database, "blocking_get_latency_percentiles_batch", lambda *a: {})
+    monkeypatch.setattr(database, "blocking_get_latest_reputation", lambda *a: [])
+
+    running = {"now": 0, "peak": 0}
+
+    async def fake_gather_node_metrics(app, node_name, hours, comparison_type, **kwargs):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        # Later nodes finish first
+        await asyncio.sleep(0.01 * (5 - int(node_name[-1])))
+        running["now"] -= 1
+        if node_name == "N3":
+            raise RuntimeError("boom")
+        return {"total_operations": int(node_name[-1])}
+
+    monkeypatch.setattr(server, "gather_node_metrics", fake_gather_node_metrics)
+
+    node_names = ["N1", "N2", "N3", "N4"]
+    result = await server.calculate_comparison_metrics(
+        {"db_executor": None}, node_names, "performance", "24h"
+    )
+
+    assert running["peak"] == 2
+    assert [n["node_name"] for n in result["nodes"]] == node_names
+    assert result["nodes"][0]["metrics"]["total_operations"] == 1
+    assert result["nodes"][2]["metrics"]["total_operations"] == 0  # error -> empty metrics
+
+
+@pytest.mark.asyncio
+async def test_comparison_cache_evicts_least_recently_used(monkeypatch):
+    """Test that the full-result comparison cache is a bounded LRU."""
+    from collections import OrderedDict
+
+    from storj_monitor import database, server
+
+    monkeypatch.setattr(server, "COMPARISON_CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setattr(database, "blocking_get_event_counts_batch", lambda *a: {})
+    monkeypatch.setattr(database, "blocking_get_latency_percentiles_batch", lambda *a: {})
+    monkeypatch.setattr(database, "blocking_get_latest_reputation", lambda *a: [])
+
+    computed = []
+
+    async def fake_gather_node_metrics(app, node_name, hours, comparison_type, **kwargs):
+        computed.append(node_name)
+        return {"total_operations": 1}
+
+    monkeypatch.setattr(server, "gather_node_metrics", fake_gather_node_metrics)
+
+    app = {"db_executor": None}
+    for name in ("A", "B"):
+        await server.calculate_comparison_metrics(app, [name], "performance", "24h")
+    # Touch A so B becomes the least recently used entry
+    await server.calculate_comparison_metrics(app, ["A"], "performance", "24h")
+    await server.calculate_comparison_metrics(app, ["C"], "performance", "24h")
+
+    cache = app["comparison_cache"]
+    assert isinstance(cache, OrderedDict)
+    assert [key[0] for key in cache] == [("A",), ("C",)]
+    assert computed == ["A", "B", "C"]
+
+
+@pytest.mark.asyncio
+async def test_comparison_with_missing_earnings_is_not_cached(monkeypatch):
+    """Test that a result with unknown earnings is returned but never cached."""
+    from storj_monitor import database, server
+
+    monkeypatch.setattr(database, "blocking_get_latest_storage_with_forecast", lambda *a: [])
+    monkeypatch.setattr(database, "blocking_get_latest_earnings", lambda *a: [])
+    monkeypatch.setattr(database, "blocking_get_latest_reputation", lambda *a: [])
+    monkeypatch.setitem(server.app_state, "earnings_cache", {})
+
+    async def fake_gather_node_metrics(app, node_name, hours, comparison_type, **kwargs):
+        return {"total_earnings": 5.0 if node_name == "A" else None}
+
+    monkeypatch.setattr(server, "gather_node_metrics", fake_gather_node_metrics)
+
+    app = {"db_executor": None}
+    result = await server.calculate_comparison_metrics(app, ["A", "B"], "earnings", "24h")
+
+    assert [n["metrics"]["total_earnings"] for n in result["nodes"]] == [5.0, None]
+    assert len(app["comparison_cache"]) == 0
+
+
+@pytest.mark.asyncio
+async def test_gather_node_metrics_runs_lookups_concurrently(monkeypatch):
+    """Test that summary, earnings and reputation queries overlap on the executor."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from storj_monitor import database
+    from storj_monitor.server import gather_node_metrics
+
+    # Each lookup waits until all three are running; serial execution would time out
+    barrier = threading.Barrier(3, timeout=2)
+
+    def summary(*a):
+        barrier.wait()
+        return {"N1": {"dl_success": 9, "dl_fail": 1, "total_ops": 10}}, {"N1": {50: 1.0, 95: 2.0, 99: 3.0}}
+
+    def earnings(*a):
+        barrier.wait()
+        return [{"total_earnings_net": 4.5}]
+
+    def reputation(*a):
+        barrier.wait()
+        return [{"audit_score": 1.0, "online_score": 0.5}]
+
+    monkeypatch.setattr(database, "blocking_get_perf_summary", summary)
+    monkeypatch.setattr(database, "blocking_get_latest_earnings", earnings)
+    monkeypatch.setattr(database, "blocking_get_latest_reputation", reputation)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        app = {"db_executor": executor}
+        metrics = await gather_node_metrics(app, "N1", 24, "overall")
+
+        assert metrics["success_rate_download"] == 90.0
+        assert metrics["avg_latency_p95"] == 2.0
+        assert metrics["total_earnings"] == 4.5
+        assert metrics["avg_online_score"] == 0.5
+
+        # A failing lookup still yields N/A metrics and is not cached
+        def broken(*a):
+            raise RuntimeError("db gone")
+
+        monkeypatch.setattr(database, "blocking_get_latest_reputation", broken)
+        failed = await gather_node_metrics(app, "N1", 24, "performance")
+        assert failed["total_operations"] is None
+        assert ("N1", 24, "performance") not in app["node_metrics_cache"]
+
+
+@pytest.mark.asyncio
+async def test_comparison_node_expiring_after_batch_summary_gets_own_summary(monkeypatch):
+    """Test a node whose cached metrics expire after the batch summary still gets full-window data."""
+    from storj_monitor import database, server
+
+    summary_calls = []
+
+    def summary(db_path, node_names, *a):
+        summary_calls.append(list(node_names))
+        counts = {n: {"dl_success": 9, "dl_fail": 1, "total_ops": 1000} for n in node_names}
+        latency = {n: {50: 1.0, 95: 2.0, 99: 3.0} for n in node_names}
+        return counts, latency
+
+    monkeypatch.setattr(database, "blocking_get_perf_summary", summary)
+    monkeypatch.setattr(database, "blocking_get_latest_reputation", lambda *a: [])
+    monkeypatch.setattr(database, "blocking_get_events", lambda *a: [])
+
+    app = {"db_executor": None}
+    await server.calculate_comparison_metrics(app, ["A"], "performance", "24h")
+    assert ("A", 24, "performance") in app["node_metrics_cache"]
+
+    def summary_then_expire_a(db_path, node_names, *a):
+        # A's 60 s entry runs out while the batch query for the other nodes is running
+        app["node_metrics_cache"].pop(("A", 24, "performance"), None)
+        return summary(db_path, node_names, *a)
+
+    monkeypatch.setattr(database, "blocking_get_perf_summary", summary_then_expire_a)
+    result = await server.calculate_comparison_metrics(app, ["A", "B"], "performance", "24h")
+
+    # A was left out of the batch maps, so it ran its own summary instead of using the sample
+    assert summary_calls == [["A"], ["B"], ["A"]]
+    metrics_a = next(n["metrics"] for n in result["nodes"] if n["node_name"] == "A")
+    assert metrics_a["avg_latency_p95"] == 2.0
+    assert metrics_a["total_operations"] == 1000
+    assert metrics_a["success_rate_download"] == 90.0
+    assert app["node_metrics_cache"][("A", 24, "performance")]["total_operations"] == 1000
+
+
+@pytest.mark.asyncio
+async def test_comparison_cache_ttl_uses_monotonic_clock(monkeypatch):
+    """Test that cached comparisons expire on the monotonic clock, not wall time."""
+    from storj_monitor import database, server
+
+    monkeypatch.setattr(database, "blocking_get_perf_summary", lambda *a: ({}, {}))
+    monkeypatch.setattr(database, "blocking_get_latest_reputation", lambda *a: [])
+    computed = []
+
+    async def fake_gather_node_metrics(app, node_name, hours, comparison_type, **kwargs):
+        computed.append(node_name)
+        return {"total_operations": 1}
+
+    monkeypatch.setattr(server, "gather_node_metrics", fake_gather_node_metrics)
+    now = {"t": 1000.0}
+    monkeypatch.setattr(server.time, "monotonic", lambda: now["t"])
+
+    app = {"db_executor": None}
+    await server.calculate_comparison_metrics(app, ["A"], "performance", "24h")
+    now["t"] += 30  # within the 60 s single-node TTL
+    await server.calculate_comparison_metrics(app, ["A"], "performance", "24h")
+    assert computed == ["A"]
+
+    now["t"] += 60
+    await server.calculate_comparison_metrics(app, ["A"], "performance", "24h")
+    assert computed == ["A", "A"]
+
+
+def test_month_period_matches_strftime():
+    """Test that month_period formats like strftime("%Y-%m")."""
+    import datetime
+
+    from storj_monitor.server import month_period
+
+    moment = datetime.datetime(2025, 1, 31, 23, 59, tzinfo=datetime.timezone.utc)
+    assert month_period(moment) == "2025-01"
+    assert month_period() == datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m")
+
+
+def test_recent_month_periods_are_distinct_calendar_months():
+    """Test that the 12-month window neither repeats nor skips months."""
+    import datetime
+
+    from storj_monitor.server import recent_month_periods
+
+    moment = datetime.datetime(2026, 3, 31, tzinfo=datetime.timezone.utc)
+    assert recent_month_periods(12, moment) == [
+        "2026-03", "2026-02", "2026-01", "2025-12", "2025-11", "2025-10",
+        "2025-09", "2025-08", "2025-07", "2025-06", "2025-05", "2025-04",
+    ]
+    # The "previous" earnings period rolls back over the year boundary
+    january = datetime.datetime(2026, 1, 15, tzinfo=datetime.timezone.utc)
+    assert recent_month_periods(2, january) == ["2026-01", "2025-12"]
+
+
+def test_sum_earnings_by_satellite_totals_each_field():
+    """Test 12-month earnings totals per node and satellite."""
+    from storj_monitor.server import sum_earnings_by_satellite
+
+    def estimate(node, sat, base):
+        return {
+            "node_name": node,
+            "satellite": sat,
+            "period": "2025-01",
+            "total_earnings_net": base,
+            "total_earnings_gross": base * 2,
+            "held_amount": 0.5,
+            "egress_earnings_net": 1.0,
+            "storage_earnings_net": 2.0,
+            "repair_earnings_net": 0.25,
+            "audit_earnings_net": 0.0,
+        }
+
+    totals = sum_earnings_by_satellite(
+        [estimate("node1", "sat-a", 1.0), estimate("node1", "sat-a", 3.0), estimate("node2", "sat-a", 2.0)]
+    )
+
+    assert totals == {
+        ("node1", "sat-a"): [4.0, 8.0, 1.0, 2.0, 4.0, 0.5, 0.0],
+        ("node2", "sat-a"): [2.0, 4.0, 0.5, 1.0, 2.0, 0.25, 0.0],
+    }
+    assert sum_earnings_by_satellite([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_gather_payout_forecasts_once_per_node():
+    """Test that payout forecasts run concurrently, once per node."""
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock
+
+    from storj_monitor.server import gather_payout_forecasts
+
+    ok_tracker = MagicMock()
+    ok_tracker.forecast_payout = AsyncMock(return_value={"forecasted_payout": 1.5, "confidence": 0.9})
+    failing_tracker = MagicMock()
+    failing_tracker.forecast_payout = AsyncMock(side_effect=RuntimeError("db gone"))
+    app = {"financial_trackers": {"node1": ok_tracker, "node2": failing_tracker}, "db_executor": None}
+
+    forecasts = await gather_payout_forecasts(
+        app, ["node1", "node1", "node2", "node3"], "2025-01", asyncio.get_running_loop()
+    )
+
+    assert forecasts == {"node1": {"forecasted_payout": 1.5, "confidence": 0.9}, "node2": None}
+    assert ok_tracker.forecast_payout.await_count == 1
+    assert failing_tracker.forecast_payout.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_earnings_payload_coalesces_concurrent_requests(monkeypatch):
+    """Test that simultaneous identical earnings requests share one query."""
+    import asyncio
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from storj_monitor import server
+    from storj_monitor.state import BoundedTTLCache
+
+    monkeypatch.setitem(server.app_state, "earnings_cache", BoundedTTLCache(8, 60))
+    release = threading.Event()
+    calls = []
+
+    def fake_latest_earnings(db_path, node_names, period):
+        calls.append((tuple(node_names), period))
+        release.wait(5)
+        return [
+            {
+                "node_name": "node1",
+                "satellite": "sat-a",
+                "total_earnings_net": 1.234,
+                "total_earnings_gross": 2.0,
+                "held_amount": 0.5,
+                "egress_earnings_net": 1.0,
+                "storage_earnings_net": 0.2,
+                "repair_earnings_net": 0.0,
+                "audit_earnings_net": 0.034,
+            }
+        ]
+
+    monkeypatch.setattr(server.database, "blocking_get_latest_earnings", fake_latest_earnings)
+    with ThreadPoolExecutor(2) as executor:
+        app = {"db_executor": executor, "financial_trackers": {}}
+        key = ("node1", "2025-01")
+        requests = [
+            asyncio.create_task(
+                server.get_earnings_payload(app, ["node1"], ["node1"], "2025-01", "current", key)
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        payloads = await asyncio.gather(*requests)
+
+    assert calls == [(("node1",), "2025-01")]
+    assert payloads[0] is payloads[1] is payloads[2]
+    assert payloads[0]["data"][0]["total_net"] == 1.23
+    assert app["earnings_inflight"] == {}
+    # Later requests are answered from the earnings cache
+    assert await server.get_earnings_payload(app, ["node1"], ["node1"], "2025-01", "current", key) is payloads[0]
+    assert len(calls) == 1
+
+
+def test_earnings_per_tb_from_bytes():
+    """Test per-TB earnings from raw used bytes."""
+    from storj_monitor.server import BYTES_PER_TB, earnings_per_tb_from_bytes
+
+    assert earnings_per_tb_from_bytes(10.0, 2 * BYTES_PER_TB) == 5.0
+    assert earnings_per_tb_from_bytes(10.0, 0) is None
+    assert earnings_per_tb_from_bytes(None, BYTES_PER_TB) is None
+    assert earnings_per_tb_from_bytes(0, BYTES_PER_TB) is None
+
+
+@pytest.mark.asyncio
+async def test_gather_node_metrics_single_flight(monkeypatch):
+    """Test that concurrent callers for the same node share one computation."""
+    import asyncio
+
+    from storj_monitor import database
+    from storj_monitor.server import gather_node_metrics
+
+    calls = {"summary": 0}
+
+    def summary(*a):
+        calls["summary"] += 1
+        return {"N1": {"dl_success": 1, "dl_fail": 0, "total_ops": 1}}, {}
+
+    monkeypatch.setattr(database, "blocking_get_perf_summary", summary)
+    monkeypatch.setattr(database, "blocking_get_latest_reputation", lambda *a: [])
+
+    app = {"db_executor": None}
+    first, second = await asyncio.gather(
+        gather_node_metrics(app, "N1", 24, "performance"),
+        gather_node_metrics(app, "N1", 24, "performance"),
+    )
+
+    assert calls["summary"] == 1
+    assert first == second and first is not second
+    assert app["metrics_inflight"] == {}
+
+    # A cancelled caller doesn't abort the shared work for the others
+    app["node_metrics_cache"].clear()
+    waiter = asyncio.ensure_future(gather_node_metrics(app, "N1", 24, "performance"))
+    other = asyncio.ensure_future(gather_node_metrics(app, "N1", 24, "performance"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    assert (await other)["total_operations"] == 1
+    assert calls["summary"] == 2
+
+
+@pytest.mark.asyncio
+async def test_gather_node_metrics_shares_earnings_totals_across_time_ranges(monkeypatch):
+    """Test that earnings totals are memoized per (node, period) until new estimates arrive."""
+    from storj_monitor import database
+    from storj_monitor.server import gather_node_metrics
+    from storj_monitor.state import app_state
+
+    calls = {"earnings": 0}
+
+    def earnings(*a):
+        calls["earnings"] += 1
+        return [{"total_earnings_net": 2.0}, {"total_earnings_net": 1.5}]
+
+    monkeypatch.setattr(database, "blocking_get_perf_summary", lambda *a: ({}, {}))
+    monkeypatch.setattr(database, "blocking_get_latest_earnings", earnings)
+    monkeypatch.setattr(database, "blocking_get_latest_reputation", lambda *a: [])
+    monkeypatch.setitem(app_state, "earnings_generation", 0)
+
+    app = {"db_executor": None}
+    day = await gather_node_metrics(app, "N1", 24, "earnings", period="2025-01")
+    week = await gather_node_metrics(app, "N1", 24 * 7, "earnings", period="2025-01")
+    assert day["total_earnings"] == week["total_earnings"] == 3.5
+    assert calls["earnings"] == 1
+
+    # Newly published estimates invalidate the memoized totals
+    app_state["earnings_generation"] += 1
+    await gather_node_metrics(app, "N1", 24 * 30, "earnings", period="2025-01")
+    assert calls["earnings"] == 2
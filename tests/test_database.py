@@ -159,6 +159,126 @@ def test_batch_write_events(temp_db, sample_event):
     conn.close()
 
 
+def test_get_event_counts_batch_keys_rows_by_node(temp_db, sample_event):
+    """Test that batch event counts cover several nodes in one call."""
+    from storj_monitor.database import blocking_db_batch_write, blocking_get_event_counts_batch
+
+    other = dict(sample_event, node_name="other-node", action="PUT", status="failed")
+    blocking_db_batch_write(temp_db, [sample_event, sample_event.copy(), other])
+
+    counts = blocking_get_event_counts_batch(temp_db, ["test-node", "other-node", "idle-node"], 24)
+
+    assert set(counts) == {"test-node", "other-node"}
+    assert counts["test-node"]["dl_success"] == 2
+    assert counts["other-node"]["ul_fail"] == 1
+    assert counts["other-node"]["total_ops"] == 1
+
+
+def test_get_latency_percentiles_batch_matches_python(temp_db, sample_event):
+    """Test that SQL-side nearest-rank percentiles match the in-Python computation."""
+    from storj_monitor.database import (
+        blocking_db_batch_write,
+        blocking_get_latency_percentiles_batch,
+    )
+    from storj_monitor.server import calculate_percentiles
+
+    durations = [(i * 37) % 101 + 1 for i in range(40)]
+    events = [dict(sample_event, duration_ms=d) for d in durations]
+    events.append(dict(sample_event, duration_ms=None))
+    events.append(dict(sample_event, node_name="other-node", duration_ms=7))
+    blocking_db_batch_write(temp_db, events)
+
+    result = blocking_get_latency_percentiles_batch(
+        temp_db, ["test-node", "other-node", "idle-node"], 24, (25, 50, 95, 99)
+    )
+
+    assert set(result) == {"test-node", "other-node"}
+    assert result["test-node"] == calculate_percentiles(durations, (25, 50, 95, 99))
+    assert result["other-node"] == {25: 7.0, 50: 7.0, 95: 7.0, 99: 7.0}
+
+
+def test_get_latency_percentiles_batch_ranks_only_recent_sample(temp_db, sample_event, monkeypatch):
+    """Test percentiles use each node's most recent sample_limit events when the window holds more."""
+    from storj_monitor import database
+    from storj_monitor.server import calculate_percentiles
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    # 30 events, oldest first; the 10 newest are the slow ones
+    durations = [1 + i for i in range(20)] + [1000 + i * 10 for i in range(10)]
+    events = [
+        dict(sample_event, timestamp=now - datetime.timedelta(minutes=30 - i), duration_ms=d)
+        for i, d in enumerate(durations)
+    ]
+    events.append(dict(sample_event, node_name="other-node", duration_ms=7))
+    database.blocking_db_batch_write(temp_db, events)
+
+    result = database.blocking_get_latency_percentiles_batch(
+        temp_db, ["test-node", "other-node"], 24, (50, 95), sample_limit=10
+    )
+    assert result["test-node"] == calculate_percentiles(durations[-10:], (50, 95))
+    assert result["other-node"] == {50: 7.0, 95: 7.0}
+
+    # The older-SQLite fallback ranks the same sample
+    monkeypatch.setattr(database, "SQLITE_HAS_WINDOW_FUNCTIONS", False)
+    assert database.blocking_get_latency_percentiles_batch(
+        temp_db, ["test-node"], 24, (50, 95), sample_limit=10
+    ) == {"test-node": result["test-node"]}
+
+
+def test_get_duration_ms_sample_and_window_function_fallback(temp_db, sample_event, monkeypatch):
+    """Test compact duration samples and the percentile path for SQLite without window functions."""
+    from array import array
+
+    from storj_monitor import database
+
+    durations = [5, 0, 30, 10, 20]
+    events = [dict(sample_event, duration_ms=d) for d in durations]
+    database.blocking_db_batch_write(temp_db, events)
+
+    samples = database.blocking_get_duration_ms_sample(temp_db, ["test-node", "idle-node"], 24)
+    assert set(samples) == {"test-node"}
+    assert isinstance(samples["test-node"], array)
+    assert sorted(samples["test-node"]) == [5.0, 10.0, 20.0, 30.0]
+
+    expected = database.blocking_get_latency_percentiles_batch(temp_db, ["test-node"], 24)
+    monkeypatch.setattr(database, "SQLITE_HAS_WINDOW_FUNCTIONS", False)
+    assert database.blocking_get_latency_percentiles_batch(temp_db, ["test-node"], 24) == expected
+
+
+def test_get_perf_summary_combines_counts_and_latency(temp_db, sample_event):
+    """Test that the perf summary returns both batch results in one call."""
+    from storj_monitor import database
+
+    events = [dict(sample_event, duration_ms=d) for d in (10, 20, 30)]
+    database.blocking_db_batch_write(temp_db, events)
+
+    counts, latency = database.blocking_get_perf_summary(temp_db, ["test-node"], 24)
+
+    assert counts == database.blocking_get_event_counts_batch(temp_db, ["test-node"], 24)
+    assert latency == database.blocking_get_latency_percentiles_batch(temp_db, ["test-node"], 24)
+    assert latency["test-node"][50] == 20.0
+
+
+def test_get_perf_summary_limits_latency_to_recent_sample(temp_db, sample_event):
+    """Test the comparison summary ranks only the sampled events when the window holds more."""
+    from storj_monitor import database
+    from storj_monitor.server import calculate_percentiles
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    durations = [5] * 40 + [100 + i for i in range(8)]
+    events = [
+        dict(sample_event, timestamp=now - datetime.timedelta(minutes=60 - i), duration_ms=d)
+        for i, d in enumerate(durations)
+    ]
+    database.blocking_db_batch_write(temp_db, events)
+
+    counts, latency = database.blocking_get_perf_summary(temp_db, ["test-node"], 24, (50, 99), 8)
+
+    # Counts cover the whole window; latency only the 8 newest events
+    assert counts["test-node"]["total_ops"] == len(durations)
+    assert latency == {"test-node": calculate_percentiles(durations[-8:], (50, 99))}
+
+
 def test_batch_write_empty_events(temp_db):
     """Test batch writing with empty list."""
     from storj_monitor.database import blocking_db_batch_write
@@ -238,6 +358,48 @@ def test_write_and_retrieve_storage_snapshot(temp_db, sample_storage_snapshot):
     assert len(history) > 0
 
 
+def test_storage_regression_sums_per_window(temp_db, sample_storage_snapshot):
+    """Test regression sums skip log-based snapshots and cover each trailing window."""
+    from storj_monitor.database import (
+        blocking_get_storage_regression_sums,
+        blocking_write_storage_snapshot,
+    )
+    from storj_monitor.storage_tracker import _growth_slope
+
+    now = sample_storage_snapshot["timestamp"]
+    for i in range(10):
+        snapshot = dict(sample_storage_snapshot, used_bytes=5000000000 - i * 100000000)
+        snapshot["timestamp"] = now - datetime.timedelta(days=i, minutes=1)
+        assert blocking_write_storage_snapshot(temp_db, snapshot) is True
+    log_based = dict(sample_storage_snapshot, used_bytes=None)
+    assert blocking_write_storage_snapshot(temp_db, log_based) is True
+
+    sums = blocking_get_storage_regression_sums(temp_db, "test-node", [1, 7, 30])
+
+    assert [sums[days][0] for days in (1, 7, 30)] == [1, 7, 10]
+    assert _growth_slope(*sums[1]) is None
+    assert round(_growth_slope(*sums[7])) == 100000000
+    assert round(_growth_slope(*sums[30])) == 100000000
+    assert blocking_get_storage_regression_sums(temp_db, "other-node", [30])[30][0] == 0
+
+
+def test_write_storage_snapshots_in_one_batch(temp_db, sample_storage_snapshot):
+    """Test several storage snapshots are written together."""
+    from storj_monitor.database import (
+        blocking_get_storage_history,
+        blocking_write_storage_snapshots,
+    )
+
+    log_based = dict(sample_storage_snapshot, used_bytes=None, source="logs")
+    log_based["timestamp"] = sample_storage_snapshot["timestamp"] - datetime.timedelta(hours=1)
+
+    assert blocking_write_storage_snapshots(temp_db, [log_based, sample_storage_snapshot]) is True
+    assert blocking_write_storage_snapshots(temp_db, []) is False
+
+    history = blocking_get_storage_history(temp_db, "test-node", days=7)
+    assert [row["used_bytes"] for row in history] == [None, 5000000000]
+
+
 def test_storage_snapshot_with_partial_data(temp_db):
     """Test storage snapshot with partial data (from logs)."""
     from storj_monitor.database import blocking_write_storage_snapshot
@@ -388,6 +550,31 @@ def test_write_and_retrieve_earnings_estimate(temp_db, sample_earnings_estimate)
     assert latest[0]["node_name"] == "test-node"
 
 
+def test_dashboard_reads_reuse_thread_connection(temp_db, sample_earnings_estimate, monkeypatch):
+    """Repeated websocket read queries share one connection per executor thread."""
+    from storj_monitor import db_utils
+    from storj_monitor.database import (
+        blocking_get_latest_earnings,
+        blocking_get_storage_history,
+        blocking_write_earnings_estimate,
+    )
+
+    blocking_write_earnings_estimate(temp_db, sample_earnings_estimate)
+    opened = []
+    real_connect = db_utils.get_optimized_connection
+
+    def counting_connect(*args, **kwargs):
+        opened.append(kwargs.get("read_only"))
+        return real_connect(*args, **kwargs)
+
+    monkeypatch.setattr(db_utils, "get_optimized_connection", counting_connect)
+    for _ in range(3):
+        assert blocking_get_latest_earnings(temp_db, ["test-node"], period="2025-01")
+        assert blocking_get_storage_history(temp_db, "test-node", 7) == []
+
+    assert opened == [True]
+
+
 def test_earnings_deduplication(temp_db, sample_earnings_estimate):
     """Test that duplicate earnings estimates are deduplicated."""
     from storj_monitor.database import (
@@ -19,6 +19,7 @@ from storj_monitor.db_utils import (
     init_connection_pool,
     retry_on_db_lock,
     return_pooled_connection,
+    reused_read_connection,
 )
 
 
@@ -605,4 +606,60 @@ class TestRetryDecorator:
         for i in range(1, len(delays)):
             delay = delays[i] - delays[i - 1]
             # Should not exceed max_delay + some tolerance for execution time
-            assert delay < 2.5
\ No newline at end of file
+            assert delay < 2.5
+
+class TestReusedReadConnection:
+    """Test suite for the per-thread reused read-only connection."""
+
+    def test_same_thread_reuses_connection(self, temp_db):
+        """Test that one thread gets the same connection with a fresh row_factory."""
+        with reused_read_connection(temp_db) as first:
+            first.row_factory = sqlite3.Row
+        with reused_read_connection(temp_db) as second:
+            assert second is first
+            assert second.row_factory is None
+            assert second.execute("SELECT 1").fetchone() == (1,)
+
+    def test_other_thread_gets_its_own_connection(self, temp_db):
+        """Test that connections are never shared across threads."""
+        import threading
+
+        with reused_read_connection(temp_db) as main_conn:
+            pass
+        seen = []
+
+        def worker():
+            with reused_read_connection(temp_db) as conn:
+                seen.append(conn)
+                conn.execute("SELECT 1").fetchone()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        assert seen and seen[0] is not main_conn
+
+    def test_replaced_database_file_opens_new_connection(self, temp_db):
+        """Test that a database file replaced on disk is not served from a stale connection."""
+        import os
+
+        with reused_read_connection(temp_db) as first:
+            pass
+        replacement = temp_db + ".new"
+        conn = sqlite3.connect(replacement)
+        conn.execute("CREATE TABLE marker (id INTEGER)")
+        conn.commit()
+        conn.close()
+        os.replace(replacement, temp_db)
+
+        with reused_read_connection(temp_db) as second:
+            assert second is not first
+            assert second.execute("SELECT name FROM sqlite_master").fetchall() == [("marker",)]
+
+    def test_database_error_discards_connection(self, temp_db):
+        """Test that a connection is dropped after a database error."""
+        with pytest.raises(sqlite3.OperationalError):
+            with reused_read_connection(temp_db) as first:
+                first.execute("SELECT * FROM missing_table")
+        with reused_read_connection(temp_db) as second:
+            assert second is not first
@@ -1,5 +1,6 @@
 import asyncio
 import time
+from collections import deque
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -56,7 +57,7 @@ async def test_log_processor_task_consumes_fixture_lines(monkeypatch):
         "has_new_events": False,
     }
     app_state["db_write_queue"] = asyncio.Queue()
-    app_state["websocket_event_queue"] = []
+    app_state["websocket_event_queue"] = deque()
     app_state["websocket_queue_lock"] = asyncio.Lock()
     app_state["websockets"] = {}
 
@@ -91,6 +92,9 @@ async def test_log_processor_task_consumes_fixture_lines(monkeypatch):
         await asyncio.sleep(0.05)
         # We should have at least one live event appended
         assert app_state["nodes"][node_name]["live_events"], "Expected events to be processed"
+        # Each live event carries the node's next sequence number
+        seqs = [e["seq"] for e in app_state["nodes"][node_name]["live_events"]]
+        assert seqs == list(range(1, len(seqs) + 1))
     finally:
         task.cancel()
         import contextlib
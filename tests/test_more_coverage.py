@@ -8,10 +8,10 @@ from storj_monitor.reputation_tracker import track_reputation
 
 
 class BoomWS:
-    """WebSocket stub that raises a generic exception on send_json to hit unexpected exception path."""
+    """WebSocket stub that raises a generic exception on send to hit unexpected exception path."""
     closed = False
 
-    async def send_json(self, payload):
+    async def send_frame(self, data, opcode):
         raise ValueError("unexpected send failure")
 
 
@@ -57,4 +57,123 @@ async def test_track_reputation_invalid_format_returns_none():
 
     app = {"db_executor": object()}
     result = await track_reputation(app, "node-y", DummyAPI())
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+def test_active_compactions_payload_rebuilt_only_after_generation_bump(monkeypatch):
+    import datetime
+
+    from storj_monitor import server
+    from storj_monitor.state import app_state
+
+    started = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    compactions = {"sat1:s0": started}
+    monkeypatch.setitem(app_state, "nodes", {"node-a": {"active_compactions": compactions}})
+    monkeypatch.setitem(app_state, "active_compactions_generation", 0)
+
+    first = server.get_active_compactions_payload()
+    assert first["compactions"] == [
+        {"node_name": "node-a", "satellite": "sat1", "store": "s0", "start_iso": started.isoformat()}
+    ]
+    assert server.get_active_compactions_payload() is first
+
+    compactions.pop("sat1:s0")
+    app_state["active_compactions_generation"] += 1
+    assert server.get_active_compactions_payload()["compactions"] == []
+
+
+@pytest.mark.asyncio
+async def test_handle_index_serves_prerendered_body():
+    from aiohttp import web
+    from aiohttp.test_utils import make_mocked_request
+
+    from storj_monitor import server
+
+    body = server.render_index_html()
+    assert f"/static/js/app.js?v={server.STATIC_VERSION}".encode() in body
+
+    app = web.Application()
+    app["index_body"] = b"<html>cached</html>"
+    resp = await server.handle_index(make_mocked_request("GET", "/", app=app))
+
+    assert resp.body == b"<html>cached</html>"
+    assert resp.content_type == "text/html"
+    assert resp.charset == "utf-8"
+
+
+@pytest.mark.asyncio
+async def test_ws_message_handlers_dispatch_by_type(monkeypatch):
+    from storj_monitor import server
+
+    assert all(asyncio.iscoroutinefunction(h) for h in server.WS_MESSAGE_HANDLERS.values())
+    assert server.WS_MESSAGE_HANDLERS["get_comparison_data"] is server._handle_get_comparison_data
+
+    sent = []
+
+    async def fake_send(ws, payload):
+        sent.append(payload)
+        return True
+
+    monkeypatch.setattr(server, "safe_send_json", fake_send)
+    await server.WS_MESSAGE_HANDLERS["get_alert_summary"]({}, object(), {"type": "get_alert_summary"})
+    await server.WS_MESSAGE_HANDLERS["get_storage_history"]({}, object(), {"type": "get_storage_history"})
+
+    assert sent == [
+        {"type": "alert_summary", "data": {"critical": 0, "warning": 0, "info": 0, "total": 0}},
+        {"type": "error", "message": "node_name required"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_earnings_history_requests_import_once(monkeypatch):
+    from storj_monitor import database, server
+    from storj_monitor.financial_tracker import FinancialTracker
+
+    tracker = FinancialTracker("node1")
+    imports = []
+
+    async def fake_import(db_path, loop, executor=None):
+        imports.append(db_path)
+        await asyncio.sleep(0)
+
+    async def fake_send(ws, payload):
+        return True
+
+    monkeypatch.setattr(tracker, "import_historical_payouts", fake_import)
+    monkeypatch.setattr(database, "blocking_get_earnings_estimates", lambda *a: [])
+    monkeypatch.setattr(server, "safe_send_json", fake_send)
+
+    app = {"financial_trackers": {"node1": tracker}, "db_executor": None}
+    request = {"type": "get_earnings_history", "node_name": "node1"}
+    await asyncio.gather(
+        server._handle_get_earnings_history(app, object(), request),
+        server._handle_get_earnings_history(app, object(), request),
+    )
+
+    assert len(imports) == 1
+    assert tracker._historical_imported is True
+
+
+@pytest.mark.asyncio
+async def test_long_earnings_history_is_streamed_in_chunks(monkeypatch):
+    from storj_monitor import database, server
+
+    history = [{"period": f"2025-{i:03d}", "total_earnings_net": i} for i in range(120)]
+    sent = []
+
+    async def fake_send(ws, payload):
+        sent.append(payload)
+        return True
+
+    monkeypatch.setattr(server, "EARNINGS_HISTORY_CHUNK_SIZE", 50)
+    monkeypatch.setattr(database, "blocking_get_earnings_estimates", lambda *a: history)
+    monkeypatch.setattr(server, "safe_send_json", fake_send)
+
+    app = {"financial_trackers": {}, "db_executor": None}
+    await server._handle_get_earnings_history(
+        app, object(), {"type": "get_earnings_history", "node_name": "node1", "days": 365}
+    )
+
+    assert [m["type"] for m in sent] == ["earnings_history_chunk"] * 3 + ["earnings_history_end"]
+    assert [m["seq"] for m in sent[:3]] == [0, 1, 2]
+    assert [r for m in sent[:3] for r in m["data"]] == history
+    assert sent[-1] == {"type": "earnings_history_end", "node_name": "node1", "chunks": 3, "count": 120}
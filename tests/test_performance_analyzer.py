@@ -385,7 +385,11 @@ class TestBlockingGetLatencyHistogram:
         """Test histogram with empty node list."""
         result = blocking_get_latency_histogram("test.db", [], hours=1)
 
-        assert result == []
+        assert result == {"bucket_size_ms": 100, "bucket_start_ms": [], "count": []}
+
+    def test_get_latency_histogram_retries_on_db_lock(self):
+        """Test the histogram query keeps its database lock retry."""
+        assert hasattr(blocking_get_latency_histogram, "__wrapped__")
 
     @patch("storj_monitor.performance_analyzer.get_optimized_connection")
     def test_get_latency_histogram_success(self, mock_conn):
@@ -407,14 +411,14 @@ class TestBlockingGetLatencyHistogram:
 
         result = blocking_get_latency_histogram("test.db", ["node1"], hours=1, bucket_size_ms=100)
 
-        assert len(result) == 3
-        assert result[0]["bucket_start_ms"] == 0
-        assert result[0]["bucket_end_ms"] == 100
-        assert result[0]["count"] == 10
+        assert result == {"bucket_size_ms": 100, "bucket_start_ms": [0, 100, 200], "count": [10, 5, 2]}
 
     @patch("storj_monitor.performance_analyzer.get_optimized_connection")
-    def test_get_latency_histogram_labels(self, mock_conn):
-        """Test histogram bucket labels."""
+    def test_get_latency_histogram_columns(self, mock_conn):
+        """Test that bucket starts and counts are returned as parallel columns."""
+        from storj_monitor.performance_analyzer import _latency_histogram_cache
+
+        _latency_histogram_cache.clear()
         mock_cursor = MagicMock()
         mock_cursor.__iter__ = MagicMock(
             return_value=iter(
@@ -431,8 +435,9 @@ class TestBlockingGetLatencyHistogram:
 
         result = blocking_get_latency_histogram("test.db", ["node1"], hours=1, bucket_size_ms=100)
 
-        assert result[0]["label"] == "0-100ms"
-        assert result[1]["label"] == "100-200ms"
+        assert result["bucket_start_ms"] == [0, 100]
+        assert result["count"] == [10, 5]
+        assert "label" not in result
 
     @patch("storj_monitor.performance_analyzer.get_optimized_connection")
     def test_get_latency_histogram_caching(self, mock_conn):
@@ -477,9 +482,8 @@ class TestBlockingGetLatencyHistogram:
 
         result = blocking_get_latency_histogram("test.db", ["node1"], hours=1, bucket_size_ms=500)
 
-        assert result[0]["bucket_end_ms"] == 500
-        assert result[1]["bucket_start_ms"] == 500
-        assert result[1]["bucket_end_ms"] == 1000
+        assert result["bucket_size_ms"] == 500
+        assert result["bucket_start_ms"] == [0, 500]
 
     @patch("storj_monitor.performance_analyzer.get_optimized_connection")
     def test_get_latency_histogram_exception(self, mock_conn):
@@ -488,4 +492,4 @@ class TestBlockingGetLatencyHistogram:
 
         result = blocking_get_latency_histogram("test.db", ["node1"], hours=1)
 
-        assert result == []
+        assert result == {"bucket_size_ms": 100, "bucket_start_ms": [], "count": []}
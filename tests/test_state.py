@@ -129,6 +129,40 @@ class TestAddEventDownload:
         assert len(stats.error_agg) > 0
 
 
+class TestAddEvents:
+    """Test suite for batched add_events."""
+
+    def test_add_events_matches_individual_add_event(self):
+        """Test that a batch produces the same stats as adding events one by one."""
+        TOKEN_REGEX = re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}(?::\d+)?\b|\b\d+\b")
+        events = [
+            {
+                "category": category,
+                "status": status,
+                "satellite_id": "test-sat",
+                "size": 2048,
+                "piece_id": f"piece-{i}",
+                "location": {"country": "DE"},
+                "error_reason": None if status == "success" else "piece not found",
+            }
+            for i, (category, status) in enumerate(
+                [("get", "success"), ("put", "failed"), ("audit", "success"), ("get_repair", "success")]
+            )
+        ]
+
+        batched = IncrementalStats()
+        batched.add_events(events, TOKEN_REGEX)
+
+        single = IncrementalStats()
+        for event in events:
+            single.add_event(event, TOKEN_REGEX)
+
+        assert batched == single
+        assert batched.dl_success == 1
+        assert batched.ul_fail == 1
+        assert batched.audit_success == 1
+
+
 class TestAddEventUpload:
     """Test suite for add_event with upload events."""
 
@@ -436,6 +470,29 @@ class TestUpdateLiveStats:
 
         assert stats.live_dl_bytes == 0
 
+    def test_live_window_adds_new_and_expires_old_transfers(self):
+        """Test the live window is maintained by delta instead of a rescan."""
+        stats = IncrementalStats()
+        now = 1_000_000.0
+
+        stats.add_live_events(
+            [
+                {"ts_unix": now - 50, "status": "success", "category": "get", "size": 100},
+                {"ts_unix": now - 10, "status": "success", "category": "put", "size": 200},
+                {"ts_unix": now - 5, "status": "failed", "category": "get", "size": 999},
+            ],
+            now=now,
+        )
+        assert (stats.live_dl_bytes, stats.live_ul_bytes) == (100, 200)
+
+        # Twenty seconds later only the GET has left the window
+        stats.expire_live_stats(now=now + 20)
+        assert (stats.live_dl_bytes, stats.live_ul_bytes) == (0, 200)
+
+        stats.expire_live_stats(now=now + 60)
+        assert (stats.live_dl_bytes, stats.live_ul_bytes) == (0, 0)
+        assert stats.live_window == []
+
 
 class TestToPayload:
     """Test suite for to_payload method."""
@@ -858,3 +915,88 @@ class TestIncrementalStatsIntegration:
         assert elapsed < 1.0  # Should be fast
         assert payload["type"] == "stats_update"
         assert len(payload["satellites"]) == 5
+
+
+class TestBoundedTTLCache:
+    """Test suite for the bounded per-view stats cache."""
+
+    def test_evicts_least_recently_used_beyond_maxsize(self):
+        from storj_monitor.state import BoundedTTLCache
+
+        cache = BoundedTTLCache(maxsize=2, ttl=60)
+        cache[("a",)] = 1
+        cache[("b",)] = 2
+        assert cache.get(("a",)) == 1  # touch "a" so "b" becomes the oldest
+        cache[("c",)] = 3
+
+        assert len(cache) == 2
+        assert ("b",) not in cache
+        assert cache[("a",)] == 1
+        assert cache[("c",)] == 3
+
+    def test_expired_entries_are_dropped(self, monkeypatch):
+        from storj_monitor import state
+        from storj_monitor.state import BoundedTTLCache
+
+        now = [1000.0]
+        monkeypatch.setattr(state.time, "monotonic", lambda: now[0])
+
+        cache = BoundedTTLCache(maxsize=4, ttl=10)
+        cache[("Aggregate",)] = {"type": "stats_update"}
+        now[0] += 11
+
+        assert cache.get(("Aggregate",)) is None
+        assert ("Aggregate",) not in cache
+        assert len(cache) == 0
+        with pytest.raises(KeyError):
+            cache[("Aggregate",)]
+
+    def test_app_state_stats_cache_is_bounded(self):
+        from storj_monitor.config import STATS_CACHE_MAX_VIEWS
+        from storj_monitor.state import BoundedTTLCache
+
+        assert isinstance(app_state["stats_cache"], BoundedTTLCache)
+        assert app_state["stats_cache"].maxsize == STATS_CACHE_MAX_VIEWS
+
+    def test_app_state_earnings_cache_is_bounded(self, monkeypatch):
+        from storj_monitor import state
+        from storj_monitor.config import EARNINGS_CACHE_MAX_ENTRIES
+        from storj_monitor.state import BoundedTTLCache
+
+        assert isinstance(app_state["earnings_cache"], BoundedTTLCache)
+        assert app_state["earnings_cache"].maxsize == EARNINGS_CACHE_MAX_ENTRIES
+
+        now = [1000.0]
+        monkeypatch.setattr(state.time, "monotonic", lambda: now[0])
+        cache = BoundedTTLCache(maxsize=4, ttl=10)
+        cache[("Aggregate", "2025-01")] = {"type": "earnings_data"}
+        now[0] += 5
+        cache[("node1", "2025-01")] = {"type": "earnings_data"}
+        assert cache.keys() == [("Aggregate", "2025-01"), ("node1", "2025-01")]
+        now[0] += 6
+        assert cache.keys() == [("node1", "2025-01")]
+
+    def test_payload_cache_reuses_encoding_until_payload_changes(self):
+        from storj_monitor.state import PayloadCache
+
+        encoded = []
+
+        def encode(payload):
+            encoded.append(payload)
+            return repr(payload).encode()
+
+        cache = PayloadCache(maxsize=2, ttl=60)
+        assert cache.get_encoded("Aggregate", encode) is None
+
+        cache["Aggregate"] = {"total": 1}
+        first = cache.get_encoded("Aggregate", encode)
+        assert cache.get_encoded("Aggregate", encode) is first
+        assert len(encoded) == 1
+
+        # A replaced payload is encoded afresh
+        cache["Aggregate"] = {"total": 2}
+        assert cache.get_encoded("Aggregate", encode) == b"{'total': 2}"
+        assert len(encoded) == 2
+
+        cache.pop("Aggregate")
+        assert cache.get_encoded("Aggregate", encode) is None
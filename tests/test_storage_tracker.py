@@ -50,6 +50,8 @@ class TestTrackStorage:
         assert result["snapshot"]["used_bytes"] == 5368709120
         assert result["snapshot"]["trash_bytes"] == 104857600
         assert len(result["alerts"]) == 0
+        # Storage only needs the dashboard; no per-satellite round trip
+        api_client.get_satellites.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_track_storage_no_dashboard_data(self):
@@ -297,6 +299,30 @@ class TestTrackStorage:
         assert result is None
 
 
+def _regression_sums(history, windows=(1, 7, 30)):
+    """Build the per-window regression sums the database returns for a history."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    points = [
+        ((datetime.datetime.fromisoformat(h["timestamp"]) - now).total_seconds() / 86400, h["used_bytes"])
+        for h in history
+        if h["used_bytes"] is not None
+    ]
+    sums = {}
+    for days in windows:
+        xs = [x for x, _y in points if x >= -days]
+        ys = [y for x, y in points if x >= -days]
+        sums[days] = (
+            len(xs),
+            sum(xs),
+            sum(ys),
+            sum(x * y for x, y in zip(xs, ys)),
+            sum(x * x for x in xs),
+            min(xs, default=None),
+            max(xs, default=None),
+        )
+    return sums
+
+
 class TestCalculateStorageForecast:
     """Test suite for calculate_storage_forecast function."""
 
@@ -307,7 +333,7 @@ class TestCalculateStorageForecast:
         node_name = "Test-Node"
 
         with patch("asyncio.get_running_loop") as mock_loop:
-            mock_loop.return_value.run_in_executor = AsyncMock(return_value=[])
+            mock_loop.return_value.run_in_executor = AsyncMock(return_value={})
             result = await calculate_storage_forecast(app, node_name, 1000000000)
 
         assert result is None
@@ -332,7 +358,7 @@ class TestCalculateStorageForecast:
         ]
 
         with patch("asyncio.get_running_loop") as mock_loop:
-            mock_loop.return_value.run_in_executor = AsyncMock(return_value=history)
+            mock_loop.return_value.run_in_executor = AsyncMock(return_value=_regression_sums(history))
             result = await calculate_storage_forecast(app, node_name, 1000000000)
 
         assert result is None
@@ -358,7 +384,7 @@ class TestCalculateStorageForecast:
         current_available = 5000000000  # 5 GB free
 
         with patch("asyncio.get_running_loop") as mock_loop:
-            mock_loop.return_value.run_in_executor = AsyncMock(return_value=history)
+            mock_loop.return_value.run_in_executor = AsyncMock(return_value=_regression_sums(history))
             result = await calculate_storage_forecast(app, node_name, current_available)
 
         assert result is not None
@@ -388,7 +414,7 @@ class TestCalculateStorageForecast:
         current_available = 5000000000
 
         with patch("asyncio.get_running_loop") as mock_loop:
-            mock_loop.return_value.run_in_executor = AsyncMock(return_value=history)
+            mock_loop.return_value.run_in_executor = AsyncMock(return_value=_regression_sums(history))
             result = await calculate_storage_forecast(app, node_name, current_available)
 
         assert result is not None
@@ -417,7 +443,7 @@ class TestCalculateStorageForecast:
         current_available = 5000000000
 
         with patch("asyncio.get_running_loop") as mock_loop:
-            mock_loop.return_value.run_in_executor = AsyncMock(return_value=history)
+            mock_loop.return_value.run_in_executor = AsyncMock(return_value=_regression_sums(history))
             result = await calculate_storage_forecast(app, node_name, current_available)
 
         assert result is not None
@@ -447,7 +473,7 @@ class TestCalculateStorageForecast:
         current_available = 5000000000
 
         with patch("asyncio.get_running_loop") as mock_loop:
-            mock_loop.return_value.run_in_executor = AsyncMock(return_value=history)
+            mock_loop.return_value.run_in_executor = AsyncMock(return_value=_regression_sums(history))
             result = await calculate_storage_forecast(app, node_name, current_available)
 
         assert result is not None
@@ -471,6 +497,79 @@ class TestCalculateStorageForecast:
 
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_calculate_forecast_exact_growth_rate_per_window(self):
+        """Test each window's growth rate is the least-squares slope of its points."""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        history = [
+            {
+                "timestamp": (now - datetime.timedelta(days=i, minutes=1)).isoformat(),
+                "used_bytes": 5_000_000_000_000 - i * 200_000_000,
+            }
+            for i in range(10)
+        ]
+
+        with patch("asyncio.get_running_loop") as mock_loop:
+            mock_loop.return_value.run_in_executor = AsyncMock(return_value=_regression_sums(history))
+            result = await calculate_storage_forecast({"db_executor": Mock()}, "n", 2_000_000_000)
+
+        assert result["growth_rates"]["1d"]["growth_rate_bytes_per_day"] is None
+        assert result["growth_rates"]["1d"]["data_points"] == 1
+        assert result["growth_rates"]["7d"]["growth_rate_bytes_per_day"] == 200_000_000
+        assert result["growth_rates"]["7d"]["data_points"] == 7
+        assert result["growth_rates"]["30d"]["growth_rate_bytes_per_day"] == 200_000_000
+        assert result["days_until_full"] == 10.0
+
+
+class TestStoragePollingTask:
+    """Test suite for storage_polling_task."""
+
+    @pytest.mark.asyncio
+    async def test_polling_task_polls_nodes_concurrently(self, monkeypatch):
+        """Test all available nodes are polled at the same time and alerts are broadcast."""
+        import asyncio
+
+        from storj_monitor import storage_tracker, websocket_utils
+
+        in_flight = []
+        all_started = asyncio.Event()
+
+        async def fake_track_storage(app, node_name, api_client):
+            in_flight.append(node_name)
+            if len(in_flight) == 2:
+                all_started.set()
+            # Polled serially, the first node would wait here forever
+            await asyncio.wait_for(all_started.wait(), timeout=1)
+            return {"alerts": [{"severity": "warning"}] if node_name == "node-a" else []}
+
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) > 1:
+                raise asyncio.CancelledError
+
+        broadcasts = []
+
+        async def fake_broadcast(websockets, payload, node_name=None):
+            broadcasts.append(payload)
+
+        monkeypatch.setattr(storage_tracker, "track_storage", fake_track_storage)
+        monkeypatch.setattr(storage_tracker.asyncio, "sleep", fake_sleep)
+        monkeypatch.setattr(websocket_utils, "robust_broadcast", fake_broadcast)
+
+        clients = {
+            "node-a": Mock(is_available=True),
+            "node-b": Mock(is_available=True),
+            "node-c": Mock(is_available=False),
+        }
+        await storage_tracker.storage_polling_task({"api_clients": clients})
+
+        assert sorted(in_flight) == ["node-a", "node-b"]
+        assert broadcasts == [
+            {"type": "storage_alerts", "node_name": "node-a", "alerts": [{"severity": "warning"}]}
+        ]
+
 
 class TestFormatBytes:
     """Test suite for _format_bytes helper function."""
@@ -512,3 +611,10 @@ class TestFormatBytes:
         """Test formatting with decimal values."""
         assert _format_bytes(1536) == "1.50 KB"  # 1.5 KB
         assert _format_bytes(2621440) == "2.50 MB"  # 2.5 MB
+
+    def test_format_bytes_unit_boundaries_and_negative(self):
+        """Test values just below a unit boundary and negative (over-allocated) free space."""
+        assert _format_bytes(1023) == "1023.00 B"
+        assert _format_bytes(1048575) == "1024.00 KB"
+        assert _format_bytes(1024**6) == "1024.00 PB"
+        assert _format_bytes(-1073741824) == "-1.00 GB"
@@ -152,6 +152,24 @@ class TestStorjNodeAPIClient:
         assert "diskSpace" in result
         assert result["diskSpace"]["used"] == 5368709120
 
+    def test_reconnect_backoff_retries_first_then_jitters(self, monkeypatch):
+        """Test the first reconnect is immediate and later waits are jittered and capped."""
+        from storj_monitor import storj_api_client
+
+        client = StorjNodeAPIClient("Test-Node", "http://localhost:14002")
+        monkeypatch.setattr(storj_api_client.random, "uniform", lambda low, high: high)
+
+        client._reconnect_attempts = 1
+        assert client._next_reconnect_backoff() == 0.0
+        waits = []
+        for attempt in range(2, 9):
+            client._reconnect_attempts = attempt
+            waits.append(client._next_reconnect_backoff())
+        assert waits == [3.0, 9.0, 27.0, 81.0, 243.0, 300.0, 300.0]
+
+        monkeypatch.setattr(storj_api_client.random, "uniform", lambda low, high: low)
+        assert client._next_reconnect_backoff() == 1.0
+
     @pytest.mark.asyncio
     async def test_get_dashboard_no_session(self):
         """Test dashboard retrieval without active session."""
@@ -237,6 +255,60 @@ class TestStorjNodeAPIClient:
         result = await client.get_dashboard()
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_get_dashboard_shares_one_request_and_caches_result(self, monkeypatch):
+        """Test concurrent dashboard callers share a request and reuse a recent response."""
+        from storj_monitor import storj_api_client
+
+        mock_response = MagicMock()
+        mock_response.status = 200
+        mock_response.json = AsyncMock(return_value={"nodeID": "test-node-id"})
+
+        mock_session = MagicMock()
+        mock_session.get = MagicMock(
+            return_value=MagicMock(
+                __aenter__=AsyncMock(return_value=mock_response), __aexit__=AsyncMock()
+            )
+        )
+
+        client = StorjNodeAPIClient("Test-Node", "http://localhost:14002")
+        client.session = mock_session
+
+        results = await asyncio.gather(*(client.get_dashboard() for _ in range(3)))
+        assert results == [{"nodeID": "test-node-id"}] * 3
+        assert mock_session.get.call_count == 1
+
+        # Within the cache window the stored response is returned
+        assert await client.get_dashboard() == {"nodeID": "test-node-id"}
+        assert mock_session.get.call_count == 1
+
+        # Once it expires the dashboard is requested again
+        monkeypatch.setattr(storj_api_client, "NODE_API_DASHBOARD_CACHE_SECONDS", 0)
+        await client.get_dashboard()
+        assert mock_session.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_parses_response_with_module_json_loads(self):
+        """Test responses are decoded with the client's (orjson when available) parser."""
+        from storj_monitor.storj_api_client import json_loads
+
+        mock_response = MagicMock()
+        mock_response.status = 200
+        mock_response.json = AsyncMock(return_value={"nodeID": "test-node-id"})
+        mock_session = MagicMock()
+        mock_session.get = MagicMock(
+            return_value=MagicMock(
+                __aenter__=AsyncMock(return_value=mock_response), __aexit__=AsyncMock()
+            )
+        )
+
+        client = StorjNodeAPIClient("Test-Node", "http://localhost:14002")
+        client.session = mock_session
+        await client.get_satellites()
+
+        mock_response.json.assert_awaited_once_with(loads=json_loads)
+        assert json_loads(b'{"satellites": [{"id": "a"}]}') == {"satellites": [{"id": "a"}]}
+
     @pytest.mark.asyncio
     async def test_get_satellites_success(self):
         """Test successful satellites retrieval."""
@@ -419,6 +491,29 @@ class TestAutoDiscoveryFunctions:
             result = await auto_discover_api_endpoint(node_config)
             assert result == "http://localhost:14002"
 
+    @pytest.mark.asyncio
+    async def test_auto_discover_probes_candidates_over_one_session(self):
+        """Test candidates share one session and a later candidate is used when the first fails."""
+        node_config = {"name": "Test-Node", "type": "file"}
+
+        def probe(url):
+            response = MagicMock()
+            response.status = 404 if "localhost" in url else 200
+            response.json = AsyncMock(return_value={"nodeID": "test-id"})
+            return MagicMock(__aenter__=AsyncMock(return_value=response), __aexit__=AsyncMock())
+
+        with patch("aiohttp.ClientSession") as mock_session_class:
+            mock_session = MagicMock()
+            mock_session_class.return_value.__aenter__ = AsyncMock(return_value=mock_session)
+            mock_session_class.return_value.__aexit__ = AsyncMock()
+            mock_session.get = MagicMock(side_effect=probe)
+
+            result = await auto_discover_api_endpoint(node_config)
+
+        assert result == "http://127.0.0.1:14002"
+        assert mock_session_class.call_count == 1
+        assert mock_session.get.call_count == 2
+
     @pytest.mark.asyncio
     async def test_auto_discover_local_file_failure(self):
         """Test auto-discovery failure for local file node."""
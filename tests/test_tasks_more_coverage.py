@@ -114,10 +114,12 @@ async def test_websocket_batch_broadcaster_task_batches_and_sends(monkeypatch):
     from storj_monitor.tasks import websocket_batch_broadcaster_task
 
     # Prepare events to batch
-    app_state["websocket_event_queue"] = [
-        {"type": "log_entry", "arrival_time": 1000.0},
-        {"type": "log_entry", "arrival_time": 1000.1},
-    ]
+    app_state["websocket_event_queue"] = deque(
+        [
+            {"type": "log_entry", "arrival_time": 1000.0},
+            {"type": "log_entry", "arrival_time": 1000.1},
+        ]
+    )
     app_state["websocket_queue_lock"] = asyncio.Lock()
     app_state["websockets"] = {}
 
@@ -179,4 +181,33 @@ async def test_connection_status_broadcaster_task_compiles_states(monkeypatch):
                 await task
 
         # Verify a broadcast occurred
-        assert rb.await_count >= 1
\ No newline at end of file
+        assert rb.await_count >= 1
+
+@pytest.mark.asyncio
+async def test_websocket_batch_broadcaster_pops_one_batch_from_deque(monkeypatch):
+    from storj_monitor.tasks import websocket_batch_broadcaster_task
+
+    queue = deque({"type": "log_entry", "arrival_time": 1000.0 + i} for i in range(12))
+    monkeypatch.setitem(app_state, "websocket_event_queue", queue)
+    monkeypatch.setitem(app_state, "websocket_queue_lock", asyncio.Lock())
+    monkeypatch.setitem(app_state, "websockets", {})
+    monkeypatch.setattr("storj_monitor.tasks.WEBSOCKET_BATCH_SIZE", 10)
+
+    sleeps = []
+
+    async def one_tick(_):
+        sleeps.append(_)
+        if len(sleeps) > 1:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr("storj_monitor.tasks.asyncio.sleep", one_tick)
+
+    with patch("storj_monitor.tasks.robust_broadcast", new=AsyncMock()) as rb:
+        with contextlib.suppress(asyncio.CancelledError):
+            await websocket_batch_broadcaster_task({})
+
+    events = rb.await_args.args[1]["events"]
+    assert [e["arrival_offset_ms"] for e in events] == [i * 1000 for i in range(10)]
+    # The remaining events stay queued in the same deque
+    assert app_state["websocket_event_queue"] is queue
+    assert [e["arrival_time"] for e in queue] == [1010.0, 1011.0]
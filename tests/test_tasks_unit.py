@@ -69,8 +69,8 @@ async def test_incremental_stats_updater_task_single_iteration(monkeypatch):
 
     monkeypatch.setattr(asyncio, "sleep", fast_sleep)
 
-    # Patch safe_send_json to succeed
-    with patch("storj_monitor.tasks.safe_send_json", new=AsyncMock(return_value=True)):
+    # Patch safe_send_text to succeed
+    with patch("storj_monitor.tasks.send_encoded", new=AsyncMock(return_value=True)):
         task = asyncio.create_task(incremental_stats_updater_task({}))
         try:
             await asyncio.sleep(0)  # allow the first iteration to run
@@ -129,5 +129,119 @@ async def test_performance_aggregator_task_bins_and_broadcast(monkeypatch):
         assert rb.await_count >= 1
 
 
+@pytest.mark.asyncio
+async def test_incremental_stats_updater_encodes_once_per_view(monkeypatch):
+    app_state["nodes"] = {
+        "node-a": {
+            "live_events": deque(),
+            "active_compactions": {},
+            "unprocessed_performance_events": [],
+            "has_new_events": False,
+        }
+    }
+    ws_agg_1, ws_agg_2, ws_node = DummyWS(), DummyWS(), DummyWS()
+    app_state["websockets"] = {
+        ws_agg_1: {"view": ["Aggregate"]},
+        ws_agg_2: {"view": ["Aggregate"]},
+        ws_node: {"view": ["node-a"]},
+    }
+
+    from storj_monitor import tasks
+
+    # Let exactly one loop iteration run
+    call_count = {"n": 0}
+
+    async def one_shot_sleep(_):
+        call_count["n"] += 1
+        if call_count["n"] > 1:
+            raise asyncio.CancelledError()
+
+    monkeypatch.setattr("storj_monitor.tasks.asyncio.sleep", one_shot_sleep)
+    monkeypatch.setattr(tasks, "get_historical_stats", lambda view, nodes: [])
+
+    encoded = []
+    real_encode_json = tasks.encode_json
+
+    def counting_encode_json(payload):
+        encoded.append(payload)
+        return real_encode_json(payload)
+
+    monkeypatch.setattr(tasks, "encode_json", counting_encode_json)
+
+    with patch("storj_monitor.tasks.send_encoded", new=AsyncMock(return_value=True)) as send:
+        with contextlib.suppress(asyncio.CancelledError):
+            await tasks.incremental_stats_updater_task({})
+
+    # Two distinct views -> two encodes, fanned out to three clients
+    assert len(encoded) == 2
+    assert send.await_count == 3
+    sent_to = {call.args[0] for call in send.await_args_list}
+    assert sent_to == {ws_agg_1, ws_agg_2, ws_node}
+    # The broadcast bytes are cached for new clients of the same view
+    sent_data = {call.args[1] for call in send.await_args_list}
+    assert app_state["stats_cache"].get(("Aggregate",)) in sent_data
+    assert isinstance(app_state["stats_cache"].get(("node-a",)), bytes)
+
+
+@pytest.mark.asyncio
+async def test_incremental_stats_updater_uses_event_seq_cursor(monkeypatch):
+    import time
+
+    now = time.time()
+
+    def make_event(seq, size):
+        # Same timestamp on every event: only the sequence number tells them apart
+        return {
+            "seq": seq,
+            "ts_unix": now,
+            "status": "success",
+            "category": "get",
+            "size": size,
+            "satellite_id": "sat-1",
+            "piece_id": f"p{seq}",
+            "location": {"country": "US"},
+            "error_reason": None,
+        }
+
+    live_events = deque([make_event(1, 100), make_event(2, 200)])
+    app_state["nodes"] = {
+        "node-a": {
+            "live_events": live_events,
+            "active_compactions": {},
+            "unprocessed_performance_events": [],
+            "has_new_events": True,
+            "event_seq": 2,
+        }
+    }
+    app_state["websockets"] = {DummyWS(): {"view": ["node-a"]}}
+    monkeypatch.setitem(app_state, "incremental_stats", {})
+
+    from storj_monitor import tasks
+
+    call_count = {"n": 0}
+
+    async def two_tick_sleep(_):
+        call_count["n"] += 1
+        if call_count["n"] == 2:
+            # Between ticks the oldest event is pruned and a new one arrives
+            live_events.popleft()
+            live_events.append(make_event(3, 400))
+        elif call_count["n"] > 2:
+            raise asyncio.CancelledError()
+
+    monkeypatch.setattr("storj_monitor.tasks.asyncio.sleep", two_tick_sleep)
+    monkeypatch.setattr(tasks, "get_historical_stats", lambda view, nodes: [])
+
+    with patch("storj_monitor.tasks.send_encoded", new=AsyncMock(return_value=True)):
+        with contextlib.suppress(asyncio.CancelledError):
+            await tasks.incremental_stats_updater_task({})
+
+    stats = app_state["incremental_stats"][("node-a",)]
+    assert stats.last_processed_seq == {"node-a": 3}
+    assert stats.dl_success == 3
+    assert stats.total_dl_size == 700
+    assert stats.live_dl_bytes == 700
+
+
 # Needed for contextlib.suppress in the tests above
 import contextlib
\ No newline at end of file
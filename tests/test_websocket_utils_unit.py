@@ -1,4 +1,5 @@
 import asyncio
+import json
 from typing import Any, Dict
 
 import pytest
@@ -21,6 +22,11 @@ class DummyWS:
             raise self._raise_exc
         self.sent.append(payload)
 
+    async def send_frame(self, data, opcode):
+        if self._raise_exc:
+            raise self._raise_exc
+        self.sent.append(json.loads(data))
+
 
 @pytest.mark.asyncio
 async def test_safe_send_json_success():
@@ -97,4 +103,216 @@ async def test_robust_broadcast_no_recipients_is_noop():
     websockets = {}
     payload = {"type": "noop"}
     # Should complete without raising
-    await robust_broadcast(websockets, payload, node_name="any")
\ No newline at end of file
+    await robust_broadcast(websockets, payload, node_name="any")
+
+def test_json_loads_accepts_str_and_bytes():
+    from storj_monitor.websocket_utils import json_loads
+
+    assert json_loads('{"type": "set_view", "view": ["Aggregate"]}') == {
+        "type": "set_view",
+        "view": ["Aggregate"],
+    }
+    assert json_loads(b'{"type": "get_alert_summary"}') == {"type": "get_alert_summary"}
+
+
+def test_json_loads_invalid_payload_raises_value_error():
+    from storj_monitor.websocket_utils import json_loads
+
+    with pytest.raises(ValueError):
+        json_loads("{not json")
+
+
+class DummyTextWS(DummyWS):
+    async def send_frame(self, data, opcode):
+        if self._raise_exc:
+            raise self._raise_exc
+        self.sent.append((data, opcode))
+
+
+@pytest.mark.asyncio
+async def test_safe_send_text_sends_preencoded_bytes_as_text_frame():
+    import aiohttp
+
+    from storj_monitor.websocket_utils import encode_json, json_loads, safe_send_text
+
+    ws = DummyTextWS()
+    data = encode_json({"type": "init", "nodes": ["node-a"]})
+
+    assert isinstance(data, bytes)
+    assert await safe_send_text(ws, data) is True
+    sent, opcode = ws.sent[0]
+    assert sent is data
+    assert opcode == aiohttp.WSMsgType.TEXT
+    assert json_loads(sent) == {"type": "init", "nodes": ["node-a"]}
+
+
+@pytest.mark.asyncio
+async def test_safe_send_text_closed_or_reset_returns_false():
+    from storj_monitor.websocket_utils import safe_send_text
+
+    assert await safe_send_text(DummyTextWS(closed=True), b"{}") is False
+    assert await safe_send_text(DummyTextWS(raise_exc=ConnectionResetError()), b"{}") is False
+
+
+@pytest.mark.asyncio
+async def test_safe_send_json_unserializable_payload_returns_false():
+    ws = DummyWS()
+
+    assert await safe_send_json(ws, {"bad": object()}) is False
+    assert ws.sent == []
+
+
+@pytest.mark.asyncio
+async def test_robust_broadcast_uses_published_snapshot(monkeypatch):
+    from storj_monitor.state import app_state
+    from storj_monitor.websocket_utils import get_ws_snapshot, refresh_ws_snapshot
+
+    ws_agg, ws_node = DummyWS(), DummyWS()
+    monkeypatch.setitem(
+        app_state, "websockets", {ws_agg: {"view": ["Aggregate"]}, ws_node: {"view": ["node-b"]}}
+    )
+    monkeypatch.setitem(app_state, "ws_snapshot", (None, ()))
+    refresh_ws_snapshot()
+
+    snapshot = get_ws_snapshot()
+    assert snapshot == ((ws_agg, ("Aggregate",)), (ws_node, ("node-b",)))
+    # Unchanged registry -> the same published tuple is reused
+    assert get_ws_snapshot(app_state["websockets"]) is snapshot
+
+    # A view change is picked up once the snapshot is refreshed
+    app_state["websockets"][ws_node]["view"] = ["node-a"]
+    refresh_ws_snapshot()
+    await robust_broadcast(app_state["websockets"], {"type": "x"}, node_name="node-a")
+
+    assert ws_agg.sent == [{"type": "x"}]
+    assert ws_node.sent == [{"type": "x"}]
+
+    # A disconnect plus a connect keeps the count; the refresh alone decides recipients
+    ws_new = DummyWS()
+    del app_state["websockets"][ws_node]
+    app_state["websockets"][ws_new] = {"view": ["node-a"]}
+    refresh_ws_snapshot()
+    await robust_broadcast(app_state["websockets"], {"type": "y"}, node_name="node-a")
+
+    assert ws_node.sent == [{"type": "x"}]
+    assert ws_new.sent == [{"type": "y"}]
+
+
+@pytest.mark.asyncio
+async def test_send_queue_coalesces_pending_replies_into_batch_frame(monkeypatch):
+    from storj_monitor.state import app_state
+    from storj_monitor.websocket_utils import close_send_queue, json_loads, open_send_queue
+
+    ws = DummyTextWS()
+    client = {"view": ["Aggregate"]}
+    monkeypatch.setitem(app_state, "websockets", {ws: client})
+    writer = open_send_queue(ws, client)
+
+    # A lone reply is sent unchanged
+    assert await safe_send_json(ws, {"type": "latency_stats"}) is True
+    await asyncio.sleep(0)
+    assert [json_loads(data) for data, _opcode in ws.sent] == [{"type": "latency_stats"}]
+
+    # Replies queued before the writer runs again share one frame
+    for msg_type in ("reputation_data", "storage_data", "earnings_data"):
+        await safe_send_json(ws, {"type": msg_type})
+    await asyncio.sleep(0)
+    assert len(ws.sent) == 2
+    assert json_loads(ws.sent[1][0]) == {
+        "type": "batch",
+        "messages": [{"type": "reputation_data"}, {"type": "storage_data"}, {"type": "earnings_data"}],
+    }
+
+    close_send_queue(client)
+    await asyncio.sleep(0)
+    assert writer.cancelled()
+
+
+def test_encode_json_accepts_numpy_values():
+    np = pytest.importorskip("numpy")
+    from storj_monitor.websocket_utils import USE_ORJSON, encode_json, json_loads
+
+    if not USE_ORJSON:
+        pytest.skip("numpy serialization is an orjson option")
+
+    payload = {"p95": np.float64(12.5), "count": np.int64(3)}
+    assert json_loads(encode_json(payload)) == {"p95": 12.5, "count": 3}
+
+
+@pytest.mark.asyncio
+async def test_close_send_queue_stops_writer_blocked_mid_send(monkeypatch):
+    from storj_monitor.state import app_state
+    from storj_monitor.websocket_utils import close_send_queue, open_send_queue
+
+    class NeverSendsWS(DummyTextWS):
+        async def send_frame(self, data, opcode):
+            await asyncio.Event().wait()
+
+    ws = NeverSendsWS()
+    client = {"view": ["Aggregate"]}
+    monkeypatch.setitem(app_state, "websockets", {ws: client})
+    writer = open_send_queue(ws, client)
+
+    assert await safe_send_json(ws, {"type": "stats_update"}) is True
+    await asyncio.sleep(0)  # the writer is now stuck writing the frame
+
+    close_send_queue(client)
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(writer, 1)
+    assert writer.cancelled()
+
+
+class BlockedTextWS(DummyTextWS):
+    """A client whose frame writes wait until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def send_frame(self, data, opcode):
+        await self.release.wait()
+        self.sent.append((data, opcode))
+
+
+@pytest.mark.asyncio
+async def test_broadcast_is_queued_per_client_and_drops_oldest_broadcast_when_full(monkeypatch):
+    from storj_monitor import websocket_utils
+    from storj_monitor.state import app_state
+    from storj_monitor.websocket_utils import close_send_queue, json_loads, open_send_queue
+
+    monkeypatch.setattr(websocket_utils, "WEBSOCKET_SEND_QUEUE_SIZE", 2)
+    slow, fast = BlockedTextWS(), DummyTextWS()
+    slow_client, fast_client = {"view": ["Aggregate"]}, {"view": ["Aggregate"]}
+    monkeypatch.setitem(app_state, "websockets", {slow: slow_client, fast: fast_client})
+    monkeypatch.setitem(app_state, "ws_snapshot", (None, ()))
+    open_send_queue(slow, slow_client)
+    open_send_queue(fast, fast_client)
+    try:
+        # The slow client's writer takes message 0 and stalls writing it
+        await robust_broadcast(app_state["websockets"], {"n": 0})
+        await asyncio.sleep(0)
+        # Broadcasts return without waiting for the stalled client
+        for n in (1, 2):
+            await asyncio.wait_for(robust_broadcast(app_state["websockets"], {"n": n}), 1)
+            await asyncio.sleep(0)
+        # A reply queued among the broadcasts is never dropped
+        await safe_send_json(slow, {"type": "earnings_history_chunk", "seq": 0})
+        await asyncio.wait_for(robust_broadcast(app_state["websockets"], {"n": 3}), 1)
+
+        assert [json_loads(data) for data, _opcode in fast.sent] == [{"n": n} for n in range(4)]
+
+        # Once released, the slow client gets the newest broadcasts and the reply, in order
+        slow.release.set()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert [json_loads(data) for data, _opcode in slow.sent] == [
+            {"n": 0},
+            {
+                "type": "batch",
+                "messages": [{"n": 2}, {"type": "earnings_history_chunk", "seq": 0}, {"n": 3}],
+            },
+        ]
+    finally:
+        close_send_queue(slow_client)
+        close_send_queue(fast_client)
+        await asyncio.sleep(0)